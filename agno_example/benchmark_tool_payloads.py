@@ -0,0 +1,104 @@
+"""
+Compare tool payloads encoded with `json.dumps` against `render_tool_output`.
+
+For the result of every tool, prints the tokens the model reads, the bytes the tool
+message adds to the request body, and how long it takes to encode the result and
+the tool message, with the previous `json.dumps` encoding ("json") and with
+`render_tool_output` ("rendered"). The tokens also drive the model's time to first
+token, since the whole tool result is prefilled on the next call.
+
+Tokens are counted with tiktoken's o200k_base encoding (used by gpt-4.1-mini). If the
+encoding can't be loaded, they are estimated at 4 characters per token and
+`tokenizer` says "estimate".
+
+Usage:
+    uv run python benchmark_tool_payloads.py [--iterations 1000]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from create_agent_app.common.customer_support.mocked_apis import (
+    http_GET_company_policy,
+    http_GET_customer_order_history,
+    http_GET_order_status,
+    http_GET_troubleshooting_guide,
+)
+from create_agent_app.common.customer_support.tool_output import render_tool_output
+
+TOOL_RESULTS: Dict[str, Callable[[], Any]] = {
+    "get_customer_order_history": http_GET_customer_order_history,
+    "get_order_status": lambda: http_GET_order_status("9127412"),
+    "get_company_policy": http_GET_company_policy,
+    "get_troubleshooting_guide(internet)": lambda: http_GET_troubleshooting_guide(
+        "internet"
+    ),
+    "get_troubleshooting_guide(mobile)": lambda: http_GET_troubleshooting_guide(
+        "mobile"
+    ),
+}
+
+
+def load_token_counter() -> Tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "o200k_base", lambda text: len(encoding.encode(text))
+    except Exception:
+        return "estimate", lambda text: round(len(text) / 4)
+
+
+def encode_tool_message(encode: Callable[[Any], str], result: Any) -> str:
+    return json.dumps(
+        {"role": "tool", "tool_call_id": "call_0", "content": encode(result)}
+    )
+
+
+def measure(
+    encode: Callable[[Any], str],
+    result: Any,
+    count_tokens: Callable[[str], int],
+    iterations: int,
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        request_fragment = encode_tool_message(encode, result)
+    encode_us = (time.perf_counter() - start) * 1_000_000 / iterations
+
+    return {
+        "tokens": count_tokens(encode(result)),
+        "request_bytes": len(request_fragment.encode()),
+        "encode_us": encode_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    tokenizer, count_tokens = load_token_counter()
+    for tool, get_result in TOOL_RESULTS.items():
+        result = get_result()
+        before = measure(json.dumps, result, count_tokens, args.iterations)
+        after = measure(render_tool_output, result, count_tokens, args.iterations)
+        print(
+            json.dumps(
+                {
+                    "tool": tool,
+                    "tokenizer": tokenizer,
+                    "json": before,
+                    "rendered": after,
+                    "tokens_saved": before["tokens"] - after["tokens"],
+                    "request_bytes_saved": before["request_bytes"]
+                    - after["request_bytes"],
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
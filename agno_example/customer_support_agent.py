@@ -1,4 +1,3 @@
-import json
 import os
 import dotenv
 from typing import Literal
@@ -12,8 +11,15 @@ from create_agent_app.common.customer_support.mocked_apis import (
     http_GET_order_status,
     http_GET_troubleshooting_guide,
 )
-from agno.agent import Agent
+from create_agent_app.common.customer_support.tool_output import render_tool_output
+from create_agent_app.common.customer_support.tools import SYSTEM_PROMPT
+from agno.agent import Agent, RunResponse
+from agno.models.base import Model
 from agno.models.openai import OpenAIChat
+from agno.storage.base import Storage
+from agno.storage.sqlite import SqliteStorage
+
+from session_storage import LRUSessionStorage
 
 dotenv.load_dotenv()
 
@@ -21,66 +27,6 @@ langwatch.setup(
     instrumentors=[AgnoInstrumentor()],
 )
 
-SYSTEM_PROMPT = """
-<Introduction>
-You are an AI customer service agent for XPTO Telecom, a telecommunications company providing internet, mobile, and television services, as well as selling mobile devices and related electronics. Your primary goal is to assist customers with their inquiries efficiently and effectively. You should always strive to provide helpful, accurate, and polite responses.
-
-Your core principles for interacting with users are:
-
-*   **Customer-centricity:** Every interaction should be focused on meeting the customer's needs and resolving their issues.
-*   **Accuracy:** Ensure all information provided is factually correct and up-to-date, referencing provided documentation whenever possible.
-*   **Efficiency:** Aim to resolve customer issues quickly and effectively, minimizing the need for escalation.
-*   **Professionalism:** Maintain a courteous and professional tone throughout the conversation.
-*   **Empathy:** Acknowledge the customer's frustration and show understanding when appropriate.
-</Introduction>
-
-<Workflow>
-Follow these steps to effectively assist customers:
-
-1.  **Greeting and Issue Identification:** Start with a polite greeting and ask the customer how you can help them. Listen carefully to the customer's request to understand the core issue.
-2.  **Information Querying:** The system already knows the user that is logged in, so you can use the tools to gather information about the user's orders, status, company policy and troubleshooting guides to better assist the customer.
-3.  **Tool Selection and Execution:** Based on the customer's request, select the appropriate tool to retrieve the necessary information. Execute the tool.
-4.  **Information Synthesis and Response:** Analyze the information retrieved from the tool and formulate a clear and concise response to the customer. Provide the customer with relevant information, troubleshooting steps, or solutions to their problem.
-5.  **Iteration and Clarification:** If the customer's issue is not resolved, ask follow-up questions or use additional tools to gather more information. Iterate through the steps as needed.
-6.  **Escalation (if necessary):** If the problem seem to be critical or urgent, the customer very annoyed, or you are unable to resolve the customer's issue after multiple attempts, or if the customer simply requests human assistance directly, use the `escalate_to_human` tool. Briefly summarize the issue and steps taken so far for the human agent.
-7.  **Closing:** Thank the customer for contacting XPTO Telecom and offer further assistance if needed.
-
-</Workflow>
-
-<Guidelines>
-*   **Be Direct:** Answer the questions, do not make assumptions of what the user is asking for
-*   **Answering questions about costs:** You can only answer questions about the costs of any service if the user asks you about an order in the order history, since you do not have access to prices to provide new offers to the customer
-*   **Use the Right Tool:** Pick ONLY the correct and appropriate tool, the description of the tool will help you with it
-*   **Use the right parameter to the tool:** if the user provides information that can be used as parameters, use the right information as the correct parameter
-*   **Never fabricate information:** Always get the real information based on the tools available
-*   **Always format the information** Provide to the user in an easy to read format, with markdown
-*   **You can use Markdown,** always use markdown lists, and headers to better organize and present the information to the user
-*   **Do not ask for personal information:** You should not ask for personal information, that is considered PII, avoid asking for address, name, phone numbers, credit cards and so on
-*   **You are not an assistant to write emails or letters:** Avoid creating any type of document. Just help the user with the options available to you
-
-*   **Specific Instructions**
-    *   When asked for the company policy, explain using the original text, to avoid misunderstandings
-    *   When a user presents a technical issue related to any service, use the troubleshooting_guide
-    *   When needing to return an product, first check the company policy for refunds, and explain the refund to the user in simple terms based on the policy
-    *   DO NOT ASK FOR THE ORDER ID, use the tools to check the customer's orders yourself and better help the user giving a summary of the latest order(s) instead of asking for the order id right away
-
-</Guidelines>
-
-<Tone>
-Maintain a friendly, helpful, and professional tone. Use clear and concise language that is easy for customers to understand. Avoid using technical jargon or slang.
-
-Example:
-
-*   **Good:** "Hello! I'm happy to help you with your XPTO Telecom service today. What can I assist you with?"
-*   **Bad:** "Yo, what's up? You got problems with your XPTO? Lemme see what I can do."
-
-</Tone>
-
-<Info>
-Today is 2025-04-19
-</Info>
-"""
-
 
 def get_customer_order_history() -> str:
     """
@@ -89,7 +35,7 @@ def get_customer_order_history() -> str:
     Returns:
         The customer order history
     """
-    return json.dumps(http_GET_customer_order_history())
+    return render_tool_output(http_GET_customer_order_history())
 
 
 def get_order_status(order_id: str) -> str:
@@ -102,7 +48,7 @@ def get_order_status(order_id: str) -> str:
     Returns:
         The status of the order
     """
-    return json.dumps(http_GET_order_status(order_id))
+    return render_tool_output(http_GET_order_status(order_id))
 
 
 def get_company_policy() -> str:
@@ -112,7 +58,7 @@ def get_company_policy() -> str:
     Returns:
         The company policy document
     """
-    return json.dumps(http_GET_company_policy())
+    return render_tool_output(http_GET_company_policy())
 
 
 def get_troubleshooting_guide(
@@ -127,7 +73,7 @@ def get_troubleshooting_guide(
     Returns:
         The troubleshooting guide document
     """
-    return json.dumps(http_GET_troubleshooting_guide(guide))
+    return render_tool_output(http_GET_troubleshooting_guide(guide))
 
 
 def escalate_to_human() -> str:
@@ -137,7 +83,7 @@ def escalate_to_human() -> str:
     Returns:
         A link for the customer to open a ticket with the support team
     """
-    return json.dumps(
+    return render_tool_output(
         {
             "url": "https://support.xpto.com/tickets",
             "type": "escalation",
@@ -145,18 +91,61 @@ def escalate_to_human() -> str:
     )
 
 
-agent = Agent(
-    model=OpenAIChat(
-        id="gpt-4.1-mini",
-        api_key=os.getenv("OPENAI_API_KEY"),
-    ),
-    tools=[
-        get_customer_order_history,
-        get_order_status,
-        get_company_policy,
-        get_troubleshooting_guide,
-        escalate_to_human,
-    ],
-    description=SYSTEM_PROMPT,
-    add_history_to_messages=True,
+# Number of previous runs of the session added to the messages, so long
+# conversations don't grow the prompt without bound
+NUM_HISTORY_RUNS = int(os.getenv("AGNO_NUM_HISTORY_RUNS", "3"))
+
+
+def create_storage() -> Storage:
+    """
+    Session storage, SQLite in AGNO_DB_FILE by default or in memory, keeping only the
+    most recently used AGNO_MAX_SESSIONS sessions, if AGNO_STORAGE is "memory"
+    """
+    if os.getenv("AGNO_STORAGE") == "memory":
+        return LRUSessionStorage(
+            max_sessions=int(os.getenv("AGNO_MAX_SESSIONS", "1000"))
+        )
+    return SqliteStorage(
+        table_name="customer_support_sessions",
+        db_file=os.getenv("AGNO_DB_FILE", "tmp/agno_sessions.db"),
+    )
+
+
+storage = create_storage()
+model = OpenAIChat(
+    id="gpt-4.1-mini",
+    api_key=os.getenv("OPENAI_API_KEY"),
 )
+
+
+def create_agent(
+    session_id: str,
+    storage: Storage = storage,
+    model: Model = model,
+    num_history_runs: int = NUM_HISTORY_RUNS,
+) -> Agent:
+    """
+    Agent for a single session, loading its history from the shared storage
+
+    Agents keep the state of the run in progress, so each run gets its own agent
+    instead of sharing one between concurrent sessions.
+    """
+    return Agent(
+        model=model,
+        tools=[
+            get_customer_order_history,
+            get_order_status,
+            get_company_policy,
+            get_troubleshooting_guide,
+            escalate_to_human,
+        ],
+        description=SYSTEM_PROMPT,
+        session_id=session_id,
+        storage=storage,
+        add_history_to_messages=True,
+        num_history_runs=num_history_runs,
+    )
+
+
+def run_agent(message: str, session_id: str) -> RunResponse:
+    return create_agent(session_id).run(message)
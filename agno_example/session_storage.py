@@ -0,0 +1,111 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional
+
+from agno.storage.base import Storage
+from agno.storage.session import Session
+from agno.storage.session.agent import AgentSession
+from agno.storage.session.team import TeamSession
+from agno.storage.session.workflow import WorkflowSession
+
+
+class LRUSessionStorage(Storage):
+    """
+    In-memory Agno storage that keeps only the `max_sessions` most recently used
+    sessions, for tests and local runs without a database
+
+    Sessions are stored as dicts, so a reader never shares objects with the agent that
+    wrote them, like with any other storage.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        mode: Optional[Literal["agent", "team", "workflow"]] = "agent",
+    ):
+        super().__init__(mode)
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def create(self) -> None:
+        pass
+
+    def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        with self.lock:
+            data = self.sessions.get(session_id)
+            if data is None:
+                return None
+            self.sessions.move_to_end(session_id)
+        if user_id and data.get("user_id") != user_id:
+            return None
+        return self._from_dict(data)
+
+    def get_all_session_ids(
+        self, user_id: Optional[str] = None, entity_id: Optional[str] = None
+    ) -> List[str]:
+        return [
+            session.session_id for session in self.get_all_sessions(user_id, entity_id)
+        ]
+
+    def get_all_sessions(
+        self, user_id: Optional[str] = None, entity_id: Optional[str] = None
+    ) -> List[Session]:
+        with self.lock:
+            sessions = list(self.sessions.values())
+        return [
+            session
+            for session in (self._from_dict(data) for data in sessions)
+            if session is not None
+            and (not user_id or session.user_id == user_id)
+            and (not entity_id or self._entity_id(session) == entity_id)
+        ]
+
+    def get_recent_sessions(
+        self,
+        user_id: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        limit: Optional[int] = 2,
+    ) -> List[Session]:
+        sessions = sorted(
+            self.get_all_sessions(user_id, entity_id),
+            key=lambda session: session.created_at or 0,
+            reverse=True,
+        )
+        return sessions[:limit] if limit else sessions
+
+    def upsert(self, session: Session) -> Optional[Session]:
+        data = session.to_dict()
+        now = int(time.time())
+        with self.lock:
+            previous = self.sessions.pop(session.session_id, None)
+            data["created_at"] = (previous or {}).get("created_at") or now
+            data["updated_at"] = now
+            self.sessions[session.session_id] = data
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return self._from_dict(data)
+
+    def delete_session(self, session_id: Optional[str] = None):
+        with self.lock:
+            self.sessions.pop(session_id or "", None)
+
+    def drop(self) -> None:
+        with self.lock:
+            self.sessions.clear()
+
+    def upgrade_schema(self) -> None:
+        pass
+
+    def _from_dict(self, data: Dict[str, Any]) -> Optional[Session]:
+        data = copy.deepcopy(data)
+        if self.mode == "team":
+            return TeamSession.from_dict(data)
+        if self.mode == "workflow":
+            return WorkflowSession.from_dict(data)
+        return AgentSession.from_dict(data)
+
+    def _entity_id(self, session: Session) -> Optional[str]:
+        return getattr(session, f"{self.mode}_id", None)
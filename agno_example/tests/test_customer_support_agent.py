@@ -1,7 +1,7 @@
 import pytest
 
 import scenario
-from customer_support_agent import agent
+from customer_support_agent import run_agent
 from agno.models.openai import OpenAIChat
 
 scenario.configure(
@@ -12,15 +12,13 @@ scenario.configure(
 
 class Agent(scenario.AgentAdapter):
     async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        current_messages_count = len(
-            agent.get_messages_for_session(input.thread_id) or ["initial"]
-        )
+        result = run_agent(input.last_new_user_message_str(), input.thread_id)
 
-        result = agent.run(
-            input.last_new_user_message_str(), session_id=input.thread_id
-        )
-
-        new_messages = (result.messages or [])[current_messages_count + 1 :]
+        new_messages = [
+            message
+            for message in result.messages or []
+            if not message.from_history and message.role not in ("system", "user")
+        ]
         openai_formatted_messages = [
             OpenAIChat()._format_message(message) for message in new_messages
         ]
@@ -0,0 +1,112 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from agno.models.openai import OpenAIChat
+
+from customer_support_agent import create_agent
+from session_storage import LRUSessionStorage
+
+
+@pytest.fixture(autouse=True)
+def no_telemetry(monkeypatch):
+    monkeypatch.setenv("AGNO_TELEMETRY", "false")
+
+
+class PromptRecorder:
+    """OpenAI API stand-in that answers every request and records its prompt size"""
+
+    def __init__(self):
+        self.prompt_sizes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        messages = json.loads(request.content)["messages"]
+        with self.lock:
+            self.prompt_sizes.append(len(json.dumps(messages)))
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4.1-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "How can I help?"},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 1,
+                    "total_tokens": 2,
+                },
+            },
+        )
+
+    def model(self) -> OpenAIChat:
+        return OpenAIChat(
+            id="gpt-4.1-mini",
+            api_key="sk-stub",
+            http_client=httpx.Client(transport=httpx.MockTransport(self)),
+        )
+
+
+def run_sessions(sessions: int, turns: int, num_history_runs: int = 2) -> list:
+    """Runs the sessions concurrently and returns the prompt size of each turn"""
+    recorder = PromptRecorder()
+    model = recorder.model()
+    storage = LRUSessionStorage()
+
+    def converse(session: int) -> None:
+        for turn in range(turns):
+            agent = create_agent(f"session-{session}", storage, model, num_history_runs)
+            agent.run(f"Message {turn} of session {session:03d}")
+
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(converse, range(sessions)))
+
+    assert len(recorder.prompt_sizes) == sessions * turns
+    return recorder.prompt_sizes
+
+
+def test_prompt_size_stays_flat_as_concurrent_sessions_grow():
+    largest_prompts = [max(run_sessions(sessions, turns=4)) for sessions in (1, 8, 32)]
+
+    assert largest_prompts[0] == largest_prompts[1] == largest_prompts[2]
+
+
+def test_history_is_capped_at_num_history_runs():
+    prompt_sizes = run_sessions(1, turns=6, num_history_runs=2)
+
+    assert prompt_sizes[0] < prompt_sizes[1] < prompt_sizes[2]
+    assert prompt_sizes[2] == prompt_sizes[3] == prompt_sizes[4] == prompt_sizes[5]
+
+
+def test_sessions_keep_separate_histories():
+    recorder = PromptRecorder()
+    storage = LRUSessionStorage()
+
+    create_agent("first", storage, recorder.model()).run("My router is broken")
+    agent = create_agent("second", storage, recorder.model())
+    agent.run("Where is my order?")
+
+    history = [message.content for message in agent.get_messages_for_session()]
+    assert "Where is my order?" in history
+    assert "My router is broken" not in history
+
+
+def test_least_recently_used_sessions_are_evicted():
+    recorder = PromptRecorder()
+    storage = LRUSessionStorage(max_sessions=2)
+
+    for session_id in ("first", "second"):
+        create_agent(session_id, storage, recorder.model()).run("Hello")
+    storage.read("first")
+    create_agent("third", storage, recorder.model()).run("Hello")
+
+    assert sorted(storage.get_all_session_ids()) == ["first", "third"]
@@ -0,0 +1,23 @@
+import json
+
+from customer_support_agent import get_company_policy, get_customer_order_history
+from create_agent_app.common.customer_support.mocked_apis import (
+    http_GET_company_policy,
+    http_GET_customer_order_history,
+)
+
+
+def test_documents_are_passed_through_as_markdown():
+    policy = get_company_policy()
+
+    assert policy.startswith("# Company Policy\n\n")
+    assert policy.endswith(http_GET_company_policy()["document_content"])
+    assert "\\n" not in policy
+
+
+def test_orders_are_minified_json():
+    orders = get_customer_order_history()
+
+    assert orders == json.dumps(
+        http_GET_customer_order_history(), separators=(",", ":")
+    )
@@ -0,0 +1,170 @@
+"""
+Count the LLM calls needed to resolve a conversation in direct and group chat mode.
+
+In group chat mode the GroupChatManager asks the LLM which agent should speak next
+on every round, on top of the support agent's own calls. In direct mode the user
+proxy talks straight to the support agent, so only the support agent calls the LLM.
+
+With `--full-proxy` the user proxy also gets an LLM and local code execution, as
+before it became a plain tool executor. No difference in LLM calls is expected:
+the support agent's final answer ends the turn before the proxy would reply with
+the LLM, and the tool call messages it receives have no content to search for
+code blocks, so no "coding" work dir is created either. What the full proxy does
+cost is building it, reported as `agents_ms`, the time to create a support agent
+and user proxy pair, which for the full proxy includes deciding whether code
+runs in Docker.
+
+The LLM is replaced by a scripted model client (the support agent looks the order
+history up once and then answers), so the numbers are exact and no API key is
+needed.
+
+Usage:
+    uv run python benchmark_llm_calls.py [--conversations 20] [--turns 3] [--full-proxy]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, Literal
+
+from customer_support_agent import AgentPool, call_agent, create_agents, end_session
+
+
+class ScriptedModelClient:
+    """
+    AutoGen model client that calls `get_customer_order_history` once per user
+    message and then answers, and picks the next speaker for the group chat manager
+    """
+
+    calls: Counter = Counter()
+
+    def __init__(self, config: Dict[str, Any], **kwargs: Any):
+        self.model = config["model"]
+
+    def create(self, params: Dict[str, Any]) -> SimpleNamespace:
+        messages = params["messages"]
+        last_message = messages[-1]
+        content = str(last_message.get("content") or "")
+
+        if "select the next role" in content:
+            ScriptedModelClient.calls["speaker_selection"] += 1
+            previous_message = messages[-2]
+            reply = (
+                "user_proxy"
+                if previous_message.get("name") == "customer_support_agent"
+                else "customer_support_agent"
+            )
+            return self._response(content=reply)
+
+        if "tools" not in params:
+            ScriptedModelClient.calls["user_proxy"] += 1
+            return self._response(content="Thanks!")
+
+        ScriptedModelClient.calls["customer_support_agent"] += 1
+        if last_message.get("role") == "tool":
+            return self._response(content="Your order is on its way.")
+        return self._response(
+            tool_calls=[
+                {
+                    "id": f"call_{uuid.uuid4().hex[:8]}",
+                    "type": "function",
+                    "function": {
+                        "name": "get_customer_order_history",
+                        "arguments": "{}",
+                    },
+                }
+            ]
+        )
+
+    def message_retrieval(self, response: SimpleNamespace) -> list:
+        return [vars(choice.message) for choice in response.choices]
+
+    def cost(self, response: SimpleNamespace) -> float:
+        return 0.0
+
+    @staticmethod
+    def get_usage(response: SimpleNamespace) -> Dict[str, Any]:
+        return {}
+
+    def _response(self, content: Any = None, tool_calls: Any = None) -> SimpleNamespace:
+        message = SimpleNamespace(
+            role="assistant",
+            content=content,
+            tool_calls=tool_calls,
+            function_call=None,
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            model=self.model,
+            cost=0.0,
+        )
+
+
+def run_benchmark(
+    mode: Literal["direct", "group_chat"],
+    conversations: int,
+    turns: int,
+    tool_executor: bool = True,
+) -> Dict[str, Any]:
+    llm_config = {
+        "config_list": [
+            {"model": "scripted", "model_client_cls": "ScriptedModelClient"}
+        ],
+        "cache_seed": None,
+    }
+    pool = AgentPool(
+        size=1,
+        llm_config=llm_config,
+        model_client_cls=ScriptedModelClient,
+        tool_executor=tool_executor,
+    )
+    ScriptedModelClient.calls.clear()
+
+    start = time.perf_counter()
+    for _ in range(conversations):
+        thread_id = f"benchmark-{uuid.uuid4()}"
+        for _ in range(turns):
+            call_agent(
+                "Where is my order?",
+                {"thread_id": thread_id},
+                mode=mode,
+                agent_pool=pool,
+            )
+        end_session(thread_id)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(conversations):
+        create_agents(llm_config, ScriptedModelClient, tool_executor)
+    agents_elapsed = time.perf_counter() - start
+
+    calls = dict(ScriptedModelClient.calls)
+    return {
+        "mode": mode,
+        "proxy": "tool_executor" if tool_executor else "full",
+        "llm_calls_per_conversation": sum(calls.values()) / conversations,
+        "calls_by_kind": {kind: n / conversations for kind, n in calls.items()},
+        "ms_per_conversation": elapsed * 1000 / conversations,
+        "agents_ms": agents_elapsed * 1000 / conversations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--full-proxy", action="store_true")
+    args = parser.parse_args()
+
+    for mode in ("direct", "group_chat"):
+        result = run_benchmark(
+            mode, args.conversations, args.turns, tool_executor=not args.full_proxy
+        )
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
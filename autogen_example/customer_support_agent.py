@@ -3,219 +3,261 @@
 # - https://microsoft.github.io/autogen/
 
 import os
-from typing import List, Literal, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Literal, Dict, Any, List, Optional, Tuple
 import dotenv
 
 dotenv.load_dotenv()
 
-from create_agent_app.common.customer_support.mocked_apis import (
-    DocumentResponse,
-    OrderSummaryResponse,
-    OrderStatusResponse,
-    http_GET_company_policy,
-    http_GET_customer_order_history,
-    http_GET_order_status,
-    http_GET_troubleshooting_guide,
-)
+from create_agent_app.common.customer_support.tools import SYSTEM_PROMPT, TOOLS
 
 import autogen
 
-SYSTEM_PROMPT = """
-<Introduction>
-You are an AI customer service agent for XPTO Telecom, a telecommunications company providing internet, mobile, and television services, as well as selling mobile devices and related electronics. Your primary goal is to assist customers with their inquiries efficiently and effectively. You should always strive to provide helpful, accurate, and polite responses.
-
-Your core principles for interacting with users are:
-
-*   **Customer-centricity:** Every interaction should be focused on meeting the customer's needs and resolving their issues.
-*   **Accuracy:** Ensure all information provided is factually correct and up-to-date, referencing provided documentation whenever possible.
-*   **Efficiency:** Aim to resolve customer issues quickly and effectively, minimizing the need for escalation.
-*   **Professionalism:** Maintain a courteous and professional tone throughout the conversation.
-*   **Empathy:** Acknowledge the customer's frustration and show understanding when appropriate.
-</Introduction>
-
-<Workflow>
-Follow these steps to effectively assist customers:
-
-1.  **Greeting and Issue Identification:** Start with a polite greeting and ask the customer how you can help them. Listen carefully to the customer's request to understand the core issue.
-2.  **Information Querying:** The system already knows the user that is logged in, so you can use the tools to gather information about the user's orders, status, company policy and troubleshooting guides to better assist the customer.
-3.  **Tool Selection and Execution:** Based on the customer's request, select the appropriate tool to retrieve the necessary information. Execute the tool.
-4.  **Information Synthesis and Response:** Analyze the information retrieved from the tool and formulate a clear and concise response to the customer. Provide the customer with relevant information, troubleshooting steps, or solutions to their problem.
-5.  **Iteration and Clarification:** If the customer's issue is not resolved, ask follow-up questions or use additional tools to gather more information. Iterate through the steps as needed.
-6.  **Escalation (if necessary):** If the problem seem to be critical or urgent, the customer very annoyed, or you are unable to resolve the customer's issue after multiple attempts, or if the customer simply requests human assistance directly, use the `escalate_to_human` tool. Briefly summarize the issue and steps taken so far for the human agent.
-7.  **Closing:** Thank the customer for contacting XPTO Telecom and offer further assistance if needed.
-
-</Workflow>
-
-<Guidelines>
-*   **Be Direct:** Answer the questions, do not make assumptions of what the user is asking for
-*   **Answering questions about costs:** You can only answer questions about the costs of any service if the user asks you about an order in the order history, since you do not have access to prices to provide new offers to the customer
-*   **Use the Right Tool:** Pick ONLY the correct and appropriate tool, the description of the tool will help you with it
-*   **Use the right parameter to the tool:** if the user provides information that can be used as parameters, use the right information as the correct parameter
-*   **Never fabricate information:** Always get the real information based on the tools available
-*   **Always format the information** Provide to the user in an easy to read format, with markdown
-*   **You can use Markdown,** always use markdown lists, and headers to better organize and present the information to the user
-*   **Do not ask for personal information:** You should not ask for personal information, that is considered PII, avoid asking for address, name, phone numbers, credit cards and so on
-*   **You are not an assistant to write emails or letters:** Avoid creating any type of document. Just help the user with the options available to you
-
-*   **Specific Instructions**
-    *   When asked for the company policy, explain using the original text, to avoid misunderstandings
-    *   When a user presents a technical issue related to any service, use the troubleshooting_guide
-    *   When needing to return an product, first check the company policy for refunds, and explain the refund to the user in simple terms based on the policy
-    *   DO NOT ASK FOR THE ORDER ID, use the tools to check the customer's orders yourself and better help the user giving a summary of the latest order(s) instead of asking for the order id right away
-
-</Guidelines>
-
-<Tone>
-Maintain a friendly, helpful, and professional tone. Use clear and concise language that is easy for customers to understand. Avoid using technical jargon or slang.
-
-Example:
-
-*   **Good:** "Hello! I'm happy to help you with your XPTO Telecom service today. What can I assist you with?"
-*   **Bad:** "Yo, what's up? You got problems with your XPTO? Lemme see what I can do."
-
-</Tone>
-
-<Info>
-Today is 2025-04-19
-</Info>
-"""
-
-
-def get_customer_order_history() -> List[OrderSummaryResponse]:
-    """
-    Get the current customer order history
-
-    Returns:
-        The customer order history
-    """
-    return http_GET_customer_order_history()
+# Configure AutoGen
+config_list = [
+    {
+        "model": "gpt-4o-mini",
+        "api_key": os.getenv("OPENAI_API_KEY"),
+    }
+]
 
+llm_config = {
+    "config_list": config_list,
+    "temperature": 0,
+}
 
-def get_order_status(order_id: str) -> OrderStatusResponse:
+tools = TOOLS
+
+
+def is_final_answer(message: Dict[str, Any]) -> bool:
+    """The conversation turn ends when the support agent replies without calling tools"""
+    return (
+        message.get("name") == "customer_support_agent"
+        and not message.get("tool_calls")
+        and not message.get("function_call")
+    )
+
+
+def create_agents(
+    llm_config: Dict[str, Any] = llm_config,
+    model_client_cls: Optional[type] = None,
+    tool_executor: bool = True,
+) -> Tuple[autogen.AssistantAgent, autogen.UserProxyAgent]:
+    # Create the customer support agent
+    customer_support_agent = autogen.AssistantAgent(
+        name="customer_support_agent",
+        system_message=SYSTEM_PROMPT,
+        llm_config=llm_config,
+        human_input_mode="NEVER",
+    )
+
+    # Create a user proxy agent to handle tool execution, as a plain tool executor it
+    # only dispatches the registered functions in-process, without calling the LLM or
+    # looking for code blocks to run in a work dir
+    user_proxy = autogen.UserProxyAgent(
+        name="user_proxy",
+        human_input_mode="NEVER",
+        max_consecutive_auto_reply=10,
+        is_termination_msg=is_final_answer,
+        code_execution_config=False if tool_executor else {"work_dir": "coding"},
+        llm_config=False if tool_executor else llm_config,
+    )
+
+    # Register tools to be suggested by the support agent and executed by the user proxy
+    for tool in tools:
+        autogen.register_function(
+            tool,
+            caller=customer_support_agent,
+            executor=user_proxy,
+            description=(tool.__doc__ or "").strip().split("\n")[0],
+        )
+
+    if model_client_cls:
+        customer_support_agent.register_model_client(model_client_cls)
+        if not tool_executor:
+            user_proxy.register_model_client(model_client_cls)
+
+    return customer_support_agent, user_proxy
+
+
+class AgentPool:
     """
-    Get the status of a specific order
+    Pairs of support agent and user proxy given back by finished conversations, so
+    starting a conversation does not pay for building the agents and registering the
+    tools every time. Pairs are built on demand, none at creation, so importing the
+    example stays cheap
 
     Args:
-        order_id: The ID of the order to get the status of
-
-    Returns:
-        The status of the order
+        size: How many idle pairs to keep for reuse
+        llm_config: The AutoGen LLM config of the agents
+        model_client_cls: Custom model client to register on the agents, when the
+            llm_config uses a `model_client_cls`
+        tool_executor: Whether the user proxy is a plain tool executor, False to give
+            it an LLM and local code execution as well
     """
-    return http_GET_order_status(order_id)
-
 
-def get_company_policy() -> DocumentResponse:
-    """
-    Get the company policy
-
-    Returns:
-        The company policy document
+    def __init__(
+        self,
+        size: int = 4,
+        llm_config: Dict[str, Any] = llm_config,
+        model_client_cls: Optional[type] = None,
+        tool_executor: bool = True,
+    ):
+        self.size = size
+        self.llm_config = llm_config
+        self.model_client_cls = model_client_cls
+        self.tool_executor = tool_executor
+        self.free: List[Tuple[autogen.AssistantAgent, autogen.UserProxyAgent]] = []
+        self.lock = threading.Lock()
+
+    def acquire(self) -> Tuple[autogen.AssistantAgent, autogen.UserProxyAgent]:
+        with self.lock:
+            if self.free:
+                return self.free.pop()
+        return self._create_agents()
+
+    def release(
+        self, agents: Tuple[autogen.AssistantAgent, autogen.UserProxyAgent]
+    ) -> None:
+        for agent in agents:
+            agent.reset()
+        with self.lock:
+            if len(self.free) < self.size:
+                self.free.append(agents)
+
+    def _create_agents(self) -> Tuple[autogen.AssistantAgent, autogen.UserProxyAgent]:
+        return create_agents(self.llm_config, self.model_client_cls, self.tool_executor)
+
+
+class CustomerSupportSession:
     """
-    return http_GET_company_policy()
-
-
-def get_troubleshooting_guide(
-    guide: Literal["internet", "mobile", "television", "ecommerce"],
-) -> DocumentResponse:
-    """
-    Get the troubleshooting guide
+    One conversation thread, with its own agents and message history
 
     Args:
-        guide: The guide to get the troubleshooting guide for, one of "internet", "mobile", "television", "ecommerce"
-
-    Returns:
-        The troubleshooting guide document
+        pool: Where to take the agents from
+        mode: "direct" for the user proxy to talk straight to the support agent, or
+            "group_chat" to go through a GroupChatManager, which spends an extra LLM
+            call every round just to select the next speaker
     """
-    return http_GET_troubleshooting_guide(guide)
-
 
-def escalate_to_human() -> Dict[str, str]:
+    def __init__(
+        self,
+        pool: AgentPool,
+        mode: Literal["direct", "group_chat"] = "direct",
+    ):
+        self.pool = pool
+        self.agents = pool.acquire()
+        self.customer_support_agent, self.user_proxy = self.agents
+        self.recipient: autogen.ConversableAgent = self.customer_support_agent
+        if mode == "group_chat":
+            groupchat = autogen.GroupChat(
+                agents=[self.user_proxy, self.customer_support_agent],
+                messages=[],
+                max_round=50,
+                select_speaker_auto_llm_config=pool.llm_config,
+                select_speaker_auto_model_client_cls=pool.model_client_cls,
+            )
+            manager = autogen.GroupChatManager(
+                groupchat=groupchat,
+                llm_config=pool.llm_config,
+                is_termination_msg=is_final_answer,
+                silent=True,
+            )
+            if pool.model_client_cls:
+                manager.register_model_client(pool.model_client_cls)
+            self.recipient = manager
+        self.lock = threading.Lock()
+        self.started = False
+        self.last_used = time.monotonic()
+
+    def run(self, message: str) -> str:
+        with self.lock:
+            try:
+                result = self.user_proxy.initiate_chat(
+                    self.recipient,
+                    message=message,
+                    clear_history=not self.started,
+                    silent=True,
+                )
+            finally:
+                self.last_used = time.monotonic()
+            self.started = True
+            return result.summary
+
+    def close(self) -> None:
+        self.pool.release(self.agents)
+
+
+# Created on the first message, see `get_pool`
+pool: Optional[AgentPool] = None
+pool_lock = threading.Lock()
+
+# In-memory sessions, one per conversation thread, from least to most recently used.
+# Sessions idle for longer than SESSION_IDLE_TTL seconds, and the least recently used
+# ones above MAX_SESSIONS, are closed to give their agents back to the pool
+sessions: "OrderedDict[str, CustomerSupportSession]" = OrderedDict()
+sessions_lock = threading.Lock()
+SESSION_IDLE_TTL = float(os.getenv("AUTOGEN_SESSION_IDLE_TTL", 30 * 60))
+MAX_SESSIONS = int(os.getenv("AUTOGEN_MAX_SESSIONS", 1000))
+
+
+def get_pool() -> AgentPool:
+    """The agent pool shared by the sessions, created the first time it is needed"""
+    global pool
+    with pool_lock:
+        if pool is None:
+            pool = AgentPool()
+        return pool
+
+
+def call_agent(
+    message: str,
+    context: Dict[str, Any],
+    mode: Literal["direct", "group_chat"] = "direct",
+    agent_pool: Optional[AgentPool] = None,
+) -> str:
+    thread_id = str(context["thread_id"])
+    evict_sessions()
+    with sessions_lock:
+        if thread_id not in sessions:
+            sessions[thread_id] = CustomerSupportSession(
+                agent_pool or get_pool(), mode=mode
+            )
+        sessions.move_to_end(thread_id)
+        session = sessions[thread_id]
+        # Not idle anymore, so it is not evicted before the message starts running
+        session.last_used = time.monotonic()
+
+    return session.run(message)
+
+
+def end_session(thread_id: str) -> None:
+    """Close the session of a finished conversation, giving its agents back to the pool"""
+    with sessions_lock:
+        session: Optional[CustomerSupportSession] = sessions.pop(thread_id, None)
+    if session:
+        session.close()
+
+
+def evict_sessions() -> int:
     """
-    Escalate to human, retrieves a link for the customer to open a ticket with the support team
+    Close the idle sessions and the least recently used ones above MAX_SESSIONS,
+    skipping the ones running a message
 
     Returns:
-        A link for the customer to open a ticket with the support team
+        The number of sessions closed
     """
-    return {
-        "url": "https://support.xpto.com/tickets",
-        "type": "escalation",
-    }
-
-
-# Configure AutoGen
-config_list = [
-    {
-        "model": "gpt-4o-mini",
-        "api_key": os.getenv("OPENAI_API_KEY"),
-    }
-]
-
-# Create the customer support agent
-customer_support_agent = autogen.AssistantAgent(
-    name="customer_support_agent",
-    system_message=SYSTEM_PROMPT,
-    llm_config={
-        "config_list": config_list,
-        "temperature": 0,
-    },
-    human_input_mode="NEVER",
-)
-
-# Create a user proxy agent to handle tool execution
-user_proxy = autogen.UserProxyAgent(
-    name="user_proxy",
-    human_input_mode="NEVER",
-    max_consecutive_auto_reply=10,
-    is_termination_msg=lambda x: x.get("content", "").rstrip().endswith("TERMINATE"),
-    code_execution_config={"work_dir": "coding"},
-    llm_config={
-        "config_list": config_list,
-        "temperature": 0,
-    },
-)
-
-# Register tools with the user proxy
-user_proxy.register_function(
-    function_map={
-        "get_customer_order_history": get_customer_order_history,
-        "get_order_status": get_order_status,
-        "get_company_policy": get_company_policy,
-        "get_troubleshooting_guide": get_troubleshooting_guide,
-        "escalate_to_human": escalate_to_human,
-    }
-)
-
-# Create a group chat for the agents
-groupchat = autogen.GroupChat(
-    agents=[user_proxy, customer_support_agent],
-    messages=[],
-    max_round=50,
-)
-
-# Create the manager
-manager = autogen.GroupChatManager(
-    groupchat=groupchat,
-    llm_config={
-        "config_list": config_list,
-        "temperature": 0,
-    },
-)
-
-# Create a simple agent instance for compatibility
-agent = {
-    "name": "customer_support_agent",
-    "description": "Customer support agent for XPTO Telecom using AutoGen",
-    "instruction": SYSTEM_PROMPT,
-    "tools": [
-        get_customer_order_history,
-        get_order_status,
-        get_company_policy,
-        get_troubleshooting_guide,
-        escalate_to_human,
-    ],
-    "autogen_agents": {
-        "customer_support_agent": customer_support_agent,
-        "user_proxy": user_proxy,
-        "manager": manager,
-    },
-}
+    deadline = time.monotonic() - SESSION_IDLE_TTL
+    evicted: List[CustomerSupportSession] = []
+    with sessions_lock:
+        for thread_id, session in list(sessions.items()):
+            if session.lock.locked():
+                continue
+            if session.last_used > deadline and len(sessions) <= MAX_SESSIONS:
+                break
+            evicted.append(sessions.pop(thread_id))
+    for session in evicted:
+        session.close()
+    return len(evicted)
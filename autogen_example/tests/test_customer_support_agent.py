@@ -3,7 +3,7 @@ import pytest
 import langwatch
 
 import scenario
-from customer_support_agent import agent
+from customer_support_agent import call_agent
 
 langwatch.setup()
 
@@ -14,12 +14,11 @@ scenario.configure(
 
 
 class AgentAdapter(scenario.AgentAdapter):
-    def __init__(self):
-        self.agent = agent
-
     async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        # Run the agent with the user message
-        response = self.agent.run(input.last_new_user_message_str())
+        # Run the agent with the user message, each scenario thread gets its own session
+        response = call_agent(
+            input.last_new_user_message_str(), {"thread_id": input.thread_id}
+        )
 
         # Return the response directly as a string
         return response
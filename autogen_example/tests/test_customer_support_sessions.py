@@ -0,0 +1,124 @@
+from collections import OrderedDict
+
+import customer_support_agent
+from benchmark_llm_calls import ScriptedModelClient
+from customer_support_agent import (
+    AgentPool,
+    CustomerSupportSession,
+    call_agent,
+    end_session,
+    evict_sessions,
+)
+
+llm_config = {
+    "config_list": [{"model": "scripted", "model_client_cls": "ScriptedModelClient"}],
+    "cache_seed": None,
+}
+
+
+def test_sessions_keep_separate_histories():
+    pool = AgentPool(
+        size=2, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    first = CustomerSupportSession(pool)
+    second = CustomerSupportSession(pool)
+
+    first.run("Where is my order?")
+    first.run("And my other order?")
+    second.run("Where is my order?")
+
+    assert first.customer_support_agent is not second.customer_support_agent
+    assert len(first.user_proxy.chat_messages[first.customer_support_agent]) == 8
+    assert len(second.user_proxy.chat_messages[second.customer_support_agent]) == 4
+
+
+def test_direct_mode_skips_speaker_selection():
+    pool = AgentPool(
+        size=1, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+
+    ScriptedModelClient.calls.clear()
+    session = CustomerSupportSession(pool, mode="direct")
+    assert session.run("Where is my order?") == "Your order is on its way."
+    assert dict(ScriptedModelClient.calls) == {"customer_support_agent": 2}
+
+    ScriptedModelClient.calls.clear()
+    session = CustomerSupportSession(pool, mode="group_chat")
+    assert session.run("Where is my order?") == "Your order is on its way."
+    assert ScriptedModelClient.calls["customer_support_agent"] == 2
+    assert ScriptedModelClient.calls["speaker_selection"] > 0
+
+
+def test_closed_sessions_return_clean_agents_to_the_pool():
+    pool = AgentPool(
+        size=1, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    session = CustomerSupportSession(pool)
+    session.run("Where is my order?")
+    session.close()
+
+    reused = CustomerSupportSession(pool)
+    assert reused.agents == session.agents
+    assert reused.user_proxy.chat_messages[reused.customer_support_agent] == []
+
+
+def test_agents_are_built_on_demand(monkeypatch):
+    monkeypatch.setattr(customer_support_agent, "pool", None)
+    pool = customer_support_agent.get_pool()
+    assert pool.free == []
+    assert customer_support_agent.get_pool() is pool
+
+    pool = AgentPool(
+        size=1, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    assert pool.free == []
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first != second
+    pool.release(first)
+    pool.release(second)
+    assert pool.free == [first]
+
+
+def test_tool_executor_proxy_has_no_llm_or_code_execution():
+    pool = AgentPool(
+        size=1, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    session = CustomerSupportSession(pool)
+
+    assert session.user_proxy.llm_config is False
+    assert session.user_proxy._code_execution_config is False
+    assert session.run("Where is my order?") == "Your order is on its way."
+
+
+def test_ended_and_idle_sessions_give_their_agents_back(monkeypatch):
+    pool = AgentPool(
+        size=2, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    monkeypatch.setattr(customer_support_agent, "sessions", OrderedDict())
+
+    call_agent("Where is my order?", {"thread_id": "ended"}, agent_pool=pool)
+    call_agent("Where is my order?", {"thread_id": "idle"}, agent_pool=pool)
+    assert pool.free == []
+
+    end_session("ended")
+    assert len(pool.free) == 1
+
+    monkeypatch.setattr(customer_support_agent, "SESSION_IDLE_TTL", 0)
+    assert evict_sessions() == 1
+    assert len(pool.free) == 2
+    assert customer_support_agent.sessions == {}
+
+
+def test_least_recently_used_sessions_are_evicted_above_the_limit(monkeypatch):
+    pool = AgentPool(
+        size=3, llm_config=llm_config, model_client_cls=ScriptedModelClient
+    )
+    monkeypatch.setattr(customer_support_agent, "sessions", OrderedDict())
+    monkeypatch.setattr(customer_support_agent, "MAX_SESSIONS", 2)
+
+    for thread_id in ["first", "second", "first", "third"]:
+        call_agent("Where is my order?", {"thread_id": thread_id}, agent_pool=pool)
+    evict_sessions()
+
+    assert list(customer_support_agent.sessions) == ["first", "third"]
@@ -0,0 +1,226 @@
+"""
+Measure the cold start of every Python example: import time, first response and memory.
+
+Each example runs in a fresh process of its own environment, `uv run python` in
+the example directory by default, with its model pointed at a local `StubLLM`
+that answers at once. The process imports the module building the agent, sends
+one message through the example's adapter, see example_adapters.py, and reports:
+
+- process_start_ms: from spawning the process to the start of the measurement,
+  the interpreter and environment startup
+- import_ms: importing the agent module, with the framework and the agent setup
+- first_response_ms: from the end of the import to the reply to the first message
+- cold_start_ms: import_ms + first_response_ms
+- rss_after_import_mb and peak_rss_mb: resident memory after the import and the
+  highest resident memory of the process
+- modules_imported: modules in sys.modules after the first response
+
+Each metric is the median over `--runs` processes. An example that fails or times
+out gets an `error` instead, and the others still run. One JSON line is printed
+per example, and the whole report is written to `--output` when given.
+
+Usage:
+    python -m create_agent_app.common.benchmarks.cold_start [--examples agno_example ...] [--runs 3] [--output cold_start.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from create_agent_app.common.benchmarks.example_adapters import EXAMPLES, respond_async
+from create_agent_app.common.benchmarks.stub_llm import StubLLM, client_env
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+METRICS = [
+    "process_start_ms",
+    "import_ms",
+    "first_response_ms",
+    "cold_start_ms",
+    "rss_after_import_mb",
+    "peak_rss_mb",
+    "modules_imported",
+]
+
+
+def rss_mb() -> float:
+    """Current resident memory of the process, in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Highest resident memory of the process, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(example_name: str, message: str) -> Dict[str, Any]:
+    """Cold start of an example, in the current process"""
+    spawned_at = float(os.environ.get("COLD_START_SPAWNED_AT", time.time()))
+    result: Dict[str, Any] = {"process_start_ms": (time.time() - spawned_at) * 1000}
+    example = EXAMPLES[example_name]
+
+    phase = "import"
+    try:
+        start = time.perf_counter()
+        module = example.load()
+        result["import_ms"] = (time.perf_counter() - start) * 1000
+        result["rss_after_import_mb"] = rss_mb()
+
+        phase = "first_response"
+        start = time.perf_counter()
+        respond = example.create_respond(module)
+        asyncio.run(respond_async(respond, message, "cold-start"))
+        result["first_response_ms"] = (time.perf_counter() - start) * 1000
+        result["cold_start_ms"] = result["import_ms"] + result["first_response_ms"]
+    except Exception as error:
+        lines = str(error).strip().splitlines()
+        result["error"] = (
+            f"{phase}: {type(error).__name__}: {lines[0] if lines else ''}"
+        )
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["modules_imported"] = len(sys.modules)
+    return result
+
+
+def run_child(
+    benchmark: str,
+    example_name: str,
+    child_args: List[str],
+    python: List[str],
+    env: Dict[str, str],
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Run the `--child` side of a benchmark module for an example, in a fresh process
+    of the example's environment, and return the result it reports
+    """
+    command = python + [
+        "-m",
+        f"create_agent_app.common.benchmarks.{benchmark}",
+        "--child",
+        example_name,
+        *child_args,
+    ]
+    try:
+        completed = subprocess.run(
+            command,
+            cwd=REPO_ROOT / example_name,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX) :])
+
+    stderr = completed.stderr.strip().splitlines()
+    return {
+        "error": f"exited with {completed.returncode}: "
+        + (stderr[-1] if stderr else "no output")
+    }
+
+
+def run_example(
+    example_name: str, python: List[str], env: Dict[str, str], args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Cold start of an example in a fresh process of its environment"""
+    return run_child(
+        "cold_start",
+        example_name,
+        ["--message", args.message],
+        python,
+        {**env, "COLD_START_SPAWNED_AT": repr(time.time())},
+        args.timeout,
+    )
+
+
+def summarize(example_name: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"example": example_name, "runs": len(runs)}
+    for metric in METRICS:
+        values = [run[metric] for run in runs if metric in run]
+        summary[metric] = round(statistics.median(values), 2) if values else None
+    errors = sorted({run["error"] for run in runs if "error" in run})
+    if errors:
+        summary["error"] = "; ".join(errors)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--examples",
+        nargs="+",
+        choices=sorted(EXAMPLES),
+        default=sorted(EXAMPLES),
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument(
+        "--python",
+        default="uv run python",
+        help="Command running Python in the environment of an example, run from the example directory",
+    )
+    parser.add_argument("--message", default="Hi, can you help me?")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(measure(args.child, args.message)))
+        return
+
+    python = shlex.split(args.python)
+    results = []
+    with StubLLM() as stub:
+        for example_name in args.examples:
+            env = {
+                **os.environ,
+                **client_env(stub.base_url),
+                **EXAMPLES[example_name].stub_env,
+            }
+            runs = [
+                run_example(example_name, python, env, args) for _ in range(args.runs)
+            ]
+            summary = summarize(example_name, runs)
+            print(json.dumps(summary), flush=True)
+            results.append(summary)
+
+    if args.output:
+        report = {
+            "benchmark": "cold_start",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": platform.platform(),
+            "python": args.python,
+            "message": args.message,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+One way to send a user message to the agent of each Python `*_example`.
+
+Every example exposes its agent differently, a `call_agent` function, an agent
+object or a runner. `EXAMPLES` maps each example directory to the module that
+builds its agent and to an adapter turning that module into a single
+`respond(message, thread_id)` call, which returns the agent's reply as text or an
+awaitable of it. Messages with the same `thread_id` belong to one conversation,
+and `Example.end_conversation` releases what the example keeps for it once done,
+except for the examples marked `shared_state`, whose agent keeps a single
+conversation whatever the thread.
+
+Nothing is imported here until an adapter is used, and the adapters only import
+what their example module already imports, so they run in the example's own
+environment.
+"""
+
+import asyncio
+import importlib
+import inspect
+import re
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+Respond = Callable[[str, str], Union[str, Awaitable[str]]]
+
+
+@dataclass
+class Example:
+    # Module building the agent, imported from the example directory
+    module: str
+    create_respond: Callable[[ModuleType], Respond]
+    # Settings switching the example to an OpenAI compatible model, on top of
+    # `stub_llm.client_env`, for the examples that default to another provider
+    stub_env: Dict[str, str] = field(default_factory=dict)
+    # Releases what the example keeps for a finished conversation, for the examples
+    # that hold it until they are told
+    end: Optional[Callable[[ModuleType, str], None]] = None
+    # The example's agent keeps a single conversation for everyone, so messages of
+    # different threads end up in the same history
+    shared_state: bool = False
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(self.module)
+
+    def end_conversation(self, module: ModuleType, thread_id: str) -> None:
+        if self.end:
+            self.end(module, thread_id)
+
+
+def last_content(messages: List[Any]) -> str:
+    """Content of the last message, for OpenAI format dicts and message objects"""
+    message = messages[-1]
+    if isinstance(message, dict):
+        return str(message.get("content") or "")
+    return str(getattr(message, "content", message) or "")
+
+
+async def respond_async(respond: Respond, message: str, thread_id: str) -> str:
+    """Call a respond function, awaiting its reply when it is async"""
+    reply = respond(message, thread_id)
+    if inspect.isawaitable(reply):
+        reply = await reply
+    return reply
+
+
+def _agno(module: ModuleType) -> Respond:
+    def respond(message: str, thread_id: str) -> str:
+        return str(module.run_agent(message, thread_id).content)
+
+    return respond
+
+
+def _call_agent(module: ModuleType) -> Respond:
+    # `call_agent(message, context)` returning the reply as a string
+    def respond(message: str, thread_id: str) -> str:
+        return str(module.call_agent(message, {"thread_id": thread_id}))
+
+    return respond
+
+
+def _call_agent_messages(module: ModuleType) -> Respond:
+    # `call_agent(message, context)` returning {"messages": [...]}
+    def respond(message: str, thread_id: str) -> str:
+        return last_content(
+            module.call_agent(message, {"thread_id": thread_id})["messages"]
+        )
+
+    return respond
+
+
+def _end_autogen_session(module: ModuleType, thread_id: str) -> None:
+    module.end_session(thread_id)
+
+
+def _end_instructor_thread(module: ModuleType, thread_id: str) -> None:
+    module.agent.end_thread(thread_id)
+
+
+def _crewai(module: ModuleType) -> Respond:
+    async def respond(message: str, thread_id: str) -> str:
+        return str(await module.call_crew(message, {"thread_id": thread_id}))
+
+    return respond
+
+
+def _dspy(module: ModuleType) -> Respond:
+    import dspy
+
+    # Answers must come from the model, not from DSPy's cache of identical prompts
+    module.lm.cache = False
+    histories: Dict[str, Any] = {}
+
+    def respond(message: str, thread_id: str) -> str:
+        history = histories.get(thread_id, dspy.History(messages=[]))
+        outputs = module.agent(history=history, question=message)
+        histories[thread_id] = dspy.History(
+            messages=history.messages + [{"question": message, **outputs}]
+        )
+        return str(outputs.answer)
+
+    return respond
+
+
+def _google_adk(module: ModuleType) -> Respond:
+    runner = module.CustomerSupportRunner()
+
+    async def respond(message: str, thread_id: str) -> str:
+        contents = await runner.call(message, session_id=thread_id)
+        return "".join(part.text or "" for part in contents[-1].parts or [])
+
+    return respond
+
+
+def _inspect_ai(module: ModuleType) -> Respond:
+    async def respond(message: str, thread_id: str) -> str:
+        result = await module.call_agent(message, {"thread_id": thread_id})
+        return last_content(result["messages"])
+
+    return respond
+
+
+def _langgraph_functional_api(module: ModuleType) -> Respond:
+    from langchain_core.messages import HumanMessage
+
+    def respond(message: str, thread_id: str) -> str:
+        new_messages = module.agent.invoke(
+            [HumanMessage(content=message)],
+            {"configurable": {"thread_id": thread_id}},
+        )
+        return last_content(new_messages)
+
+    return respond
+
+
+def _langgraph_highlevel_api(module: ModuleType) -> Respond:
+    from langchain_core.messages import HumanMessage
+
+    def respond(message: str, thread_id: str) -> str:
+        state = module.agent.invoke(
+            {"messages": [HumanMessage(content=message)]},
+            {"configurable": {"thread_id": thread_id}},
+        )
+        return last_content(state["messages"])
+
+    return respond
+
+
+# Agents created for each conversation, by thread id, for the examples whose agent
+# keeps a single conversation. Only one example is loaded per process
+conversation_agents: Dict[str, Any] = {}
+
+
+def _letta(module: ModuleType) -> Respond:
+    # A Letta agent keeps one conversation on the server, so every conversation gets
+    # an agent of its own, configured and with the tools of the example's agent
+    tool_ids = [
+        tool.id for tool in module.client.agents.retrieve(module.agent_id).tools
+    ]
+
+    def respond(message: str, thread_id: str) -> str:
+        if thread_id not in conversation_agents:
+            conversation_agents[thread_id] = module.client.agents.create(
+                **{
+                    **module.agent_config,
+                    "name": f"{module.agent_config['name']}-{thread_id}",
+                },
+                tool_ids=tool_ids,
+            ).id
+        response = module.client.agents.messages.create(
+            agent_id=conversation_agents[thread_id],
+            messages=[{"role": "user", "content": message}],
+        )
+        return "".join(
+            str(letta_message.content)
+            for letta_message in response.messages
+            if letta_message.message_type == "assistant_message"
+        )
+
+    return respond
+
+
+def _end_letta_agent(module: ModuleType, thread_id: str) -> None:
+    agent_id = conversation_agents.pop(thread_id, None)
+    if agent_id:
+        module.client.agents.delete(agent_id)
+
+
+def _llama_index(module: ModuleType) -> Respond:
+    from llama_index.core.workflow import Context
+
+    contexts: Dict[str, Any] = {}
+
+    async def respond(message: str, thread_id: str) -> str:
+        if thread_id not in contexts:
+            contexts[thread_id] = Context(module.agent)
+        return str(await module.agent.run(message, ctx=contexts[thread_id]))
+
+    return respond
+
+
+def _pixelagent(module: ModuleType) -> Respond:
+    from pixelagent.openai import Agent
+
+    # Pixeltable runs its queries on the running event loop, where its model clients
+    # stay usable between messages, outside of one it starts a new loop per query.
+    # Its catalog is not safe to enter again from another conversation meanwhile,
+    # so messages are sent one at a time
+    lock = asyncio.Lock()
+
+    def create_agent(thread_id: str) -> Any:
+        # The agent's tables keep a single conversation, so every conversation gets
+        # an agent of its own, with the settings of the example's agent
+        name = re.sub(r"\W", "_", f"{module.agent.directory}_{thread_id}")
+        return Agent(
+            name=name,
+            system_prompt=module.agent.system_prompt,
+            model=module.agent.model,
+            n_latest_messages=module.agent.n_latest_messages,
+            tools=module.agent.tools,
+            reset=True,
+            chat_kwargs=module.agent.chat_kwargs,
+            tool_kwargs=module.agent.tool_kwargs,
+        )
+
+    async def respond(message: str, thread_id: str) -> str:
+        async with lock:
+            if thread_id not in conversation_agents:
+                conversation_agents[thread_id] = create_agent(thread_id)
+            return str(conversation_agents[thread_id].tool_call(message))
+
+    return respond
+
+
+def _end_pixelagent_agent(module: ModuleType, thread_id: str) -> None:
+    import pixeltable as pxt
+
+    agent = conversation_agents.pop(thread_id, None)
+    if agent:
+        pxt.drop_dir(agent.directory, force=True)
+
+
+def _promptflow(module: ModuleType) -> Respond:
+    def respond(message: str, thread_id: str) -> str:
+        return str(module.agent.chat(message))
+
+    return respond
+
+
+def _pydantic_ai(module: ModuleType) -> Respond:
+    histories: Dict[str, List[Any]] = {}
+
+    async def respond(message: str, thread_id: str) -> str:
+        result = await module.agent.run(
+            message, message_history=histories.get(thread_id, [])
+        )
+        histories[thread_id] = result.all_messages()
+        return str(result.output)
+
+    return respond
+
+
+def _smolagents(module: ModuleType) -> Respond:
+    def respond(message: str, thread_id: str) -> str:
+        return str(module.call_agent(message, {"thread_id": thread_id})["message"])
+
+    return respond
+
+
+def _strand(module: ModuleType) -> Respond:
+    async def respond(message: str, thread_id: str) -> str:
+        return str(await module.run_agent_interaction(message, session_id=thread_id))
+
+    return respond
+
+
+EXAMPLES: Dict[str, Example] = {
+    "agno_example": Example("customer_support_agent", _agno),
+    "autogen_example": Example(
+        "customer_support_agent", _call_agent, end=_end_autogen_session
+    ),
+    "crewai_example": Example("customer_support_crew", _crewai),
+    "dspy_example": Example(
+        "customer_support_agent",
+        _dspy,
+        {"DSPY_MODEL": "openai/gpt-4.1-mini"},
+    ),
+    "google_adk_example": Example("customer_support_runner", _google_adk),
+    "inspect_ai_example": Example(
+        "customer_support_agent",
+        _inspect_ai,
+        {"INSPECT_AI_MODEL": "openai/gpt-4.1-mini"},
+    ),
+    "instructor_example": Example(
+        "customer_support_agent", _call_agent, end=_end_instructor_thread
+    ),
+    "langgraph_functional_api_example": Example(
+        "customer_support_agent", _langgraph_functional_api
+    ),
+    "langgraph_highlevel_api_example": Example(
+        "customer_support_agent", _langgraph_highlevel_api
+    ),
+    # The Letta server calls the model, start it with OPENAI_API_BASE set to the stub
+    "letta_example": Example(
+        "customer_support_agent",
+        _letta,
+        {
+            "LETTA_MODEL": "openai/gpt-4o-mini",
+            "LETTA_EMBEDDING_MODEL": "openai/text-embedding-3-small",
+        },
+        end=_end_letta_agent,
+    ),
+    "llama_index_example": Example("customer_support_agent", _llama_index),
+    "no_framework_example": Example(
+        "customer_support_agent",
+        _call_agent_messages,
+        {"NO_FRAMEWORK_MODEL": "openai/gpt-4.1-mini"},
+    ),
+    "pixelagent_example": Example(
+        "customer_support_agent", _pixelagent, end=_end_pixelagent_agent
+    ),
+    # The flow keeps no history by thread, and there is no way to give it one
+    "promptflow_example": Example(
+        "customer_support_agent", _promptflow, shared_state=True
+    ),
+    "pydantic_ai_example": Example("customer_support_agent", _pydantic_ai),
+    "smolagents_example": Example(
+        "customer_support_agent",
+        _smolagents,
+        {"SMOLAGENTS_MODEL": "openai/gpt-4.1-mini"},
+    ),
+    "strand_example": Example("customer_support_agent", _strand),
+}
@@ -0,0 +1,306 @@
+"""
+Measure the overhead of every Python example on the same scripted conversation: time per turn, allocations, memory and throughput.
+
+Each example runs in a fresh process of its own environment, `uv run python` in
+the example directory by default, with its model pointed at a local `StubLLM`
+that answers at once, and its tools calling the shared `mocked_apis` without
+their simulated wait, see `--tool-latency`. All the time spent in a turn is then
+the framework's: building the prompts, parsing the model's answers, calling the
+tools, keeping the history, and the local HTTP calls to the stub. The
+conversation, `CONVERSATION`, asks for the order status, a refund and help with
+the internet, one turn each, sent through the example's adapter, see
+example_adapters.py, and is ended once done. After one conversation to warm up,
+the process reports:
+
+- turn_ms: median time of each turn, over `--conversations` conversations one
+  after another, and conversation_ms, the median time of a whole conversation
+- llm_calls_per_conversation: model calls the stub answered per conversation, and
+  overhead_per_llm_call_ms, conversation_ms divided by them
+- traced_peak_kb and retained_kb: memory allocated by Python during one more
+  conversation, traced by tracemalloc, at its highest and still held after it ended
+- throughput: for every `--concurrency` level, turns per second with that many
+  conversations at once, running max(level, `--conversations`) conversations,
+  with the p50 and p95 time of their turns and the resident memory after them.
+  Adapters that are not async run in a thread each. Examples whose agent keeps
+  a single conversation for everyone, `Example.shared_state`, are left out, with
+  shared_state set in their report, as their conversations would mix
+- peak_rss_mb: highest resident memory of the process
+- failed_turns: turns that raised or whose reply is not the scripted one, with the
+  first failure as `error`
+
+One JSON line is printed per example, and the whole report is written to
+`--output` when given.
+
+Usage:
+    python -m create_agent_app.common.benchmarks.overhead [--examples agno_example ...] [--conversations 5] [--concurrency 1 10 100] [--output overhead.json]
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import shlex
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from create_agent_app.common.benchmarks.cold_start import (
+    RESULT_PREFIX,
+    peak_rss_mb,
+    rss_mb,
+    run_child,
+)
+from create_agent_app.common.benchmarks.example_adapters import EXAMPLES, Respond
+from create_agent_app.common.benchmarks.stub_llm import StubLLM, client_env
+
+# Name, user message and a text the reply must contain, following `DEFAULT_SCRIPT`
+CONVERSATION = [
+    ("order_status", "Where is my order?", "9127412"),
+    ("refund", "I want a refund for it", "30 days"),
+    ("troubleshooting", "My internet is not working", "router"),
+]
+
+
+def describe(error: Exception) -> str:
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def send(respond: Respond, message: str, thread_id: str) -> str:
+    """Send a message, in a thread of the default executor when the adapter is not async"""
+    if inspect.iscoroutinefunction(respond):
+        return await respond(message, thread_id)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, respond, message, thread_id)
+
+
+async def converse(
+    respond: Respond,
+    end: Callable[[str], None],
+    thread_id: str,
+    turn_ms: Dict[str, List[float]],
+    failures: List[str],
+) -> int:
+    """
+    Go through `CONVERSATION`, stopping at the first turn that raises, and end the
+    conversation
+
+    Returns:
+        The number of turns answered
+    """
+    answered = 0
+    try:
+        for name, message, expected in CONVERSATION:
+            start = time.perf_counter()
+            try:
+                reply = await send(respond, message, thread_id)
+            except Exception as error:
+                failures.append(f"{name}: {describe(error)}")
+                break
+            turn_ms.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+            answered += 1
+            if expected not in str(reply):
+                failures.append(f"{name}: unexpected reply {str(reply)[:80]!r}")
+    finally:
+        end(thread_id)
+    return answered
+
+
+async def throughput(
+    respond: Respond,
+    end: Callable[[str], None],
+    concurrency: int,
+    conversations: int,
+    failures: List[str],
+) -> Dict[str, Any]:
+    """Turns per second with `concurrency` conversations at once"""
+    semaphore = asyncio.Semaphore(concurrency)
+    turn_ms: Dict[str, List[float]] = {}
+
+    async def conversation(i: int) -> int:
+        async with semaphore:
+            return await converse(
+                respond, end, f"throughput-{concurrency}-{i}", turn_ms, failures
+            )
+
+    start = time.perf_counter()
+    answered = await asyncio.gather(
+        *(conversation(i) for i in range(max(concurrency, conversations)))
+    )
+    elapsed = time.perf_counter() - start
+
+    all_turn_ms = [ms for times in turn_ms.values() for ms in times]
+    return {
+        "concurrency": concurrency,
+        "conversations": len(answered),
+        "turns_per_second": round(sum(answered) / elapsed, 2),
+        "turn_ms_p50": round(percentile(all_turn_ms, 0.5), 2) if all_turn_ms else None,
+        "turn_ms_p95": (
+            round(percentile(all_turn_ms, 0.95), 2) if all_turn_ms else None
+        ),
+        "rss_mb": round(rss_mb(), 2),
+    }
+
+
+async def run_benchmark(
+    respond: Respond,
+    end: Callable[[str], None],
+    conversations: int,
+    levels: List[int],
+) -> Dict[str, Any]:
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max(levels, default=1))
+    )
+    failures: List[str] = []
+    result: Dict[str, Any] = {}
+
+    await converse(respond, end, "warmup", {}, failures)
+    conversations_run = 1
+
+    turn_ms: Dict[str, List[float]] = {}
+    for i in range(conversations):
+        await converse(respond, end, f"sequential-{i}", turn_ms, failures)
+    conversations_run += conversations
+    result["turn_ms"] = {
+        name: round(statistics.median(turn_ms[name]), 2)
+        for name, _, _ in CONVERSATION
+        if name in turn_ms
+    }
+    if len(result["turn_ms"]) == len(CONVERSATION):
+        result["conversation_ms"] = round(sum(result["turn_ms"].values()), 2)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await converse(respond, end, "traced", {}, failures)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    conversations_run += 1
+    result["traced_peak_kb"] = round((peak - before) / 1024, 2)
+    result["retained_kb"] = round((current - before) / 1024, 2)
+
+    result["throughput"] = []
+    for level in levels:
+        level_result = await throughput(respond, end, level, conversations, failures)
+        conversations_run += level_result["conversations"]
+        result["throughput"].append(level_result)
+
+    result["conversations_run"] = conversations_run
+    result["failed_turns"] = len(failures)
+    if failures:
+        result["error"] = failures[0]
+    return result
+
+
+def measure(example_name: str, conversations: int, levels: List[int]) -> Dict[str, Any]:
+    """Overhead of an example, in the current process"""
+    example = EXAMPLES[example_name]
+    try:
+        module = example.load()
+        respond = example.create_respond(module)
+    except Exception as error:
+        return {"error": f"import: {describe(error)}", "peak_rss_mb": peak_rss_mb()}
+
+    def end(thread_id: str) -> None:
+        example.end_conversation(module, thread_id)
+
+    if example.shared_state:
+        levels = []
+    result = asyncio.run(run_benchmark(respond, end, conversations, levels))
+    if example.shared_state:
+        result["shared_state"] = True
+    result["peak_rss_mb"] = round(peak_rss_mb(), 2)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--examples",
+        nargs="+",
+        choices=sorted(EXAMPLES),
+        default=sorted(EXAMPLES),
+    )
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument(
+        "--tool-latency",
+        type=float,
+        default=0.0,
+        help="Seconds each mocked API request takes, see MOCKED_APIS_LATENCY",
+    )
+    parser.add_argument(
+        "--python",
+        default="uv run python",
+        help="Command running Python in the environment of an example, run from the example directory",
+    )
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = measure(args.child, args.conversations, args.concurrency)
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    python = shlex.split(args.python)
+    child_args = [
+        "--conversations",
+        str(args.conversations),
+        "--concurrency",
+        *map(str, args.concurrency),
+    ]
+    results = []
+    with StubLLM() as stub:
+        for example_name in args.examples:
+            env = {
+                **os.environ,
+                **client_env(stub.base_url),
+                **EXAMPLES[example_name].stub_env,
+                "MOCKED_APIS_LATENCY": str(args.tool_latency),
+            }
+            requests_before = stub.requests
+            result = run_child(
+                "overhead", example_name, child_args, python, env, args.timeout
+            )
+            conversations_run = result.pop("conversations_run", 0)
+            summary: Dict[str, Any] = {"example": example_name}
+            if conversations_run:
+                llm_calls = (stub.requests - requests_before) / conversations_run
+                summary["llm_calls_per_conversation"] = round(llm_calls, 2)
+                if llm_calls and "conversation_ms" in result:
+                    summary["overhead_per_llm_call_ms"] = round(
+                        result["conversation_ms"] / llm_calls, 2
+                    )
+            summary.update(result)
+            print(json.dumps(summary), flush=True)
+            results.append(summary)
+
+    if args.output:
+        report = {
+            "benchmark": "overhead",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "platform": platform.platform(),
+            "python": args.python,
+            "conversation": [message for _, message, _ in CONVERSATION],
+            "conversations": args.conversations,
+            "concurrency": args.concurrency,
+            "tool_latency": args.tool_latency,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,688 @@
+"""
+Local OpenAI-compatible LLM that replays scripted conversations, to benchmark offline.
+
+The script is a list of rules. The first rule whose `match` regular expression is
+found in the latest user message gives the steps of the agent's answer: tool calls
+to make, one model turn each, and then the reply. The step to answer with is the
+number of model turns taken since that user message, read from the request itself,
+so the stub keeps no state between requests and any number of conversations can
+run at once, whichever way the framework keeps their history.
+
+Each step is written in the format the request expects:
+
+- tool calls, when the request offers `tools`, or a `final_answer` tool call for
+  the reply when the request requires a tool call (smolagents)
+- ReAct text with "Action:" and "Action Input:", when the system prompt describes
+  that format (LlamaIndex's ReActAgent)
+- "[[ ## field ## ]]" output fields, when the prompt asks for them (DSPy)
+- JSON matching the schema of a tool forced with `tool_choice` or of a
+  `response_format`, filled with the reply (Instructor)
+
+Tool calls to tools the request does not offer are left out, so a script can list
+the alternatives of the examples with different tool sets in the same step.
+
+`latency` is the wait before the first token and `tokens_per_second` paces the
+tokens after it, streamed or not, 0 for no wait. Embeddings are answered with
+deterministic vectors and `/models` lists a few OpenAI model ids.
+
+Usage:
+    python -m create_agent_app.common.benchmarks.stub_llm [--port 8765] [--script script.json] [--latency 0.5] [--tokens-per-second 50]
+
+Then point the examples at it with the settings printed at startup, see
+`client_env` and `Example.stub_env` in example_adapters.py.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_REPLY = "Hello! I'm happy to help you with your XPTO Telecom service today."
+
+MODELS = ["gpt-4o", "gpt-4o-mini", "gpt-4.1-mini", "text-embedding-3-small"]
+
+# Sent like the OpenAI API does, some clients read them to pace their requests
+RATE_LIMIT_HEADERS = {
+    "x-ratelimit-limit-requests": "1000000",
+    "x-ratelimit-remaining-requests": "1000000",
+    "x-ratelimit-reset-requests": "0s",
+    "x-ratelimit-limit-tokens": "1000000000",
+    "x-ratelimit-remaining-tokens": "1000000000",
+    "x-ratelimit-reset-tokens": "0s",
+}
+
+# User messages that carry tool results back to the model in text based formats
+OBSERVATION_PREFIXES = ("Observation:", "Call id:")
+
+# smolagents starts every run with this, merged into the previous user message
+# when that one carries an observation
+NEW_TASK_MARKER = "New task:\n"
+
+# pixelagent sends the tool results back appended to the question,
+# `<question>: {'tool_name': result, ...}`
+INLINE_RESULTS = re.compile(r"^(.*?): \{'\w+': .*\}$", re.DOTALL)
+
+FIELD_MARKER = re.compile(r"\[\[ ## (\w+) ## \]\]")
+
+
+@dataclass
+class ToolCall:
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Step:
+    content: Optional[str] = None
+    tool_calls: List[ToolCall] = field(default_factory=list)
+
+
+@dataclass
+class Rule:
+    match: str
+    steps: List[Step]
+
+    def matches(self, text: str) -> bool:
+        return re.search(self.match, text, re.IGNORECASE) is not None
+
+
+def load_script(path: str) -> List[Rule]:
+    """
+    Load a script from a JSON file, a list of rules like
+
+        [{"match": "refund", "steps": [
+            {"tool_calls": [{"name": "get_company_policy", "arguments": {}}]},
+            {"content": "You can return it within 30 days."}
+        ]}]
+    """
+    with open(path) as f:
+        return [
+            Rule(
+                match=rule["match"],
+                steps=[
+                    Step(
+                        content=step.get("content"),
+                        tool_calls=[
+                            ToolCall(call["name"], call.get("arguments", {}))
+                            for call in step.get("tool_calls", [])
+                        ],
+                    )
+                    for step in rule["steps"]
+                ],
+            )
+            for rule in json.load(f)
+        ]
+
+
+# The customer support conversations of the examples, with the tools of every
+# example for the troubleshooting guide
+DEFAULT_SCRIPT = [
+    Rule(
+        r"refund|return|money back",
+        [
+            Step(tool_calls=[ToolCall("get_customer_order_history")]),
+            Step(tool_calls=[ToolCall("get_company_policy")]),
+            Step(
+                content="Your latest order is the iPhone 14 Pro from 2024-02-05. "
+                "According to our policy, products can be returned within 30 days "
+                "of delivery for a full refund, as long as they are in their "
+                "original condition. Would you like me to help you start the return?"
+            ),
+        ],
+    ),
+    Rule(
+        r"order|deliver|shipp|package",
+        [
+            Step(tool_calls=[ToolCall("get_customer_order_history")]),
+            Step(tool_calls=[ToolCall("get_order_status", {"order_id": "9127412"})]),
+            Step(
+                content="Your latest order, 9127412 for an iPhone 14 Pro, has been "
+                "shipped. Is there anything else I can help you with?"
+            ),
+        ],
+    ),
+    Rule(
+        r"internet|connection|wi-?fi|router|slow|not working",
+        [
+            Step(
+                tool_calls=[
+                    ToolCall("get_troubleshooting_guide", {"guide": "internet"}),
+                    ToolCall(
+                        "search_troubleshooting_guide",
+                        {"guide": "internet", "query": "internet not working"},
+                    ),
+                    ToolCall(
+                        "search_knowledge_base", {"input": "internet not working"}
+                    ),
+                ]
+            ),
+            Step(
+                content="Let's get your internet back:\n\n"
+                "1. Restart your router by unplugging it for 30 seconds\n"
+                "2. Check that all the cables are firmly connected\n"
+                "3. Run a speed test close to the router\n\n"
+                "Let me know if the problem persists."
+            ),
+        ],
+    ),
+    Rule(
+        r"human|person|representative|agent",
+        [
+            Step(tool_calls=[ToolCall("escalate_to_human")]),
+            Step(
+                content="You can open a ticket with our support team at "
+                "https://support.xpto.com/tickets and a human agent will get back to you."
+            ),
+        ],
+    ),
+    Rule(r"", [Step(content=DEFAULT_REPLY)]),
+]
+
+
+def message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return str(content)
+
+
+def system_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        message_text(message)
+        for message in messages
+        if message.get("role") in ("system", "developer")
+    )
+
+
+def current_turn(messages: List[Dict[str, Any]]) -> Tuple[str, int]:
+    """The latest user message and the number of model turns taken since"""
+    for i in range(len(messages) - 1, -1, -1):
+        text = message_text(messages[i])
+        if NEW_TASK_MARKER in text:
+            text = NEW_TASK_MARKER + text.rsplit(NEW_TASK_MARKER, 1)[1]
+        if messages[i].get("role") == "user" and not text.startswith(
+            OBSERVATION_PREFIXES
+        ):
+            turns_taken = sum(
+                1 for later in messages[i + 1 :] if later.get("role") == "assistant"
+            )
+            inline_results = INLINE_RESULTS.match(text)
+            if inline_results:
+                return inline_results.group(1), turns_taken + 1
+            return text, turns_taken
+    return "", 0
+
+
+def offered_tools(request: Dict[str, Any]) -> Set[str]:
+    return {
+        (tool.get("function") or tool).get("name")
+        for tool in request.get("tools") or request.get("functions") or []
+    }
+
+
+def tokens(text: str) -> List[str]:
+    """Words with their leading whitespace, counted as the tokens of the stub"""
+    return re.findall(r"\s*\S+", text) or [text]
+
+
+def schema_instance(
+    schema: Dict[str, Any], text: str, definitions: Optional[Dict[str, Any]] = None
+) -> Any:
+    """A value valid for a JSON schema, with `text` in every string"""
+    definitions = definitions or schema.get("$defs") or schema.get("definitions") or {}
+    if "$ref" in schema:
+        return schema_instance(
+            definitions[schema["$ref"].split("/")[-1]], text, definitions
+        )
+    if "default" in schema:
+        return schema["default"]
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [
+                option for option in schema[key] if option.get("type") != "null"
+            ] or schema[key]
+            return schema_instance(options[0], text, definitions)
+
+    schema_type = schema.get("type", "object")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+    if schema_type == "object":
+        return {
+            name: schema_instance(property_schema, text, definitions)
+            for name, property_schema in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        item = schema_instance(schema.get("items", {}), text, definitions)
+        return [item] * schema.get("minItems", 0)
+    return {"string": text, "integer": 0, "number": 0, "boolean": False}.get(
+        schema_type
+    )
+
+
+@dataclass
+class Reply:
+    content: Optional[str] = None
+    tool_calls: List[ToolCall] = field(default_factory=list)
+
+
+class StubLLM:
+    """
+    OpenAI chat completions server replaying a script, running in a background thread
+
+    Args:
+        port: Port to listen on, 0 picks a free one
+        script: The rules of the conversations, `DEFAULT_SCRIPT` by default
+        latency: Seconds before the first token of every completion
+        tokens_per_second: Pace of the tokens after the first one, 0 for no wait
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        script: Optional[List[Rule]] = None,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+    ):
+        self.script = script or DEFAULT_SCRIPT
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def start(self) -> "StubLLM":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "StubLLM":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def reply(self, request: Dict[str, Any]) -> Reply:
+        """The scripted reply to a chat completion request"""
+        messages = request.get("messages", [])
+        system = system_text(messages)
+        user_text, turns_taken = current_turn(messages)
+
+        fields_asked = "[[ ## " in user_text
+        if fields_asked:
+            # DSPy: the first field is the question, the trajectory has one
+            # observation per tool called
+            turns_taken += len(
+                re.findall(r"\[\[ ## observation_\d+ ## \]\]", user_text)
+            )
+            values = FIELD_MARKER.split(user_text)
+            user_text = values[2] if len(values) > 2 else user_text
+
+        offered = offered_tools(request)
+
+        def available(name: str) -> bool:
+            if offered:
+                return name in offered
+            # Text based formats describe the tools in the system prompt
+            return (fields_asked or "Action Input:" in system) and name in system
+
+        rules = [*self.script, Rule("", [Step(DEFAULT_REPLY)])]
+        rule = next(rule for rule in rules if rule.matches(user_text))
+        steps = []
+        for step in rule.steps:
+            tool_calls = [call for call in step.tool_calls if available(call.name)]
+            if not step.tool_calls or tool_calls:
+                steps.append(Step(step.content, tool_calls))
+        step = steps[min(turns_taken, len(steps) - 1)] if steps else Step(DEFAULT_REPLY)
+        return Reply(step.content, step.tool_calls)
+
+    def render(self, request: Dict[str, Any], reply: Reply) -> Dict[str, Any]:
+        """
+        The assistant message of a reply, in the format the request expects
+
+        Returns:
+            The message, with `content` and/or `tool_calls` in the OpenAI format
+        """
+        messages = request.get("messages", [])
+        system = system_text(messages)
+        last_text = message_text(messages[-1]) if messages else ""
+        text = reply.content or ""
+
+        tool_choice = request.get("tool_choice")
+        if isinstance(tool_choice, dict) and not reply.tool_calls:
+            forced = tool_choice.get("function", {}).get("name")
+            tool = next(
+                (
+                    tool.get("function") or tool
+                    for tool in request.get("tools") or []
+                    if (tool.get("function") or tool).get("name") == forced
+                ),
+                None,
+            )
+            if tool:
+                arguments = schema_instance(tool.get("parameters", {}), text)
+                return self._tool_calls_message([ToolCall(forced, arguments)])
+
+        if reply.tool_calls and request.get("tools"):
+            return self._tool_calls_message(reply.tool_calls)
+        if tool_choice == "required" and "final_answer" in offered_tools(request):
+            # smolagents answers with a final_answer tool call
+            return self._tool_calls_message(
+                [ToolCall("final_answer", {"answer": text})]
+            )
+
+        if "Respond with the corresponding output fields" in last_text:
+            return {"role": "assistant", "content": self._fields(last_text, reply)}
+
+        if "Action Input:" in system:
+            if reply.tool_calls:
+                actions = "\n".join(
+                    f"Action: {call.name}\nAction Input: {json.dumps(call.arguments)}"
+                    for call in reply.tool_calls
+                )
+                content = f"Thought: I need to use a tool to help me answer the question.\n{actions}"
+            else:
+                content = f"Thought: I can answer without using any more tools.\nAnswer: {text}"
+            return {"role": "assistant", "content": content}
+
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format.get("json_schema", {}).get("schema", {})
+            return {
+                "role": "assistant",
+                "content": json.dumps(schema_instance(schema, text)),
+            }
+        if response_format.get("type") == "json_object":
+            return {"role": "assistant", "content": json.dumps({"response": text})}
+
+        return {"role": "assistant", "content": text}
+
+    def completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        message = self.render(request, self.reply(request))
+        self._wait(self.latency + self._duration(message))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": (
+                        "tool_calls" if message.get("tool_calls") else "stop"
+                    ),
+                }
+            ],
+            "usage": usage(request, message),
+        }
+
+    def completion_chunks(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        message = self.render(request, self.reply(request))
+        chunk = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+        }
+
+        def delta(delta: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                **chunk,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+
+        self._wait(self.latency)
+        yield delta({"role": "assistant", "content": ""})
+        for i, token in enumerate(tokens(message.get("content") or "")):
+            if i:
+                self._wait(self._duration({"content": token}))
+            yield delta({"content": token})
+        for index, tool_call in enumerate(message.get("tool_calls", [])):
+            self._wait(self._duration({"tool_calls": [tool_call]}))
+            yield delta({"tool_calls": [{**tool_call, "index": index}]})
+        yield {
+            **chunk,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {},
+                    "finish_reason": (
+                        "tool_calls" if message.get("tool_calls") else "stop"
+                    ),
+                }
+            ],
+            "usage": usage(request, message),
+        }
+
+    def embeddings(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = request.get("input", "")
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+        dimensions = request.get("dimensions", 1536)
+        return {
+            "object": "list",
+            "model": request.get("model", "stub"),
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": embedding(json.dumps(text), dimensions),
+                }
+                for index, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    def _fields(self, last_text: str, reply: Reply) -> str:
+        # DSPy asks for the output fields after "Respond with the corresponding output fields"
+        instructions = last_text.split("Respond with the corresponding output fields")[
+            -1
+        ]
+        names = [
+            name
+            for name in dict.fromkeys(FIELD_MARKER.findall(instructions))
+            if name != "completed"
+        ]
+        tool_call = reply.tool_calls[0] if reply.tool_calls else None
+        values = []
+        for name in names:
+            if name.endswith("tool_name"):
+                value = tool_call.name if tool_call else "finish"
+            elif name.endswith("tool_args"):
+                value = json.dumps(tool_call.arguments if tool_call else {})
+            elif "thought" in name or "reasoning" in name:
+                value = (
+                    "I need to use a tool to answer."
+                    if tool_call
+                    else "I have what I need to answer."
+                )
+            else:
+                value = reply.content or ""
+            values.append(f"[[ ## {name} ## ]]\n{value}")
+        return "\n\n".join(values + ["[[ ## completed ## ]]"])
+
+    def _tool_calls_message(self, tool_calls: List[ToolCall]) -> Dict[str, Any]:
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:24]}",
+                    "type": "function",
+                    "function": {
+                        "name": call.name,
+                        "arguments": json.dumps(call.arguments),
+                    },
+                }
+                for call in tool_calls
+            ],
+        }
+
+    def _duration(self, message: Dict[str, Any]) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return completion_tokens(message) / self.tokens_per_second
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written apart, without this every response
+            # waits for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self.send_json(
+                        200,
+                        {
+                            "object": "list",
+                            "data": [
+                                {"id": model, "object": "model", "created": 0}
+                                for model in MODELS
+                            ],
+                        },
+                    )
+                else:
+                    self.send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path = self.path.rstrip("/")
+                request = json.loads(body or b"{}")
+                with stub.lock:
+                    stub.requests += 1
+
+                if path.endswith("/embeddings"):
+                    self.send_json(200, stub.embeddings(request))
+                    return
+                if not path.endswith("/chat/completions"):
+                    self.send_json(404, {"error": {"message": "Not found"}})
+                    return
+                if not request.get("stream"):
+                    self.send_json(200, stub.completion(request))
+                    return
+
+                self.send_response(200)
+                self.send_rate_limit_headers()
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for chunk in stub.completion_chunks(request):
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                response = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_rate_limit_headers()
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def send_rate_limit_headers(self) -> None:
+                for header, value in RATE_LIMIT_HEADERS.items():
+                    self.send_header(header, value)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def completion_tokens(message: Dict[str, Any]) -> int:
+    count = len(tokens(message.get("content") or "")) if message.get("content") else 0
+    for tool_call in message.get("tool_calls") or []:
+        count += len(tokens(tool_call["function"]["name"]))
+        count += len(tokens(tool_call["function"]["arguments"]))
+    return max(1, count)
+
+
+def usage(request: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, int]:
+    # Rough prompt token count, four characters per token
+    prompt_tokens = len(json.dumps(request.get("messages", []))) // 4
+    count = completion_tokens(message)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": count,
+        "total_tokens": prompt_tokens + count,
+    }
+
+
+def embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic unit vector of a text"""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    generator = random.Random(seed)
+    vector = [generator.gauss(0, 1) for _ in range(dimensions)]
+    norm = sum(value * value for value in vector) ** 0.5
+    return [value / norm for value in vector]
+
+
+def client_env(base_url: str) -> Dict[str, str]:
+    """Environment pointing the OpenAI clients of the examples at the stub"""
+    return {
+        # OpenAI SDK, LiteLLM and the frameworks built on them
+        "OPENAI_BASE_URL": base_url,
+        # LlamaIndex and CrewAI
+        "OPENAI_API_BASE": base_url,
+        "OPENAI_API_KEY": "sk-stub",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--script", help="JSON script, the customer support one by default"
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    args = parser.parse_args()
+
+    script = load_script(args.script) if args.script else None
+    with StubLLM(args.port, script, args.latency, args.tokens_per_second) as stub:
+        print(
+            f"Serving chat completions at {stub.base_url}, point the examples at it with:"
+        )
+        for name, value in client_env(stub.base_url).items():
+            print(f"  {name}={value}")
+        try:
+            while True:
+                time.sleep(5)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Literal, Tuple, TypedDict
+
+from create_agent_app.common.customer_support.mocked_apis import (
+    DocumentResponse,
+    http_GET_troubleshooting_guide,
+)
+
+# A line that is bold as a whole, like "**Troubleshooting Steps:**", starts a section
+SECTION_HEADING = re.compile(r"^\*\*[^*]+\*\*\s*$")
+DOCUMENT_HEADING = re.compile(r"^\*\*Document \d+:")
+
+STOPWORDS = set(
+    "a an and are can do does for how i in is it my of on or the to what why with you".split()
+)
+
+
+class Section(TypedDict):
+    title: str
+    content: str
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words without stopwords, with plurals reduced to the singular"""
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text.lower().replace("-", "")):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def split_sections(markdown: str) -> List[Section]:
+    """
+    Split a knowledge base document into its sections, each titled with the
+    document it belongs to so it still makes sense on its own
+    """
+    sections: List[Section] = []
+    document_title = ""
+    lines: List[str] = []
+
+    def flush() -> None:
+        content = "\n".join(lines).strip()
+        if content:
+            sections.append(Section(title=document_title, content=content))
+
+    for line in markdown.splitlines():
+        if SECTION_HEADING.match(line):
+            flush()
+            lines = []
+            if DOCUMENT_HEADING.match(line):
+                document_title = line.strip("* ")
+                continue
+        lines.append(line)
+    flush()
+    return sections
+
+
+class BM25Index:
+    """
+    BM25 statistics of a list of texts, computed once from their term frequencies,
+    so a query only scores the texts sharing a word with it
+
+    Args:
+        term_frequencies: The count of every token of each text, see `tokenize`
+    """
+
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self, term_frequencies: List[Dict[str, int]]):
+        self.lengths = [sum(frequencies.values()) for frequencies in term_frequencies]
+        self.average_length = sum(self.lengths) / max(len(self.lengths), 1)
+        # For every token, the texts containing it and how many times
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for i, frequencies in enumerate(term_frequencies):
+            for token, tf in frequencies.items():
+                self.postings.setdefault(token, []).append((i, tf))
+
+    @classmethod
+    def from_texts(cls, texts: List[str]) -> "BM25Index":
+        return cls([dict(Counter(tokenize(text))) for text in texts])
+
+    def rank(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Indices of the texts that match the query with their score, most relevant
+        first, leaving out the ones scoring less than a quarter of the best match
+        """
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token, [])
+            idf = math.log(
+                1 + (len(self.lengths) - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for i, tf in postings:
+                length_norm = (
+                    1 - self.b + self.b * self.lengths[i] / self.average_length
+                )
+                scores[i] = scores.get(i, 0.0) + idf * tf * (self.k1 + 1) / (
+                    tf + self.k1 * length_norm
+                )
+
+        cutoff = max(scores.values(), default=0) / 4
+        order = sorted(scores, key=lambda i: (-scores[i], i))
+        return [(i, scores[i]) for i in order if scores[i] > 0 and scores[i] >= cutoff]
+
+
+def rank_texts(query: str, texts: List[str]) -> List[Tuple[int, float]]:
+    """Rank the texts for the query with a `BM25Index` built on the spot"""
+    return BM25Index.from_texts(texts).rank(query)
+
+
+def rank_sections(query: str, sections: List[Section]) -> List[Section]:
+    """Sections that match the query, sorted by relevance with title words included"""
+    texts = [f"{section['title']} {section['content']}" for section in sections]
+    return [sections[i] for i, _ in rank_texts(query, texts)]
+
+
+def search_troubleshooting_guide(
+    guide: Literal["internet", "mobile", "television", "ecommerce"],
+    query: str,
+    char_budget: int = 3000,
+) -> DocumentResponse:
+    """
+    The sections of a troubleshooting guide most relevant to the query, within
+    `char_budget` characters, grouped by the document they belong to, the most
+    relevant document first
+
+    Sections are taken by relevance until the budget runs out, the one that does not
+    fit anymore is cut short. If nothing matches the query, the guide is cut short.
+    """
+    document = http_GET_troubleshooting_guide(guide)
+    sections = split_sections(document["document_content"])
+
+    excerpts: Dict[int, str] = {}
+    remaining = char_budget
+    for section in rank_sections(query, sections) or sections:
+        index = sections.index(section)
+        heading = f"## {section['title']}\n\n" if section["title"] else ""
+        excerpt = section["content"][: max(remaining - len(heading) - 2, 0)]
+        if not excerpt:
+            break
+        excerpts[index] = excerpt
+        remaining -= len(heading) + len(excerpt) + 2
+
+    document_rank: Dict[str, int] = {}
+    for index in excerpts:
+        document_rank.setdefault(sections[index]["title"], len(document_rank))
+
+    parts = []
+    current_title = None
+    for index in sorted(
+        excerpts, key=lambda i: (document_rank[sections[i]["title"]], i)
+    ):
+        title = sections[index]["title"]
+        if title and title != current_title:
+            parts.append(f"## {title}")
+        current_title = title
+        parts.append(excerpts[index])
+
+    return DocumentResponse(
+        document_id=document["document_id"],
+        document_name=document["document_name"],
+        document_content="\n\n".join(parts),
+    )
@@ -1,8 +1,12 @@
+import os
 import random
 import time
 from os import path
 from typing import List, Literal, TypedDict
 
+# Seconds each simulated request to the order and document systems takes
+LATENCY = float(os.getenv("MOCKED_APIS_LATENCY", "0.1"))
+
 
 class OrderSummaryResponse(TypedDict):
     order_id: str
@@ -37,7 +41,7 @@ def http_GET_order_status(order_id: str) -> OrderStatusResponse:
     if not order_id in ["9127412", "3451323"]:
         raise ValueError("Order not found")
 
-    time.sleep(0.1)
+    time.sleep(LATENCY)
     random_status: Literal["pending", "shipped", "delivered", "cancelled"] = (
         random.choice(["pending", "shipped", "delivered", "cancelled"])
     )
@@ -51,7 +55,7 @@ class DocumentResponse(TypedDict):
 
 
 def http_GET_company_policy() -> DocumentResponse:
-    time.sleep(0.1)
+    time.sleep(LATENCY)
     with open(
         path.join(path.dirname(__file__), "knowledge_base", "company_policy.md"), "r"
     ) as f:
@@ -65,7 +69,7 @@ def http_GET_company_policy() -> DocumentResponse:
 def http_GET_troubleshooting_guide(
     guide: Literal["internet", "mobile", "television", "ecommerce"],
 ) -> DocumentResponse:
-    time.sleep(0.1)
+    time.sleep(LATENCY)
     with open(
         path.join(
             path.dirname(__file__), "knowledge_base", f"troubleshooting_{guide}.md"
@@ -0,0 +1,16 @@
+import json
+from typing import Any
+
+
+def render_tool_output(value: Any) -> str:
+    """
+    Render a tool result as the text the model receives: documents as their own
+    markdown under the document name, anything else as minified JSON
+
+    Wrapping a markdown document in `json.dumps` escapes every newline and quote, and
+    the framework encodes the result again when it builds the request, so the model
+    reads (and pays for) escape sequences instead of the document.
+    """
+    if isinstance(value, dict) and "document_content" in value:
+        return f"# {value['document_name']}\n\n{value['document_content']}"
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,209 @@
+"""
+Bounded in-memory checkpointer for the LangGraph examples.
+
+`InMemorySaver` keeps every intermediate checkpoint of every thread forever, which
+is fine for a test run but grows without limits on a long running support bot.
+`PruningInMemorySaver` is a drop-in replacement that keeps only the latest N
+checkpoints per thread, evicts threads that have been idle for too long and can
+report how many bytes it is holding.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Set, Tuple, TypedDict
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class CheckpointerStats(TypedDict):
+    threads: int
+    checkpoints: int
+    writes: int
+    blobs: int
+    resident_bytes: int
+
+
+class PruningInMemorySaver(InMemorySaver):
+    """
+    InMemorySaver that compacts its history as it goes
+
+    Args:
+        max_checkpoints_per_thread: How many of the most recent checkpoints to keep for
+            each thread and namespace, older ones are dropped together with their
+            pending writes and the channel values no kept checkpoint refers to
+        idle_thread_ttl: Seconds after the last read or write of a thread before it is
+            evicted completely, None to keep threads until deleted explicitly
+    """
+
+    def __init__(
+        self,
+        *,
+        max_checkpoints_per_thread: int = 1,
+        idle_thread_ttl: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        if max_checkpoints_per_thread < 1:
+            raise ValueError("max_checkpoints_per_thread must be at least 1")
+
+        super().__init__(**kwargs)
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.idle_thread_ttl = idle_thread_ttl
+        self.last_seen: Dict[str, float] = {}
+        self.lock = threading.RLock()
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self.lock:
+            self._touch(config["configurable"]["thread_id"])
+            return super().get_tuple(config)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self.lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            saved_config = super().put(config, checkpoint, metadata, new_versions)
+            self._touch(thread_id)
+            self.prune_thread(thread_id, checkpoint_ns)
+            self.evict_idle_threads()
+            return saved_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self.lock:
+            self._touch(config["configurable"]["thread_id"])
+            super().put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            super().delete_thread(thread_id)
+            self.last_seen.pop(thread_id, None)
+
+    def prune_thread(self, thread_id: str, checkpoint_ns: str = "") -> int:
+        """
+        Drop all but the latest checkpoints of a thread namespace
+
+        Args:
+            thread_id: The thread to compact
+            checkpoint_ns: The checkpoint namespace inside the thread, "" for the root graph
+
+        Returns:
+            The number of checkpoints removed
+        """
+        with self.lock:
+            checkpoints = self.storage.get(thread_id, {}).get(checkpoint_ns)
+            if not checkpoints or len(checkpoints) <= self.max_checkpoints_per_thread:
+                return 0
+
+            # Checkpoint ids are uuid6, so sorting them sorts by creation time
+            checkpoint_ids = sorted(checkpoints.keys(), reverse=True)
+            removed_ids = checkpoint_ids[self.max_checkpoints_per_thread :]
+            for checkpoint_id in removed_ids:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            referenced_blobs: Set[Tuple[str, Any]] = set()
+            for checkpoint, _, _ in checkpoints.values():
+                channel_versions = self.serde.loads_typed(checkpoint)[
+                    "channel_versions"
+                ]
+                referenced_blobs.update(channel_versions.items())
+            for key in list(self.blobs.keys()):
+                if (
+                    key[0] == thread_id
+                    and key[1] == checkpoint_ns
+                    and (key[2], key[3]) not in referenced_blobs
+                ):
+                    del self.blobs[key]
+
+            return len(removed_ids)
+
+    def evict_idle_threads(self) -> int:
+        """
+        Delete every thread that was not used for longer than `idle_thread_ttl`
+
+        Returns:
+            The number of threads evicted
+        """
+        if self.idle_thread_ttl is None:
+            return 0
+
+        with self.lock:
+            deadline = time.monotonic() - self.idle_thread_ttl
+            idle_thread_ids = [
+                thread_id
+                for thread_id, last_seen in self.last_seen.items()
+                if last_seen < deadline
+            ]
+            for thread_id in idle_thread_ids:
+                self.delete_thread(thread_id)
+
+            return len(idle_thread_ids)
+
+    def resident_size(self, thread_id: Optional[str] = None) -> int:
+        """
+        Approximate memory held by the serialized checkpoints, writes and channel values
+
+        Args:
+            thread_id: Only count this thread, or every thread if None
+
+        Returns:
+            The size in bytes
+        """
+        with self.lock:
+            return self.stats(thread_id)["resident_bytes"]
+
+    def stats(self, thread_id: Optional[str] = None) -> CheckpointerStats:
+        """
+        Counts of what is currently kept in memory
+
+        Args:
+            thread_id: Only count this thread, or every thread if None
+
+        Returns:
+            Number of threads, checkpoints, writes, blobs and their size in bytes
+        """
+        with self.lock:
+            stats = CheckpointerStats(
+                threads=0, checkpoints=0, writes=0, blobs=0, resident_bytes=0
+            )
+            for storage_thread_id, namespaces in self.storage.items():
+                if thread_id is not None and storage_thread_id != thread_id:
+                    continue
+                stats["threads"] += 1
+                for checkpoints in namespaces.values():
+                    for checkpoint, metadata, _ in checkpoints.values():
+                        stats["checkpoints"] += 1
+                        stats["resident_bytes"] += len(checkpoint[1]) + len(metadata[1])
+            for key, writes in self.writes.items():
+                if thread_id is not None and key[0] != thread_id:
+                    continue
+                for _, _, value, _ in writes.values():
+                    stats["writes"] += 1
+                    stats["resident_bytes"] += len(value[1])
+            for key, value in self.blobs.items():
+                if thread_id is not None and key[0] != thread_id:
+                    continue
+                stats["blobs"] += 1
+                stats["resident_bytes"] += len(value[1])
+
+            return stats
+
+    def _touch(self, thread_id: str) -> None:
+        self.last_seen[thread_id] = time.monotonic()
@@ -0,0 +1,118 @@
+"""
+Optimize the customer support agent prompts with DSPy and save the result.
+
+Run it once, or whenever the prompt or the tools change, and commit the generated
+file, `customer_support_agent.py` loads it at startup so no optimization happens
+when the agent starts.
+
+Only the instructions are optimized (no few-shot demos), so the optimized program
+does not make the prompt longer, the script prints the prompt size before and after.
+
+Usage:
+    uv run python compile_agent.py [--output optimized_agent.json] [--auto light]
+"""
+
+import argparse
+
+import dspy
+
+from customer_support_agent import OPTIMIZED_PROGRAM_PATH, build_agent
+
+trainset = [
+    dspy.Example(
+        history=dspy.History(messages=[]),
+        question=question,
+        criteria=criteria,
+    ).with_inputs("history", "question")
+    for question, criteria in [
+        (
+            "What is the status of my last order?",
+            "Replies with the status of the latest order without asking for the order id",
+        ),
+        (
+            "Where are my Airpods?",
+            "Looks up the order history and replies with the status of the Airpods order",
+        ),
+        (
+            "My Airpods are not working, can I return them?",
+            "Explains the refund policy in simple terms based on the company policy",
+        ),
+        (
+            "This is the third time I'm asking, I want to talk to a human now!",
+            "Hands the conversation over to a human with the support ticket link",
+        ),
+        (
+            "My internet is very slow since yesterday",
+            "Gives troubleshooting steps from the internet troubleshooting guide",
+        ),
+        (
+            "My phone does not connect to the mobile network",
+            "Gives troubleshooting steps from the mobile troubleshooting guide",
+        ),
+        (
+            "What is your policy on cancelling a subscription?",
+            "Explains the cancellation rules quoting the original company policy text",
+        ),
+        (
+            "How much did I pay for my iPhone?",
+            "Replies with the total amount of the iPhone order from the order history",
+        ),
+    ]
+]
+
+
+class JudgeAnswer(dspy.Signature):
+    """Judge if the customer support answer satisfies the criteria."""
+
+    question: str = dspy.InputField()
+    answer: str = dspy.InputField()
+    criteria: str = dspy.InputField()
+    satisfied: bool = dspy.OutputField()
+
+
+judge = dspy.Predict(JudgeAnswer)
+
+
+def metric(example: dspy.Example, prediction: dspy.Prediction, trace=None) -> bool:
+    return judge(
+        question=example.question,
+        answer=prediction.answer,
+        criteria=example.criteria,
+    ).satisfied
+
+
+def prompt_size(agent: dspy.Module) -> int:
+    return sum(
+        len(predictor.signature.instructions)
+        + sum(len(str(demo)) for demo in predictor.demos)
+        for _, predictor in agent.named_predictors()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", default=OPTIMIZED_PROGRAM_PATH)
+    parser.add_argument("--auto", choices=["light", "medium", "heavy"], default="light")
+    args = parser.parse_args()
+
+    agent = build_agent()
+    optimizer = dspy.MIPROv2(
+        metric=metric,
+        auto=args.auto,
+        max_bootstrapped_demos=0,
+        max_labeled_demos=0,
+    )
+    optimized_agent = optimizer.compile(
+        agent,
+        trainset=trainset,
+        requires_permission_to_run=False,
+    )
+    optimized_agent.save(args.output)
+
+    print(f"Saved optimized program to {args.output}")
+    print(f"Prompt size before: {prompt_size(agent)} chars")
+    print(f"Prompt size after: {prompt_size(optimized_agent)} chars")
+
+
+if __name__ == "__main__":
+    main()
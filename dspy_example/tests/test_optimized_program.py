@@ -0,0 +1,22 @@
+from customer_support_agent import build_agent, load_agent
+
+
+def test_loads_the_saved_program_instead_of_the_default_prompt(tmp_path):
+    program_path = str(tmp_path / "optimized_agent.json")
+    optimized_agent = build_agent()
+    optimized_agent.react.signature = optimized_agent.react.signature.with_instructions(
+        "Short optimized instructions"
+    )
+    optimized_agent.save(program_path)
+
+    agent = load_agent(program_path)
+
+    assert agent.react.signature.instructions == "Short optimized instructions"
+
+
+def test_uses_the_default_prompt_when_there_is_no_saved_program(tmp_path):
+    agent = load_agent(str(tmp_path / "missing.json"))
+
+    assert agent.react.signature.instructions == (
+        build_agent().react.signature.instructions
+    )
@@ -0,0 +1,97 @@
+"""
+Throughput of many concurrent conversations through the ADK runner.
+
+Compares the long-lived `CustomerSupportRunner` with its sessions in memory and
+with the `DiskSessionService`, keeping at most `--max-cached-sessions` of them in
+memory. The model is replaced by a stub with a fixed latency,
+so the numbers show the runner and session overhead only, no API key is needed.
+
+Usage:
+    uv run python benchmark_session_throughput.py --sessions 200 --turns 5
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import AsyncGenerator, Awaitable, Callable
+
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai.types import Content, Part
+
+from customer_support_agent import SYSTEM_PROMPT
+from customer_support_runner import CustomerSupportRunner, DiskSessionService
+
+
+class StubLlm(BaseLlm):
+    latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency)
+        yield LlmResponse(
+            content=Content(role="model", parts=[Part(text="How can I help?")])
+        )
+
+
+def build_agent(latency: float) -> Agent:
+    return Agent(
+        name="customer_support_agent",
+        model=StubLlm(model="stub", latency=latency),
+        instruction=SYSTEM_PROMPT,
+    )
+
+
+def long_lived(runner: CustomerSupportRunner) -> Callable[[str, str], Awaitable[None]]:
+    async def call(message: str, session_id: str) -> None:
+        await runner.call(message, session_id)
+
+    return call
+
+
+async def measure(
+    call: Callable[[str, str], Awaitable[None]], sessions: int, turns: int
+) -> float:
+    async def conversation(i: int) -> None:
+        for turn in range(turns):
+            await call(f"message {turn}", f"session-{i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(conversation(i) for i in range(sessions)))
+    return sessions * turns / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--max-cached-sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    root_agent = build_agent(args.llm_latency)
+    with tempfile.TemporaryDirectory() as directory:
+        setups = {
+            "long-lived runner, memory": long_lived(
+                CustomerSupportRunner(root_agent=root_agent)
+            ),
+            "long-lived runner, disk": long_lived(
+                CustomerSupportRunner(
+                    session_service=DiskSessionService(
+                        directory, max_cached_sessions=args.max_cached_sessions
+                    ),
+                    root_agent=root_agent,
+                )
+            ),
+        }
+        for name, call in setups.items():
+            turns_per_second = await measure(call, args.sessions, args.turns)
+            print(f"{name:<28} {turns_per_second:8.1f} turns/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,295 @@
+"""
+Production entry point for the Google ADK customer support agent.
+
+A single long-lived `Runner` is shared by every conversation instead of building
+one per turn, and sessions can be kept on disk with `DiskSessionService` so they
+survive restarts without keeping them all in memory.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.state import State
+from google.genai.types import Content, Part
+from litellm.types.llms.openai import AllMessageValues
+import google.adk.models.lite_llm as litellm
+
+from customer_support_agent import agent
+
+APP_NAME = "customer_support_agent"
+
+
+class DiskSessionService(InMemorySessionService):
+    """
+    Session service that persists every session to disk and keeps only the most
+    recently used ones in memory
+
+    Each session is a JSON lines file under `directory/app_name/user_id/`, the first
+    line has the session itself and every following line is one event, so appending
+    an event is a single line write instead of rewriting the whole session.
+
+    Args:
+        directory: Where to store the session files
+        max_cached_sessions: How many sessions to keep in memory, the least recently
+            used ones are dropped from memory (they stay on disk)
+        session_ttl: Seconds since the last update after which `evict_expired`
+            deletes a session from disk, None to keep sessions forever
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_cached_sessions: int = 1000,
+        session_ttl: Optional[float] = None,
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.max_cached_sessions = max_cached_sessions
+        self.session_ttl = session_ttl
+        self.recently_used: OrderedDict[Tuple[str, str, str], None] = OrderedDict()
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        path = self._session_path(app_name, user_id, session.id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(
+                self.sessions[app_name][user_id][session.id].model_dump_json() + "\n"
+            )
+        self._mark_used(app_name, user_id, session.id)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        if not self._load_session(app_name, user_id, session_id):
+            return None
+        self._mark_used(app_name, user_id, session_id)
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str
+    ) -> ListSessionsResponse:
+        user_directory = self.directory / app_name / user_id
+        sessions = []
+        for path in sorted(user_directory.glob("*.jsonl")):
+            with open(path) as f:
+                session = Session.model_validate_json(f.readline())
+            session.state = {}
+            sessions.append(session)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+        self.recently_used.pop((app_name, user_id, session_id), None)
+        self._session_path(app_name, user_id, session_id).unlink(missing_ok=True)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        self._load_session(session.app_name, session.user_id, session.id)
+        event = await super().append_event(session=session, event=event)
+        path = self._session_path(session.app_name, session.user_id, session.id)
+        if path.exists():
+            with open(path, "a") as f:
+                f.write(event.model_dump_json(exclude_none=True) + "\n")
+        return event
+
+    def evict_expired(self) -> int:
+        """
+        Delete the sessions that were not updated for longer than `session_ttl`
+
+        Returns:
+            The number of sessions deleted
+        """
+        if self.session_ttl is None:
+            return 0
+
+        deadline = time.time() - self.session_ttl
+        deleted = 0
+        for path in self.directory.glob("*/*/*.jsonl"):
+            if path.stat().st_mtime < deadline:
+                app_name, user_id = path.parent.parent.name, path.parent.name
+                self.sessions.get(app_name, {}).get(user_id, {}).pop(path.stem, None)
+                self.recently_used.pop((app_name, user_id, path.stem), None)
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    def _session_path(self, app_name: str, user_id: str, session_id: str) -> Path:
+        return self.directory / app_name / user_id / f"{session_id}.jsonl"
+
+    def _load_session(self, app_name: str, user_id: str, session_id: str) -> bool:
+        if session_id in self.sessions.get(app_name, {}).get(user_id, {}):
+            return True
+
+        path = self._session_path(app_name, user_id, session_id)
+        if not path.exists():
+            return False
+
+        with open(path) as f:
+            session = Session.model_validate_json(f.readline())
+            for line in f:
+                event = Event.model_validate_json(line)
+                state_delta = event.actions.state_delta if event.actions else {}
+                for key, value in state_delta.items():
+                    if key.startswith(State.TEMP_PREFIX):
+                        continue
+                    session.state[key] = value
+                    if key.startswith(State.APP_PREFIX):
+                        self.app_state.setdefault(app_name, {})[
+                            key.removeprefix(State.APP_PREFIX)
+                        ] = value
+                    if key.startswith(State.USER_PREFIX):
+                        self.user_state.setdefault(app_name, {}).setdefault(
+                            user_id, {}
+                        )[key.removeprefix(State.USER_PREFIX)] = value
+                session.events.append(event)
+                session.last_update_time = event.timestamp
+
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[
+            session_id
+        ] = session
+        return True
+
+    def _mark_used(self, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self.recently_used[key] = None
+        self.recently_used.move_to_end(key)
+        while len(self.recently_used) > self.max_cached_sessions:
+            (old_app_name, old_user_id, old_session_id), _ = self.recently_used.popitem(
+                last=False
+            )
+            self.sessions.get(old_app_name, {}).get(old_user_id, {}).pop(
+                old_session_id, None
+            )
+
+
+class CustomerSupportRunner:
+    """
+    One long-lived ADK Runner shared by all conversations
+
+    Args:
+        session_service: Where sessions are kept, in memory by default
+        root_agent: The agent answering every conversation, the customer support
+            agent by default
+    """
+
+    def __init__(
+        self,
+        session_service: Optional[BaseSessionService] = None,
+        root_agent: BaseAgent = agent,
+    ):
+        self.session_service = session_service or InMemorySessionService()
+        self.runner = Runner(
+            agent=root_agent,
+            app_name=APP_NAME,
+            session_service=self.session_service,
+        )
+        self.creation_lock = asyncio.Lock()
+
+    async def ensure_session(self, user_id: str, session_id: str) -> None:
+        """
+        Create the session on its first turn, or again after it was deleted or
+        expired, the session service finds the existing ones
+        """
+        async with self.creation_lock:
+            session = await self.session_service.get_session(
+                app_name=APP_NAME, user_id=user_id, session_id=session_id
+            )
+            if not session:
+                await self.session_service.create_session(
+                    app_name=APP_NAME, user_id=user_id, session_id=session_id
+                )
+
+    async def run(
+        self, message: str, session_id: str, user_id: str = "user_1"
+    ) -> AsyncIterator[Event]:
+        """
+        Run one turn of the conversation
+
+        Args:
+            message: The user message
+            session_id: The conversation id
+            user_id: The user the conversation belongs to
+
+        Returns:
+            An async iterator of the events produced by the agent
+        """
+        await self.ensure_session(user_id, session_id)
+        async for event in self.runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=Content(role="user", parts=[Part(text=message)]),
+        ):
+            yield event
+
+    async def call(
+        self, message: str, session_id: str, user_id: str = "user_1"
+    ) -> List[Content]:
+        """
+        Run one turn of the conversation and return every content produced
+        """
+        return [
+            event.content
+            async for event in self.run(message, session_id, user_id)
+            if event.content
+        ]
+
+    async def stream_messages(
+        self, message: str, session_id: str, user_id: str = "user_1"
+    ) -> AsyncIterator[AllMessageValues]:
+        """
+        Run one turn of the conversation, converting each event to the OpenAI
+        messages format as soon as it arrives instead of after the whole run
+
+        Args:
+            message: The user message
+            session_id: The conversation id
+            user_id: The user the conversation belongs to
+
+        Returns:
+            An async iterator of OpenAI format messages, tool calls, tool results and
+            the assistant replies, in the order they were produced
+        """
+        async for event in self.run(message, session_id, user_id):
+            if event.partial or not event.content:
+                continue
+            converted = litellm._content_to_message_param(event.content)
+            for converted_message in (
+                converted if isinstance(converted, list) else [converted]
+            ):
+                yield converted_message
+
+    async def close(self) -> None:
+        await self.runner.close()
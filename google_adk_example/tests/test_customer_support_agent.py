@@ -1,56 +1,24 @@
-from typing import List
 import pytest
 
 import scenario
-from customer_support_agent import agent
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai.types import Content, Part
-import google.adk.models.lite_llm as litellm
-
+from customer_support_runner import CustomerSupportRunner
 
 scenario.configure(
     default_model="openai/gpt-4.1-mini",
     cache_key="42",
 )
 
+runner = CustomerSupportRunner()
 
-class Agent(scenario.AgentAdapter):
-    def __init__(self):
-        self.session_service = InMemorySessionService()
-
-        self.runner = Runner(
-            agent=agent,
-            app_name="customer_support_agent",
-            session_service=self.session_service,
-        )
 
+class Agent(scenario.AgentAdapter):
     async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        session = await self.session_service.get_session(
-            app_name="customer_support_agent",
-            user_id="user_1",
-            session_id=input.thread_id,
-        )
-        if not session:
-            session = await self.session_service.create_session(
-                app_name="customer_support_agent",
-                user_id="user_1",
-                session_id=input.thread_id,
+        return [
+            message
+            async for message in runner.stream_messages(
+                input.last_new_user_message_str(), session_id=input.thread_id
             )
-
-        user_message = Content(
-            role="user", parts=[Part(text=input.last_new_user_message_str())]
-        )
-        contents: List[Content] = []
-        async for event in self.runner.run_async(
-            user_id="user_1", session_id=input.thread_id, new_message=user_message
-        ):
-            contents += [event.content] if event.content else []
-
-        messages_openai_format = [
-            litellm._content_to_message_param(content) for content in contents
-        ]
-        return messages_openai_format  # type: ignore
+        ]  # type: ignore
 
 
 @pytest.mark.agent_test
@@ -0,0 +1,164 @@
+import time
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai.types import Content, FunctionCall, Part
+
+from customer_support_runner import CustomerSupportRunner, DiskSessionService
+
+
+class CountingLlm(BaseLlm):
+    """Replies with how many user messages it has seen in the conversation"""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        user_messages = [c for c in llm_request.contents if c.role == "user"]
+        yield LlmResponse(
+            content=Content(
+                role="model", parts=[Part(text=f"{len(user_messages)} messages")]
+            )
+        )
+
+
+class ToolCallingLlm(BaseLlm):
+    """Calls get_order_status once and then replies with the tool result"""
+
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        last_part = (llm_request.contents[-1].parts or [Part()])[0]
+        if last_part.function_response:
+            status = (last_part.function_response.response or {})["status"]
+            yield LlmResponse(
+                content=Content(role="model", parts=[Part(text=f"It is {status}")])
+            )
+            return
+
+        yield LlmResponse(
+            content=Content(
+                role="model",
+                parts=[
+                    Part(
+                        function_call=FunctionCall(
+                            id="call_1",
+                            name="get_order_status",
+                            args={"order_id": "9127412"},
+                        )
+                    )
+                ],
+            )
+        )
+
+
+def get_order_status(order_id: str) -> dict[str, str]:
+    """
+    Get the status of a specific order
+
+    Args:
+        order_id: The ID of the order to get the status of
+    """
+    return {"order_id": order_id, "status": "shipped"}
+
+
+def build_agent() -> Agent:
+    return Agent(name="customer_support_agent", model=CountingLlm(model="counting"))
+
+
+def text(contents: list[Content]) -> str:
+    return "".join(part.text or "" for part in contents[-1].parts or [])
+
+
+@pytest.mark.asyncio
+async def test_deleted_sessions_start_over():
+    runner = CustomerSupportRunner(root_agent=build_agent())
+    assert text(await runner.call("hi", "session-1")) == "1 messages"
+
+    await runner.session_service.delete_session(
+        app_name="customer_support_agent", user_id="user_1", session_id="session-1"
+    )
+    assert text(await runner.call("hi again", "session-1")) == "1 messages"
+
+
+@pytest.mark.asyncio
+async def test_disk_sessions_survive_restarts(tmp_path):
+    runner = CustomerSupportRunner(
+        session_service=DiskSessionService(tmp_path), root_agent=build_agent()
+    )
+    await runner.call("hi", "session-1")
+    await runner.call("hi again", "session-1")
+
+    restarted_runner = CustomerSupportRunner(
+        session_service=DiskSessionService(tmp_path), root_agent=build_agent()
+    )
+    assert text(await restarted_runner.call("still there?", "session-1")) == (
+        "3 messages"
+    )
+
+    sessions = await restarted_runner.session_service.list_sessions(
+        app_name="customer_support_agent", user_id="user_1"
+    )
+    assert [session.id for session in sessions.sessions] == ["session-1"]
+
+
+@pytest.mark.asyncio
+async def test_disk_sessions_are_evicted_from_memory(tmp_path):
+    session_service = DiskSessionService(tmp_path, max_cached_sessions=2)
+    runner = CustomerSupportRunner(
+        session_service=session_service, root_agent=build_agent()
+    )
+    for i in range(5):
+        await runner.call("hi", f"session-{i}")
+
+    in_memory = session_service.sessions["customer_support_agent"]["user_1"]
+    assert sorted(in_memory.keys()) == ["session-3", "session-4"]
+
+    # Evicted sessions are loaded back from disk when needed
+    assert text(await runner.call("hi again", "session-0")) == "2 messages"
+
+
+@pytest.mark.asyncio
+async def test_expired_disk_sessions_are_deleted(tmp_path):
+    session_service = DiskSessionService(tmp_path, session_ttl=0.05)
+    runner = CustomerSupportRunner(
+        session_service=session_service, root_agent=build_agent()
+    )
+    await runner.call("hi", "session-1")
+    time.sleep(0.1)
+
+    assert session_service.evict_expired() == 1
+    assert text(await runner.call("hi", "session-1")) == "1 messages"
+
+
+@pytest.mark.asyncio
+async def test_stream_messages_yields_each_message_as_it_arrives():
+    llm = ToolCallingLlm(model="tool-calling")
+    runner = CustomerSupportRunner(
+        root_agent=Agent(
+            name="customer_support_agent", model=llm, tools=[get_order_status]
+        )
+    )
+
+    messages = []
+    llm_calls_at_each_message = []
+    async for message in runner.stream_messages("Where is my order?", "session-1"):
+        messages.append(message)
+        llm_calls_at_each_message.append(llm.calls)
+
+    assert [message["role"] for message in messages] == [
+        "assistant",
+        "tool",
+        "assistant",
+    ]
+    assert messages[0]["tool_calls"][0]["function"]["name"] == "get_order_status"
+    assert "shipped" in messages[1]["content"]
+    assert messages[2]["content"] == "It is shipped"
+    # The tool call is yielded before the model is called for the final answer
+    assert llm_calls_at_each_message == [1, 1, 2]
@@ -0,0 +1,82 @@
+"""
+Compare the end-to-end latency of the fused, parallel and sequential modes.
+
+"sequential" waits for the intent classification before generating the response,
+"fused" gets both from a single structured call and "parallel" runs the two calls
+at the same time. Half of the messages are repeated, so the intent cache is
+exercised as well.
+
+The model is replaced by a stub client that sleeps for `--latency` seconds per
+call, so the numbers only depend on the number of serial round trips and no API
+key is needed.
+
+Usage:
+    uv run python benchmark_latency.py [--messages 20] [--latency 0.3]
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel
+
+from customer_support_agent import (
+    CustomerIntent,
+    CustomerSupportAgent,
+    CustomerSupportResponse,
+)
+
+
+class StubClient:
+    """Stands in for the Instructor client, answering every call after a fixed delay"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(
+        self, model: str, response_model: Type[BaseModel], messages: List[Any]
+    ) -> BaseModel:
+        self.calls += 1
+        time.sleep(self.latency)
+        intent = CustomerIntent(intent="order_inquiry", confidence=0.9)
+        if response_model is CustomerIntent:
+            return intent
+        return CustomerSupportResponse(
+            message="Your order is on its way.", intent=intent
+        )
+
+
+def run_benchmark(mode: str, messages: int, latency: float) -> Dict[str, Any]:
+    stub_client = StubClient(latency)
+    agent = CustomerSupportAgent(client=stub_client, mode=mode)  # type: ignore
+
+    latencies = []
+    for i in range(messages):
+        start = time.perf_counter()
+        agent.run(f"Where is my order number {i // 2}?")
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "mode": mode,
+        "mean_latency_ms": sum(latencies) * 1000 / len(latencies),
+        "max_latency_ms": max(latencies) * 1000,
+        "llm_calls_per_message": stub_client.calls / messages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    for mode in ("sequential", "parallel", "fused"):
+        print(json.dumps(run_benchmark(mode, args.messages, args.latency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Load test `run` against `arun` at a fixed number of concurrent requests.
+
+Both paths have `--concurrency` requests in flight: `run` on a worker pool of that
+many threads, as a web tier would configure it, and `arun` from a single event
+loop, with that many requests started at once. The difference between the two is
+then the cost of a thread per request against a task per request, not the number
+of requests in flight.
+
+The model is replaced by stub clients that wait for `--latency` seconds per call,
+so no API key is needed.
+
+Usage:
+    uv run python benchmark_load.py [--requests 500] [--concurrency 100] [--latency 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel
+
+from benchmark_latency import StubClient
+from customer_support_agent import (
+    CustomerIntent,
+    CustomerSupportAgent,
+    CustomerSupportResponse,
+)
+
+
+class AsyncStubClient:
+    """Async version of `StubClient`"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(
+        self, model: str, response_model: Type[BaseModel], messages: List[Any]
+    ) -> BaseModel:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        intent = CustomerIntent(intent="order_inquiry", confidence=0.9)
+        if response_model is CustomerIntent:
+            return intent
+        return CustomerSupportResponse(
+            message="Your order is on its way.", intent=intent
+        )
+
+
+def run_sync(requests: int, concurrency: int, latency: float) -> Dict[str, Any]:
+    agent = CustomerSupportAgent(client=StubClient(latency))  # type: ignore
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(agent.run, (f"Message {i}" for i in range(requests))))
+        peak_threads = threading.active_count()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "sync",
+        "concurrency": concurrency,
+        "requests_per_second": requests / elapsed,
+        "threads": peak_threads,
+    }
+
+
+async def run_async(requests: int, concurrency: int, latency: float) -> Dict[str, Any]:
+    agent = CustomerSupportAgent(
+        async_client=AsyncStubClient(latency),  # type: ignore
+        max_concurrent_requests=concurrency,
+    )
+
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def request(message: str) -> str:
+        async with in_flight:
+            return await agent.arun(message)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(f"Message {i}") for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "async",
+        "concurrency": concurrency,
+        "requests_per_second": requests / elapsed,
+        "threads": threading.active_count(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(json.dumps(run_sync(args.requests, args.concurrency, args.latency)))
+    print(
+        json.dumps(
+            asyncio.run(run_async(args.requests, args.concurrency, args.latency))
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,13 @@ References:
 - https://langwatch.ai/
 """
 
+import asyncio
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Literal, Dict, Any, Optional
 import dotenv
 
@@ -25,12 +31,12 @@ from create_agent_app.common.customer_support.mocked_apis import (
     http_GET_troubleshooting_guide,
 )
 
+import httpx
 import instructor
 import openai
 import langwatch
 from pydantic import BaseModel, Field, field_validator
 
-
 # Initialize Langwatch
 langwatch.setup()
 
@@ -38,6 +44,134 @@ langwatch.setup()
 client = instructor.from_openai(openai.OpenAI())
 
 
+def create_async_client(
+    max_connections: int = 100, max_keepalive_connections: int = 20
+) -> instructor.AsyncInstructor:
+    """
+    Create an async Instructor client on top of a shared HTTP connection pool
+
+    Args:
+        max_connections: The most connections open to the API at the same time
+        max_keepalive_connections: How many idle connections are kept open for reuse
+
+    Returns:
+        The Instructor patched AsyncOpenAI client
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+    return instructor.from_openai(openai.AsyncOpenAI(http_client=http_client))
+
+
+async_client = create_async_client(
+    max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", 100)),
+    max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)),
+)
+
+
+def get_customer_order_history() -> List[OrderSummaryResponse]:
+    """
+    Get the current customer order history
+
+    Returns:
+        The customer order history
+    """
+    return http_GET_customer_order_history()
+
+
+def get_order_status(order_id: str) -> OrderStatusResponse:
+    """
+    Get the status of a specific order
+
+    Args:
+        order_id: The ID of the order to get the status of
+
+    Returns:
+        The status of the order
+    """
+    return http_GET_order_status(order_id)
+
+
+def get_company_policy() -> DocumentResponse:
+    """
+    Get the company policy
+
+    Returns:
+        The company policy document
+    """
+    return http_GET_company_policy()
+
+
+def get_troubleshooting_guide(
+    guide: Literal["internet", "mobile", "television", "ecommerce"],
+) -> DocumentResponse:
+    """
+    Get the troubleshooting guide
+
+    Args:
+        guide: The guide to get the troubleshooting guide for, one of "internet", "mobile", "television", "ecommerce"
+
+    Returns:
+        The troubleshooting guide document
+    """
+    if guide not in ("internet", "mobile", "television", "ecommerce"):
+        raise ValueError(f"Unknown troubleshooting guide: {guide}")
+    return http_GET_troubleshooting_guide(guide)
+
+
+def escalate_to_human(
+    reason: str = "Customer requested escalation",
+    urgency: Literal["low", "medium", "high"] = "medium",
+    summary: str = "",
+) -> Dict[str, str]:
+    """
+    Escalate to human, retrieves a link for the customer to open a ticket with the support team
+
+    Args:
+        reason: Why the conversation is escalated
+        urgency: How urgent the issue is, one of "low", "medium", "high"
+        summary: A short summary of the issue for the support team
+
+    Returns:
+        A link for the customer to open a ticket with the support team
+    """
+    return {
+        "status": "escalated",
+        "reason": reason,
+        "urgency": urgency,
+        "summary": summary,
+        "url": "https://support.xpto.com/tickets",
+    }
+
+
+TOOLS = {
+    "get_customer_order_history": get_customer_order_history,
+    "get_order_status": get_order_status,
+    "get_company_policy": get_company_policy,
+    "get_troubleshooting_guide": get_troubleshooting_guide,
+    "escalate_to_human": escalate_to_human,
+}
+
+
+class ToolCall(BaseModel):
+    """A tool the model wants to run before answering"""
+
+    tool_name: Literal[
+        "get_customer_order_history",
+        "get_order_status",
+        "get_company_policy",
+        "get_troubleshooting_guide",
+        "escalate_to_human",
+    ] = Field(description="The name of the tool to call")
+    parameters: Dict[str, Any] = Field(
+        default_factory=dict, description="The arguments to call the tool with"
+    )
+
+
 class CustomerIntent(BaseModel):
     """Structured output for customer intent classification"""
 
@@ -49,6 +183,10 @@ class CustomerIntent(BaseModel):
         le=1.0,
         description="Confidence score for the intent classification (0.0 to 1.0)",
     )
+    requires_tool: bool = Field(
+        default=False,
+        description="Whether answering needs data from one of the tools",
+    )
 
     @field_validator("confidence")
     def validate_confidence(cls, v):
@@ -62,101 +200,564 @@ class CustomerSupportResponse(BaseModel):
 
     message: str = Field(description="The response message to the customer")
     intent: CustomerIntent = Field(description="The classified intent")
+    tool_calls: List[ToolCall] = Field(
+        default_factory=list,
+        description="Tools to call before answering, all of them are run at once and their results given back",
+    )
     should_escalate: bool = Field(
         default=False, description="Whether this issue should be escalated to a human"
     )
 
 
-class CustomerSupportAgent:
-    """Customer support agent using Instructor's full capabilities"""
+class ConversationSummary(BaseModel):
+    """Structured output for summarizing the older part of a conversation"""
+
+    summary: str = Field(
+        description="Summary of the conversation, keeping every fact the customer gave and every data found"
+    )
+
+
+class ConversationHistory(BaseModel):
+    """What the agent remembers of one conversation thread"""
 
-    def __init__(self):
+    summary: str = Field(
+        default="", description="Summary of the messages that left the window"
+    )
+    messages: List[Dict[str, str]] = Field(
+        default_factory=list, description="The most recent messages, verbatim"
+    )
+    tool_results: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Successful tool results of the conversation, by tool call",
+    )
+
+
+SYSTEM_PROMPT = """You are a customer support agent for XPTO Telecom. 
+                    Generate helpful, accurate, and polite responses. 
+                    Use the available tools when needed to gather information,
+                    list every tool you need in tool_calls at once, their results
+                    will be given back to you to write the final answer.
+                    Always format responses clearly using markdown.
+                    
+                    Available tools:
+                    - get_customer_order_history(): Get customer's order history
+                    - get_order_status(order_id): Get status of a specific order
+                    - get_company_policy(): Get company policy document
+                    - get_troubleshooting_guide(guide): Get troubleshooting guide for internet/mobile/television/ecommerce
+                    - escalate_to_human(reason, urgency, summary): Escalate to human agent
+                    """
+
+
+class CustomerSupportAgent:
+    """
+    Customer support agent using Instructor's full capabilities
+
+    Args:
+        client: The Instructor patched OpenAI client, used by `run`
+        async_client: The Instructor patched async OpenAI client, used by `arun`
+        mode: How intent classification and response generation are combined by
+            default, "fused" asks for both in a single structured call, "parallel"
+            classifies the intent while the response is already being generated, and
+            "sequential" classifies first and then generates the response with it
+        max_cached_intents: How many classified messages to remember, a repeated
+            message reuses its intent instead of classifying it again
+        max_concurrent_requests: How many model calls `arun` can have in flight at
+            once across all conversations, the others wait for a free slot
+        history_window: How many of the latest messages of a thread are sent verbatim,
+            when a thread grows past it the older half of the window is folded into a
+            summary with a single model call
+        max_threads: How many conversation threads to remember, the least recently
+            used ones are forgotten above it
+        idle_thread_ttl: Seconds after the last message of a thread before it is
+            forgotten, None to keep threads until `end_thread` or `max_threads`
+    """
+
+    def __init__(
+        self,
+        client: instructor.Instructor = client,
+        async_client: instructor.AsyncInstructor = async_client,
+        mode: Literal["fused", "parallel", "sequential"] = "fused",
+        max_cached_intents: int = 1024,
+        max_concurrent_requests: int = 64,
+        history_window: int = 20,
+        max_threads: int = 1000,
+        idle_thread_ttl: Optional[float] = 30 * 60,
+    ):
         self.client = client
+        self.async_client = async_client
+        self.mode = mode
+        self.max_cached_intents = max_cached_intents
+        self.intent_cache: OrderedDict[str, CustomerIntent] = OrderedDict()
+        self.intent_cache_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(thread_name_prefix="customer_support_agent")
+        self.request_slots = asyncio.Semaphore(max_concurrent_requests)
+        self.history_window = history_window
+        self.max_threads = max_threads
+        self.idle_thread_ttl = idle_thread_ttl
+        # Least recently used first, with the time of their last message
+        self.threads: OrderedDict[str, ConversationHistory] = OrderedDict()
+        self.thread_last_used: Dict[str, float] = {}
+        self.threads_lock = threading.Lock()
 
     def classify_intent(self, message: str) -> CustomerIntent:
         """Classify customer intent using Instructor's structured output"""
-        return self.client.chat.completions.create(
+        intent = self.cached_intent(message)
+        if intent:
+            return intent
+
+        intent = self.client.chat.completions.create(
             model="gpt-4o",
             response_model=CustomerIntent,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an intent classifier for a customer support system. Classify the customer's intent based on their message.",
-                },
-                {
-                    "role": "user",
-                    "content": f"Classify the intent of this message: {message}",
-                },
-            ],
+            messages=self._intent_messages(message),
         )
-
-    def get_customer_order_history(self) -> List[OrderSummaryResponse]:
-        """Get customer order history - Instructor will call this automatically"""
-        return http_GET_customer_order_history()
-
-    def get_order_status(self, order_id: str) -> OrderStatusResponse:
-        """Get order status - Instructor will call this automatically"""
-        return http_GET_order_status(order_id)
-
-    def get_company_policy(self) -> DocumentResponse:
-        """Get company policy - Instructor will call this automatically"""
-        return http_GET_company_policy()
-
-    def get_troubleshooting_guide(
-        self, guide: Literal["internet", "mobile", "television", "ecommerce"]
-    ) -> DocumentResponse:
-        """Get troubleshooting guide - Instructor will call this automatically"""
-        return http_GET_troubleshooting_guide(guide)
-
-    def escalate_to_human(
-        self, reason: str = "Customer requested escalation"
-    ) -> Dict[str, str]:
-        """Escalate to human - Instructor will call this automatically"""
-        return {
-            "status": "escalated",
-            "reason": reason,
-            "message": "I'm escalating this to a human agent who will assist you shortly.",
-        }
-
-    def run(self, message: str) -> str:
-        """Main method using Instructor's automatic tool calling"""
-
-        # Step 1: Classify intent
-        intent = self.classify_intent(message)
-
-        # Step 2: Generate response with automatic tool calling
-        # Instructor will automatically call the appropriate tools based on the response
-        response = self.client.chat.completions.create(
+        self.cache_intent(message, intent)
+        return intent
+
+    async def aclassify_intent(self, message: str) -> CustomerIntent:
+        """Async version of `classify_intent`"""
+        intent = self.cached_intent(message)
+        if intent:
+            return intent
+
+        async with self.request_slots:
+            intent = await self.async_client.chat.completions.create(
+                model="gpt-4o",
+                response_model=CustomerIntent,
+                messages=self._intent_messages(message),
+            )
+        self.cache_intent(message, intent)
+        return intent
+
+    def cached_intent(self, message: str) -> Optional[CustomerIntent]:
+        key = self._intent_cache_key(message)
+        with self.intent_cache_lock:
+            intent = self.intent_cache.get(key)
+            if intent:
+                self.intent_cache.move_to_end(key)
+            return intent
+
+    def cache_intent(self, message: str, intent: CustomerIntent) -> None:
+        with self.intent_cache_lock:
+            self.intent_cache[self._intent_cache_key(message)] = intent
+            while len(self.intent_cache) > self.max_cached_intents:
+                self.intent_cache.popitem(last=False)
+
+    def generate_response(
+        self,
+        message: str,
+        intent: Optional[CustomerIntent] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        history: Optional[ConversationHistory] = None,
+    ) -> CustomerSupportResponse:
+        """
+        Generate the response to the customer, when the intent is not given the
+        model classifies it as part of the same structured output
+        """
+        return self.client.chat.completions.create(
             model="gpt-4o",
             response_model=CustomerSupportResponse,
-            messages=[
+            messages=self._response_messages(message, intent, tool_results, history),
+        )
+
+    async def agenerate_response(
+        self,
+        message: str,
+        intent: Optional[CustomerIntent] = None,
+        tool_results: Optional[List[Dict[str, Any]]] = None,
+        history: Optional[ConversationHistory] = None,
+    ) -> CustomerSupportResponse:
+        """Async version of `generate_response`"""
+        async with self.request_slots:
+            return await self.async_client.chat.completions.create(
+                model="gpt-4o",
+                response_model=CustomerSupportResponse,
+                messages=self._response_messages(
+                    message, intent, tool_results, history
+                ),
+            )
+
+    def summarize(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        """Fold messages that leave the history window into the running summary"""
+        return self.client.chat.completions.create(
+            model="gpt-4o",
+            response_model=ConversationSummary,
+            messages=self._summary_messages(summary, messages),
+        ).summary
+
+    async def asummarize(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        """Async version of `summarize`"""
+        async with self.request_slots:
+            response = await self.async_client.chat.completions.create(
+                model="gpt-4o",
+                response_model=ConversationSummary,
+                messages=self._summary_messages(summary, messages),
+            )
+        return response.summary
+
+    def execute_tools(
+        self,
+        tool_calls: List[ToolCall],
+        history: Optional[ConversationHistory] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the tool calls concurrently
+
+        Args:
+            tool_calls: The tool calls planned by the model
+            history: The conversation the tools are called for, tool calls already
+                made in it reuse their result instead of fetching it again
+
+        Returns:
+            One entry per tool call, in the same order, with the tool name and either
+            its result or the error it raised
+        """
+        results = list(
+            self.executor.map(
+                lambda tool_call: self._cached_tool_result(tool_call, history)
+                or self._execute_tool(tool_call),
+                tool_calls,
+            )
+        )
+        self._cache_tool_results(tool_calls, results, history)
+        return results
+
+    async def aexecute_tools(
+        self,
+        tool_calls: List[ToolCall],
+        history: Optional[ConversationHistory] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async version of `execute_tools`"""
+        loop = asyncio.get_running_loop()
+
+        async def execute_tool(tool_call: ToolCall) -> Dict[str, Any]:
+            return self._cached_tool_result(
+                tool_call, history
+            ) or await loop.run_in_executor(
+                self.executor, self._execute_tool, tool_call
+            )
+
+        results = list(
+            await asyncio.gather(*(execute_tool(tool_call) for tool_call in tool_calls))
+        )
+        self._cache_tool_results(tool_calls, results, history)
+        return results
+
+    def thread_history(self, thread_id: str) -> ConversationHistory:
+        """The history of a conversation thread, empty if the thread is new"""
+        with self.threads_lock:
+            history = self.threads.setdefault(thread_id, ConversationHistory())
+            self.threads.move_to_end(thread_id)
+            self.thread_last_used[thread_id] = time.monotonic()
+            self._evict_threads()
+        return history
+
+    def end_thread(self, thread_id: str) -> None:
+        """Forget a conversation thread"""
+        with self.threads_lock:
+            self.threads.pop(thread_id, None)
+            self.thread_last_used.pop(thread_id, None)
+
+    def _evict_threads(self) -> None:
+        """Forget the threads idle for longer than `idle_thread_ttl` or above `max_threads`"""
+        deadline = (
+            time.monotonic() - self.idle_thread_ttl
+            if self.idle_thread_ttl is not None
+            else None
+        )
+        while self.threads:
+            thread_id = next(iter(self.threads))
+            idle = deadline is not None and self.thread_last_used[thread_id] <= deadline
+            if not idle and len(self.threads) <= self.max_threads:
+                break
+            del self.threads[thread_id]
+            del self.thread_last_used[thread_id]
+
+    def run(
+        self,
+        message: str,
+        mode: Optional[Literal["fused", "parallel", "sequential"]] = None,
+        thread_id: Optional[str] = None,
+    ) -> str:
+        """
+        Main method, answers in at most two model round trips
+
+        Args:
+            message: The customer message
+            mode: Overrides the agent's default mode for this message
+            thread_id: The conversation the message belongs to, its history is sent
+                along and updated, None to answer the message on its own
+        """
+        mode = mode or self.mode
+        history = self.thread_history(thread_id) if thread_id else None
+
+        # A cached intent is only trusted for the first message, later ones can
+        # mean something else depending on the conversation
+        intent = None if history and history.messages else self.cached_intent(message)
+        if intent:
+            # Already classified, only the response is needed
+            response = self.generate_response(message, intent, history=history)
+        elif mode == "fused":
+            # One call returns both the intent and the response
+            response = self.generate_response(message, history=history)
+            intent = response.intent
+            self.cache_intent(message, intent)
+        elif mode == "parallel":
+            # Start generating speculatively while the intent is classified, the
+            # dedicated classifier has the final word on the intent
+            speculative_response = self.executor.submit(
+                self.generate_response, message, history=history
+            )
+            intent = self.classify_intent(message)
+            response = self._reconcile_intent(speculative_response.result(), intent)
+        else:
+            # Step 1: Classify intent
+            intent = self.classify_intent(message)
+
+            # Step 2: Generate response, or plan the tools needed for it
+            response = self.generate_response(message, intent, history=history)
+
+        # Run every planned tool at once and answer with their results in a single
+        # follow-up call, so a data question takes at most two model round trips
+        tool_results = None
+        if response.tool_calls:
+            tool_results = self.execute_tools(response.tool_calls, history)
+            response = self._merge_tool_response(
+                response,
+                self.generate_response(message, intent, tool_results, history),
+            )
+
+        if history:
+            overflow = self._remember_turn(history, message, tool_results, response)
+            if overflow:
+                try:
+                    summary = self.summarize(history.summary, overflow)
+                except Exception:
+                    summary = None
+                history.summary = self._fold_summary(history, overflow, summary)
+
+        self._log_interaction(response)
+        return response.message
+
+    async def arun(
+        self,
+        message: str,
+        mode: Optional[Literal["fused", "parallel", "sequential"]] = None,
+        thread_id: Optional[str] = None,
+    ) -> str:
+        """
+        Async version of `run`, many conversations can be served from a single event
+        loop, sharing the async client connection pool
+        """
+        mode = mode or self.mode
+        history = self.thread_history(thread_id) if thread_id else None
+
+        intent = None if history and history.messages else self.cached_intent(message)
+        if intent:
+            response = await self.agenerate_response(message, intent, history=history)
+        elif mode == "fused":
+            response = await self.agenerate_response(message, history=history)
+            intent = response.intent
+            self.cache_intent(message, intent)
+        elif mode == "parallel":
+            speculative_response, intent = await asyncio.gather(
+                self.agenerate_response(message, history=history),
+                self.aclassify_intent(message),
+            )
+            response = self._reconcile_intent(speculative_response, intent)
+        else:
+            intent = await self.aclassify_intent(message)
+            response = await self.agenerate_response(message, intent, history=history)
+
+        tool_results = None
+        if response.tool_calls:
+            tool_results = await self.aexecute_tools(response.tool_calls, history)
+            response = self._merge_tool_response(
+                response,
+                await self.agenerate_response(message, intent, tool_results, history),
+            )
+
+        if history:
+            overflow = self._remember_turn(history, message, tool_results, response)
+            if overflow:
+                try:
+                    summary = await self.asummarize(history.summary, overflow)
+                except Exception:
+                    summary = None
+                history.summary = self._fold_summary(history, overflow, summary)
+
+        self._log_interaction(response)
+        return response.message
+
+    def _intent_messages(self, message: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": "You are an intent classifier for a customer support system. Classify the customer's intent based on their message.",
+            },
+            {
+                "role": "user",
+                "content": f"Classify the intent of this message: {message}",
+            },
+        ]
+
+    def _response_messages(
+        self,
+        message: str,
+        intent: Optional[CustomerIntent],
+        tool_results: Optional[List[Dict[str, Any]]],
+        history: Optional[ConversationHistory] = None,
+    ) -> List[Dict[str, str]]:
+        content = f"Customer message: {message}"
+        if intent:
+            content += f"\nIntent: {intent.intent} (confidence: {intent.confidence})"
+            if intent.requires_tool and tool_results is None:
+                # Only ever asks for a plan, a plan is never dropped, since the flag
+                # defaults to False when the model leaves it out
+                content += (
+                    "\nThis message needs data from the tools, plan the tool calls."
+                )
+        if tool_results is not None:
+            content += (
+                f"\nTool results: {json.dumps(tool_results, default=str)}"
+                "\nAnswer the customer with these results, do not call any more tools."
+            )
+
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        if history and history.summary:
+            messages.append(
                 {
                     "role": "system",
-                    "content": """You are a customer support agent for XPTO Telecom. 
-                    Generate helpful, accurate, and polite responses. 
-                    Use the available tools when needed to gather information.
-                    Always format responses clearly using markdown.
-                    
-                    Available tools:
-                    - get_customer_order_history(): Get customer's order history
-                    - get_order_status(order_id): Get status of a specific order
-                    - get_company_policy(): Get company policy document
-                    - get_troubleshooting_guide(guide): Get troubleshooting guide for internet/mobile/television/ecommerce
-                    - escalate_to_human(reason): Escalate to human agent
-                    """,
-                },
+                    "content": f"Summary of the conversation so far: {history.summary}",
+                }
+            )
+        if history:
+            messages += history.messages
+        return messages + [{"role": "user", "content": content}]
+
+    def _summary_messages(
+        self, summary: str, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": "You summarize customer support conversations. Update the summary with the new messages, keep the customer's details, the data found with tools and what was already answered.",
+            },
+            {
+                "role": "user",
+                "content": f"Summary so far: {summary or '(empty)'}\nNew messages: {json.dumps(messages)}",
+            },
+        ]
+
+    def _remember_turn(
+        self,
+        history: ConversationHistory,
+        message: str,
+        tool_results: Optional[List[Dict[str, Any]]],
+        response: CustomerSupportResponse,
+    ) -> List[Dict[str, str]]:
+        """
+        Add a turn to the history, returning the messages that left the window
+        """
+        history.messages.append({"role": "user", "content": message})
+        if tool_results:
+            history.messages.append(
                 {
-                    "role": "user",
-                    "content": f"Customer message: {message}\nIntent: {intent.intent} (confidence: {intent.confidence})",
-                },
-            ],
+                    "role": "assistant",
+                    "content": f"Tool results: {json.dumps(tool_results, default=str)}",
+                }
+            )
+        history.messages.append({"role": "assistant", "content": response.message})
+
+        if len(history.messages) <= self.history_window:
+            return []
+
+        # Drop half of the window at once, so the summary is not updated every turn
+        keep = self.history_window // 2
+        overflow = history.messages[:-keep] if keep else history.messages
+        history.messages = history.messages[-keep:] if keep else []
+        return overflow
+
+    def _fold_summary(
+        self,
+        history: ConversationHistory,
+        overflow: List[Dict[str, str]],
+        summary: Optional[str],
+    ) -> str:
+        if summary is not None:
+            return summary
+
+        # Could not summarize, keep the customer messages so nothing they said is lost
+        customer_messages = " | ".join(
+            message["content"] for message in overflow if message["role"] == "user"
         )
+        return f"{history.summary} | {customer_messages}".strip(" |")
+
+    def _cached_tool_result(
+        self, tool_call: ToolCall, history: Optional[ConversationHistory]
+    ) -> Optional[Dict[str, Any]]:
+        if not history:
+            return None
+        return history.tool_results.get(self._tool_call_key(tool_call))
+
+    def _cache_tool_results(
+        self,
+        tool_calls: List[ToolCall],
+        results: List[Dict[str, Any]],
+        history: Optional[ConversationHistory],
+    ) -> None:
+        if not history:
+            return
+        for tool_call, result in zip(tool_calls, results):
+            if "result" in result:
+                history.tool_results[self._tool_call_key(tool_call)] = result
+
+    def _tool_call_key(self, tool_call: ToolCall) -> str:
+        return json.dumps([tool_call.tool_name, tool_call.parameters], sort_keys=True)
+
+    def _execute_tool(self, tool_call: ToolCall) -> Dict[str, Any]:
+        try:
+            result = TOOLS[tool_call.tool_name](**tool_call.parameters)
+            return {"tool": tool_call.tool_name, "result": result}
+        except Exception as error:
+            return {"tool": tool_call.tool_name, "error": str(error)}
+
+    def _reconcile_intent(
+        self, response: CustomerSupportResponse, intent: CustomerIntent
+    ) -> CustomerSupportResponse:
+        response.intent = intent
+        response.should_escalate = (
+            response.should_escalate or intent.intent == "escalation"
+        )
+        return response
+
+    def _merge_tool_response(
+        self,
+        planned_response: CustomerSupportResponse,
+        response: CustomerSupportResponse,
+    ) -> CustomerSupportResponse:
+        response.intent = planned_response.intent
+        response.tool_calls = planned_response.tool_calls
+        response.should_escalate = (
+            response.should_escalate or planned_response.should_escalate
+        )
+        return response
 
+    def _log_interaction(self, response: CustomerSupportResponse) -> None:
         # Log the interaction
-        print(f"Intent: {intent.intent} (confidence: {intent.confidence})")
+        print(
+            f"Intent: {response.intent.intent} (confidence: {response.intent.confidence})"
+        )
         print(f"Should escalate: {response.should_escalate}")
 
-        return response.message
+    def _intent_cache_key(self, message: str) -> str:
+        return " ".join(message.lower().split())
+
+
+agent = CustomerSupportAgent()
+
+
+def call_agent(message: str, context: Dict[str, Any]) -> str:
+    return agent.run(message, thread_id=str(context["thread_id"]))
 
 
 def main():
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from benchmark_load import AsyncStubClient
+from customer_support_agent import CustomerSupportAgent
+
+
+class CountingAsyncStubClient(AsyncStubClient):
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, *args, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().create(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_arun_answers_in_parallel_mode():
+    stub_client = CountingAsyncStubClient(latency=0.01)
+    agent = CustomerSupportAgent(async_client=stub_client, mode="parallel")  # type: ignore
+
+    assert await agent.arun("Where is my order?") == "Your order is on its way."
+    assert stub_client.calls == 2
+    assert stub_client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_arun_respects_the_concurrency_limit():
+    stub_client = CountingAsyncStubClient(latency=0.01)
+    agent = CustomerSupportAgent(
+        async_client=stub_client, max_concurrent_requests=5  # type: ignore
+    )
+
+    await asyncio.gather(*(agent.arun(f"Message {i}") for i in range(50)))
+
+    assert stub_client.calls == 50
+    assert stub_client.max_in_flight == 5
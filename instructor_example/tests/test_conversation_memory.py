@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+import customer_support_agent
+from customer_support_agent import (
+    ConversationSummary,
+    CustomerIntent,
+    CustomerSupportAgent,
+    CustomerSupportResponse,
+    ToolCall,
+)
+
+
+class MemoryClient:
+    """Looks the order history up on every turn and summarizes on request"""
+
+    def __init__(self, fail_summaries: bool = False):
+        self.requests: List[List[Any]] = []
+        self.fail_summaries = fail_summaries
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model: str, response_model: Any, messages: List[Any]) -> Any:
+        self.requests.append(messages)
+        if response_model is ConversationSummary:
+            if self.fail_summaries:
+                raise RuntimeError("summary failed")
+            return ConversationSummary(summary="The customer asked about orders.")
+
+        intent = CustomerIntent(
+            intent="order_inquiry", confidence=0.9, requires_tool=True
+        )
+        if "Tool results" in messages[-1]["content"]:
+            return CustomerSupportResponse(
+                message="Here are your orders.", intent=intent
+            )
+        return CustomerSupportResponse(
+            message="Let me check.",
+            intent=intent,
+            tool_calls=[ToolCall(tool_name="get_customer_order_history")],
+        )
+
+
+def test_follow_up_turns_see_the_history_and_reuse_tool_results(monkeypatch):
+    fetches = []
+    monkeypatch.setitem(
+        customer_support_agent.TOOLS,
+        "get_customer_order_history",
+        lambda: fetches.append(1) or [{"order_id": "9127412"}],
+    )
+    memory_client = MemoryClient()
+    agent = CustomerSupportAgent(client=memory_client)  # type: ignore
+
+    agent.run("What did I order?", thread_id="thread-1")
+    agent.run("And when?", thread_id="thread-1")
+    agent.run("What did I order?", thread_id="thread-2")
+
+    assert len(fetches) == 2
+    follow_up_messages = memory_client.requests[2]
+    assert follow_up_messages[1] == {"role": "user", "content": "What did I order?"}
+    assert "9127412" in follow_up_messages[2]["content"]
+    assert len(memory_client.requests[4]) == 2
+
+
+def test_history_is_bounded_and_summarized():
+    memory_client = MemoryClient()
+    agent = CustomerSupportAgent(client=memory_client, history_window=6)  # type: ignore
+
+    for i in range(4):
+        agent.run(f"Question {i}", thread_id="thread-1")
+
+    history = agent.thread_history("thread-1")
+    assert len(history.messages) <= 6
+    assert history.summary == "The customer asked about orders."
+    assert history.messages[-1]["content"] == "Here are your orders."
+
+    first_request = len(memory_client.requests)
+    agent.run("Question 4", thread_id="thread-1")
+    assert memory_client.requests[first_request][1]["content"].endswith(
+        "The customer asked about orders."
+    )
+
+
+def test_falls_back_to_customer_messages_when_summarizing_fails():
+    agent = CustomerSupportAgent(
+        client=MemoryClient(fail_summaries=True), history_window=6  # type: ignore
+    )
+
+    for i in range(4):
+        agent.run(f"Question {i}", thread_id="thread-1")
+
+    assert agent.thread_history("thread-1").summary == "Question 0 | Question 1"
+
+
+def test_least_recently_used_and_idle_threads_are_forgotten():
+    agent = CustomerSupportAgent(
+        client=MemoryClient(), max_threads=2, idle_thread_ttl=60  # type: ignore
+    )
+
+    agent.run("What did I order?", thread_id="thread-1")
+    agent.run("What did I order?", thread_id="thread-2")
+    agent.run("And when?", thread_id="thread-1")
+    agent.run("What did I order?", thread_id="thread-3")
+    assert list(agent.threads) == ["thread-1", "thread-3"]
+
+    for thread_id in agent.thread_last_used:
+        agent.thread_last_used[thread_id] -= 61
+    agent.run("What did I order?", thread_id="thread-4")
+    assert list(agent.threads) == ["thread-4"]
+    assert list(agent.thread_last_used) == ["thread-4"]
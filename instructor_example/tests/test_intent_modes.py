@@ -0,0 +1,38 @@
+import time
+
+from benchmark_latency import StubClient
+from customer_support_agent import CustomerSupportAgent
+
+
+def test_fused_mode_makes_a_single_call():
+    stub_client = StubClient(latency=0)
+    agent = CustomerSupportAgent(client=stub_client, mode="fused")  # type: ignore
+
+    assert agent.run("Where is my order?") == "Your order is on its way."
+    assert stub_client.calls == 1
+
+
+def test_parallel_mode_overlaps_classification_and_generation():
+    stub_client = StubClient(latency=0.2)
+    agent = CustomerSupportAgent(client=stub_client, mode="parallel")  # type: ignore
+
+    start = time.perf_counter()
+    agent.run("Where is my order?")
+
+    assert stub_client.calls == 2
+    assert time.perf_counter() - start < 0.35
+
+
+def test_repeated_messages_reuse_the_cached_intent():
+    stub_client = StubClient(latency=0)
+    agent = CustomerSupportAgent(
+        client=stub_client, mode="sequential", max_cached_intents=1  # type: ignore
+    )
+
+    agent.run("Where is my order?")
+    agent.run("  where is my ORDER? ")
+    assert stub_client.calls == 3
+
+    agent.run("Can I get a refund?")
+    agent.run("Where is my order?")
+    assert stub_client.calls == 7
@@ -0,0 +1,92 @@
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+from customer_support_agent import (
+    CustomerIntent,
+    CustomerSupportAgent,
+    CustomerSupportResponse,
+    ToolCall,
+)
+
+
+class PlanningClient:
+    """Plans two tool calls on the first call and answers on the second"""
+
+    def __init__(self, requires_tool: bool = True):
+        self.requires_tool = requires_tool
+        self.prompts: List[str] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model: str, response_model: Any, messages: List[Any]) -> Any:
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        intent = CustomerIntent(
+            intent="order_inquiry", confidence=0.9, requires_tool=self.requires_tool
+        )
+        if response_model is CustomerIntent:
+            return intent
+        if "Tool results" in prompt:
+            return CustomerSupportResponse(
+                message="Your iPhone has shipped.", intent=intent
+            )
+        return CustomerSupportResponse(
+            message="Let me check.",
+            intent=intent,
+            tool_calls=[
+                ToolCall(tool_name="get_customer_order_history"),
+                ToolCall(
+                    tool_name="get_order_status", parameters={"order_id": "9127412"}
+                ),
+            ],
+        )
+
+
+def test_planned_tools_are_executed_and_answered_in_two_round_trips():
+    planning_client = PlanningClient()
+    agent = CustomerSupportAgent(client=planning_client, mode="fused")  # type: ignore
+
+    assert agent.run("Where is my iPhone?") == "Your iPhone has shipped."
+    assert len(planning_client.prompts) == 2
+    assert "order_history" not in planning_client.prompts[0]
+    assert "9127412" in planning_client.prompts[1]
+    assert "Airpods Pro" in planning_client.prompts[1]
+
+
+def test_planned_tools_run_even_when_the_intent_says_none_are_needed():
+    planning_client = PlanningClient(requires_tool=False)
+    agent = CustomerSupportAgent(
+        client=planning_client, mode="sequential"  # type: ignore
+    )
+
+    assert agent.run("Where is my iPhone?") == "Your iPhone has shipped."
+    assert len(planning_client.prompts) == 3
+    assert "9127412" in planning_client.prompts[2]
+    assert "Airpods Pro" in planning_client.prompts[2]
+
+
+def test_intent_that_requires_tools_asks_for_a_plan():
+    planning_client = PlanningClient(requires_tool=True)
+    agent = CustomerSupportAgent(
+        client=planning_client, mode="sequential"  # type: ignore
+    )
+
+    agent.run("Where is my iPhone?")
+    assert "plan the tool calls" in planning_client.prompts[1]
+    assert "plan the tool calls" not in planning_client.prompts[2]
+
+
+def test_tools_run_concurrently():
+    agent = CustomerSupportAgent(client=PlanningClient())  # type: ignore
+
+    start = time.perf_counter()
+    results = agent.execute_tools(
+        [ToolCall(tool_name="get_company_policy")] * 4
+        + [ToolCall(tool_name="get_order_status", parameters={"order_id": "unknown"})]
+    )
+
+    # Each mocked API call takes 0.1s
+    assert time.perf_counter() - start < 0.3
+    assert [result["tool"] for result in results][-1] == "get_order_status"
+    assert all("result" in result for result in results[:4])
+    assert results[-1]["error"] == "Order not found"
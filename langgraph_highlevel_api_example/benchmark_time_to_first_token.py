@@ -0,0 +1,76 @@
+"""
+Time to first token of the streaming entry point versus the current blocking path.
+
+The current path (as used by the tests) iterates `agent.stream` over graph updates,
+so the first text the user sees arrives only when the final agent step is done.
+`astream_agent` yields the first token as soon as the model produces it.
+
+Usage:
+    uv run python benchmark_time_to_first_token.py --runs 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from customer_support_agent import agent
+from streaming import astream_agent
+
+MESSAGE = "What is the status of my last order?"
+
+
+def current_path_first_text() -> tuple[float, float]:
+    start = time.perf_counter()
+    first_text_at = None
+    for update in agent.stream(
+        {"messages": [HumanMessage(content=MESSAGE)]},
+        {"configurable": {"thread_id": str(uuid.uuid4())}},
+    ):
+        for node_update in update.values():
+            for message in node_update["messages"]:
+                if (
+                    first_text_at is None
+                    and isinstance(message, AIMessage)
+                    and message.content
+                ):
+                    first_text_at = time.perf_counter()
+    end = time.perf_counter()
+    return (first_text_at or end) - start, end - start
+
+
+async def streaming_first_token() -> tuple[float, float]:
+    start = time.perf_counter()
+    first_token_at = None
+    async for event in astream_agent(agent, MESSAGE, str(uuid.uuid4())):
+        if first_token_at is None and event["type"] == "token":
+            first_token_at = time.perf_counter()
+    end = time.perf_counter()
+    return (first_token_at or end) - start, end - start
+
+
+def report(name: str, first: List[float], total: List[float]) -> None:
+    print(
+        f"{name:<28} first text p50={statistics.median(first):.3f}s"
+        f" min={min(first):.3f}s  total p50={statistics.median(total):.3f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    current = [current_path_first_text() for _ in range(args.runs)]
+    streaming = [asyncio.run(streaming_first_token()) for _ in range(args.runs)]
+
+    report("agent.stream (updates)", *map(list, zip(*current)))
+    report("astream_agent (tokens)", *map(list, zip(*streaming)))
+
+
+if __name__ == "__main__":
+    main()
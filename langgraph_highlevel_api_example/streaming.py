@@ -0,0 +1,143 @@
+"""
+Async streaming entry point for the create_react_agent customer support agent.
+
+Instead of waiting for each graph step to finish, `astream_agent` yields the LLM
+tokens as they are generated, an event when a tool starts and finishes, and the
+final state at the end of the turn.
+
+The graph runs in a background task that feeds a bounded queue, when the caller
+consumes events slower than they are produced, the queue fills up and the agent
+does not move on to its next step until there is room again (backpressure).
+Closing the generator early cancels the run.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Literal, TypedDict, Union
+
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langgraph.graph.state import CompiledStateGraph
+
+
+class TokenEvent(TypedDict):
+    type: Literal["token"]
+    content: str
+
+
+class ToolStartEvent(TypedDict):
+    type: Literal["tool_start"]
+    tool_call_id: str
+    name: str
+    args: Dict[str, Any]
+
+
+class ToolEndEvent(TypedDict):
+    type: Literal["tool_end"]
+    tool_call_id: str
+    name: str
+    content: str
+
+
+class FinalEvent(TypedDict):
+    type: Literal["final"]
+    messages: List[BaseMessage]
+    state: Dict[str, Any]
+
+
+AgentEvent = Union[TokenEvent, ToolStartEvent, ToolEndEvent, FinalEvent]
+
+
+async def astream_agent(
+    agent: CompiledStateGraph,
+    message: str,
+    thread_id: str,
+    max_buffered_events: int = 32,
+) -> AsyncIterator[AgentEvent]:
+    """
+    Run one turn of the agent, streaming its events
+
+    Args:
+        agent: The compiled create_react_agent graph
+        message: The user message
+        thread_id: The conversation thread id, used by the checkpointer to keep history
+        max_buffered_events: How many events can be waiting for the caller before the agent pauses
+
+    Returns:
+        An async iterator of token, tool_start, tool_end and, last, final events
+    """
+    queue: asyncio.Queue[Union[AgentEvent, Exception, None]] = asyncio.Queue(
+        maxsize=max_buffered_events
+    )
+    config = {"configurable": {"thread_id": thread_id}}
+
+    async def produce() -> None:
+        new_messages: List[BaseMessage] = []
+        try:
+            async for mode, item in agent.astream(
+                {"messages": [HumanMessage(content=message)]},
+                config,  # type: ignore
+                stream_mode=["messages", "updates"],
+            ):
+                if mode == "messages":
+                    chunk, metadata = item
+                    if (
+                        isinstance(chunk, AIMessageChunk)
+                        and metadata.get("langgraph_node") == "agent"
+                        and isinstance(chunk.content, str)
+                        and chunk.content
+                    ):
+                        await queue.put(TokenEvent(type="token", content=chunk.content))
+                    continue
+
+                for node, update in item.items():
+                    for node_message in (update or {}).get("messages", []):
+                        new_messages.append(node_message)
+                        if node == "agent" and isinstance(node_message, AIMessage):
+                            for tool_call in node_message.tool_calls:
+                                await queue.put(
+                                    ToolStartEvent(
+                                        type="tool_start",
+                                        tool_call_id=tool_call["id"] or "",
+                                        name=tool_call["name"],
+                                        args=tool_call["args"],
+                                    )
+                                )
+                        elif isinstance(node_message, ToolMessage):
+                            await queue.put(
+                                ToolEndEvent(
+                                    type="tool_end",
+                                    tool_call_id=node_message.tool_call_id,
+                                    name=node_message.name or "",
+                                    content=str(node_message.content),
+                                )
+                            )
+
+            state = await agent.aget_state(config)  # type: ignore
+            await queue.put(
+                FinalEvent(type="final", messages=new_messages, state=state.values)
+            )
+            await queue.put(None)
+        except Exception as error:
+            await queue.put(error)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            if isinstance(event, Exception):
+                raise event
+            yield event
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
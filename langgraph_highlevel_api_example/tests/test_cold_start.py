@@ -0,0 +1,34 @@
+import json
+import subprocess
+import sys
+
+from create_agent_app.common.benchmarks.cold_start import REPO_ROOT
+
+
+def test_cold_start_report(tmp_path):
+    output = tmp_path / "cold_start.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "create_agent_app.common.benchmarks.cold_start",
+            "--examples",
+            "langgraph_highlevel_api_example",
+            "--runs",
+            "1",
+            "--python",
+            sys.executable,
+            "--output",
+            str(output),
+        ],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+
+    [result] = json.loads(output.read_text())["results"]
+    assert "error" not in result
+    assert result["example"] == "langgraph_highlevel_api_example"
+    assert 0 < result["import_ms"] < result["cold_start_ms"]
+    assert result["first_response_ms"] > 0
+    assert result["rss_after_import_mb"] <= result["peak_rss_mb"]
@@ -0,0 +1,73 @@
+import time
+from typing import Annotated, List, TypedDict
+
+from create_agent_app.common.langgraph_checkpointer import PruningInMemorySaver
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langgraph.graph import START, StateGraph
+from langgraph.graph.message import add_messages
+
+
+class State(TypedDict):
+    messages: Annotated[List[AnyMessage], add_messages]
+
+
+def echo(state: State):
+    return {"messages": [AIMessage(content=f"echo: {state['messages'][-1].content}")]}
+
+
+def build_graph(checkpointer: PruningInMemorySaver):
+    builder = StateGraph(State)
+    builder.add_node("echo", echo)
+    builder.add_edge(START, "echo")
+    return builder.compile(checkpointer=checkpointer)
+
+
+def test_keeps_only_latest_checkpoints_and_full_state():
+    checkpointer = PruningInMemorySaver(max_checkpoints_per_thread=2)
+    graph = build_graph(checkpointer)
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    for i in range(10):
+        graph.invoke({"messages": [HumanMessage(content=str(i))]}, config)
+
+    assert checkpointer.stats("thread-1")["checkpoints"] == 2
+    assert len(list(checkpointer.list(config))) == 2
+
+    messages = graph.get_state(config).values["messages"]
+    assert len(messages) == 20
+    assert messages[-1].content == "echo: 9"
+
+
+def test_resident_size_stops_growing_with_pruning():
+    pruned = PruningInMemorySaver(max_checkpoints_per_thread=1)
+    unpruned = PruningInMemorySaver(max_checkpoints_per_thread=1_000_000)
+    pruned_graph = build_graph(pruned)
+    unpruned_graph = build_graph(unpruned)
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    for i in range(20):
+        pruned_graph.invoke({"messages": [HumanMessage(content=str(i))]}, config)
+        unpruned_graph.invoke({"messages": [HumanMessage(content=str(i))]}, config)
+
+    assert pruned.stats()["checkpoints"] == 1
+    assert unpruned.stats()["checkpoints"] > 20
+    assert pruned.resident_size() * 5 < unpruned.resident_size()
+
+
+def test_evicts_idle_threads():
+    checkpointer = PruningInMemorySaver(idle_thread_ttl=0.05)
+    graph = build_graph(checkpointer)
+
+    graph.invoke(
+        {"messages": [HumanMessage(content="hi")]},
+        {"configurable": {"thread_id": "idle"}},
+    )
+    time.sleep(0.1)
+    graph.invoke(
+        {"messages": [HumanMessage(content="hi")]},
+        {"configurable": {"thread_id": "active"}},
+    )
+
+    assert checkpointer.stats("idle")["threads"] == 0
+    assert checkpointer.resident_size("idle") == 0
+    assert checkpointer.stats("active")["threads"] == 1
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+
+from create_agent_app.common.benchmarks.cold_start import REPO_ROOT
+from create_agent_app.common.benchmarks.overhead import CONVERSATION
+
+
+def test_overhead_report(tmp_path):
+    output = tmp_path / "overhead.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "create_agent_app.common.benchmarks.overhead",
+            "--examples",
+            "langgraph_highlevel_api_example",
+            "--conversations",
+            "2",
+            "--concurrency",
+            "1",
+            "4",
+            "--python",
+            sys.executable,
+            "--output",
+            str(output),
+        ],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+
+    [result] = json.loads(output.read_text())["results"]
+    assert "error" not in result
+    assert result["failed_turns"] == 0
+    assert list(result["turn_ms"]) == [name for name, _, _ in CONVERSATION]
+    assert result["conversation_ms"] == round(sum(result["turn_ms"].values()), 2)
+    # Order status and refund take 3 model calls each, troubleshooting 2
+    assert result["llm_calls_per_conversation"] == 8
+    assert result["traced_peak_kb"] >= result["retained_kb"] > 0
+    assert [level["concurrency"] for level in result["throughput"]] == [1, 4]
+    assert [level["conversations"] for level in result["throughput"]] == [2, 4]
+    assert all(level["turns_per_second"] > 0 for level in result["throughput"])
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+from create_agent_app.common.customer_support import tools
+
+
+def test_importing_the_tools_imports_no_framework():
+    frameworks = ["langchain_core", "langgraph", "pydantic_ai", "smolagents", "strands"]
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            "import create_agent_app.common.customer_support.tools\n"
+            f"print([name for name in {frameworks!r} if name in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_langchain_tools_are_created_once():
+    langchain_tools = tools.get_tools("langchain")
+
+    assert [tool.name for tool in langchain_tools] == [
+        function.__name__ for function in tools.TOOLS
+    ]
+    assert langchain_tools[1].args["order_id"]["type"] == "string"
+    assert all(
+        tool is cached
+        for tool, cached in zip(langchain_tools, tools.get_tools("langchain"))
+    )
+
+
+def test_langchain_tools_call_the_mocked_apis():
+    get_order_status = tools.get_tools("langchain")[1]
+
+    assert get_order_status.invoke({"order_id": "9127412"})["order_id"] == "9127412"
+
+
+def test_unknown_framework():
+    with pytest.raises(ValueError, match="No tool adapter"):
+        tools.get_tools("unknown")
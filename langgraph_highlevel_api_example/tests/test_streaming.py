@@ -0,0 +1,173 @@
+import asyncio
+import json
+from typing import Any, Iterator, List, Optional
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from streaming import astream_agent
+
+
+class FakeStreamingModel(GenericFakeChatModel):
+    """Streams the scripted messages word by word, including their tool calls"""
+
+    calls: int = 0
+
+    def bind_tools(self, tools: Any, **kwargs: Any):  # type: ignore
+        return self
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self.calls += 1
+        message = next(self.messages)
+        words = str(message.content).split(" ") if message.content else []
+        for i, word in enumerate(words):
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=(" " if i else "") + word)
+            )
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+        if isinstance(message, AIMessage) and message.tool_calls:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": tool_call["name"],
+                            "args": json.dumps(tool_call["args"]),
+                            "id": tool_call["id"],
+                            "index": i,
+                        }
+                        for i, tool_call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+
+
+def get_order_status(order_id: str) -> dict[str, str]:
+    """
+    Get the status of a specific order
+
+    Args:
+        order_id: The ID of the order to get the status of
+    """
+    return {"order_id": order_id, "status": "shipped"}
+
+
+def tool_call_message(order_id: str) -> AIMessage:
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {
+                "name": "get_order_status",
+                "args": {"order_id": order_id},
+                "id": f"call_{order_id}",
+            }
+        ],
+    )
+
+
+def build_agent(model: FakeStreamingModel):
+    return create_react_agent(
+        model=model, tools=[get_order_status], checkpointer=InMemorySaver()
+    )
+
+
+@pytest.mark.asyncio
+async def test_streams_tokens_tool_events_and_final_state():
+    events = [
+        event
+        async for event in astream_agent(
+            build_agent(
+                FakeStreamingModel(
+                    messages=iter(
+                        [
+                            tool_call_message("9127412"),
+                            AIMessage(content="Your order was shipped"),
+                        ]
+                    )
+                )
+            ),
+            "Where is my order?",
+            "t1",
+        )
+    ]
+
+    types = [event["type"] for event in events]
+    assert types == [
+        "tool_start",
+        "tool_end",
+        "token",
+        "token",
+        "token",
+        "token",
+        "final",
+    ]
+    assert events[0]["name"] == "get_order_status"
+    assert events[0]["args"] == {"order_id": "9127412"}
+    assert "shipped" in events[1]["content"]
+    assert "".join(e["content"] for e in events if e["type"] == "token") == (
+        "Your order was shipped"
+    )
+
+    final = events[-1]
+    assert [m.type for m in final["messages"]] == ["ai", "tool", "ai"]
+    assert len(final["state"]["messages"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_pauses_the_agent():
+    model = FakeStreamingModel(
+        messages=iter(
+            [
+                tool_call_message("9127412"),
+                tool_call_message("3451323"),
+                AIMessage(content="Both orders were shipped"),
+            ]
+        )
+    )
+    stream = astream_agent(
+        build_agent(model), "Where are my orders?", "t1", max_buffered_events=1
+    )
+    first_event = await stream.__anext__()
+    assert first_event["type"] == "tool_start"
+
+    await asyncio.sleep(0.3)
+    # The agent can't move on to the last step while the caller is not consuming
+    assert model.calls < 3
+
+    remaining = [event async for event in stream]
+    assert remaining[-1]["type"] == "final"
+    assert model.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_the_run():
+    model = FakeStreamingModel(
+        messages=iter(
+            [
+                tool_call_message("9127412"),
+                tool_call_message("3451323"),
+                AIMessage(content="Both orders were shipped"),
+            ]
+        )
+    )
+    stream = astream_agent(
+        build_agent(model), "Where are my orders?", "t1", max_buffered_events=1
+    )
+    await stream.__anext__()
+    await stream.aclose()
+
+    await asyncio.sleep(0.1)
+    assert model.calls < 3
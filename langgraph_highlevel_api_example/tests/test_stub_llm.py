@@ -0,0 +1,164 @@
+import json
+import time
+
+from langchain.chat_models import init_chat_model
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from create_agent_app.common.benchmarks.stub_llm import StubLLM, load_script
+from create_agent_app.common.customer_support.tools import SYSTEM_PROMPT, TOOLS
+
+
+def create_agent(stub: StubLLM):
+    llm = init_chat_model(
+        "openai:gpt-4.1-mini", base_url=stub.base_url, api_key="sk-stub"
+    )
+    return create_react_agent(
+        model=llm, prompt=SYSTEM_PROMPT, tools=TOOLS, checkpointer=InMemorySaver()
+    )
+
+
+def tool_calls(messages) -> list:
+    return [
+        call["name"]
+        for message in messages
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    ]
+
+
+def test_agent_replays_the_scripted_conversation():
+    with StubLLM() as stub:
+        agent = create_agent(stub)
+        config = {"configurable": {"thread_id": "1"}}
+
+        state = agent.invoke(
+            {"messages": [HumanMessage(content="Where is my order?")]}, config
+        )
+        assert tool_calls(state["messages"]) == [
+            "get_customer_order_history",
+            "get_order_status",
+        ]
+        assert "9127412" in state["messages"][-1].content
+
+        turn = len(state["messages"])
+        state = agent.invoke(
+            {"messages": [HumanMessage(content="Can I get a refund?")]}, config
+        )
+        assert tool_calls(state["messages"][turn:]) == [
+            "get_customer_order_history",
+            "get_company_policy",
+        ]
+        assert "policy" in state["messages"][-1].content
+        assert any(
+            isinstance(message, ToolMessage) and "30 days" in message.content
+            for message in state["messages"][turn:]
+        )
+
+    assert stub.requests == 6
+
+
+def test_latency_and_tokens_per_second():
+    with StubLLM(latency=0.2, tokens_per_second=100) as stub:
+        llm = init_chat_model(
+            "openai:gpt-4.1-mini", base_url=stub.base_url, api_key="sk-stub"
+        )
+
+        start = time.perf_counter()
+        reply = llm.invoke("Hi")
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunks = list(llm.stream("Hi"))
+        streamed = time.perf_counter() - start
+
+    words = len(reply.content.split())
+    assert 0.2 + words / 100 <= elapsed < 1
+    assert "".join(chunk.content for chunk in chunks) == reply.content
+    assert 0.2 + (words - 1) / 100 <= streamed < 1
+    assert reply.usage_metadata["output_tokens"] == words
+
+
+def test_react_text_format():
+    stub = StubLLM()
+    request = {
+        "messages": [
+            {
+                "role": "system",
+                "content": "You have access to: escalate_to_human\n"
+                "Action: tool name\nAction Input: JSON arguments",
+            },
+            {"role": "user", "content": "Let me talk to a person"},
+        ]
+    }
+
+    message = stub.render(request, stub.reply(request))
+    assert "Action: escalate_to_human\nAction Input: {}" in message["content"]
+
+    request["messages"] += [
+        {"role": "assistant", "content": message["content"]},
+        {"role": "user", "content": "Observation: escalated"},
+    ]
+    message = stub.render(request, stub.reply(request))
+    assert message["content"].startswith("Thought:")
+    assert "\nAnswer: " in message["content"]
+
+
+def test_output_fields_format():
+    stub = StubLLM()
+    instructions = (
+        "Respond with the corresponding output fields, starting with the field "
+        "`[[ ## next_thought ## ]]`, then `[[ ## next_tool_name ## ]]`, then "
+        "`[[ ## next_tool_args ## ]]`, and then ending with the marker for "
+        "`[[ ## completed ## ]]`."
+    )
+    request = {
+        "messages": [
+            {
+                "role": "system",
+                "content": "Tools: get_customer_order_history, finish",
+            },
+            {
+                "role": "user",
+                "content": "[[ ## question ## ]]\nI want my money back\n\n"
+                "[[ ## trajectory ## ]]\n\n" + instructions,
+            },
+        ]
+    }
+
+    content = stub.render(request, stub.reply(request))["content"]
+    assert "[[ ## next_tool_name ## ]]\nget_customer_order_history" in content
+    assert "[[ ## next_tool_args ## ]]\n{}" in content
+    assert content.endswith("[[ ## completed ## ]]")
+
+
+def test_load_script(tmp_path):
+    path = tmp_path / "script.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "match": "bill",
+                    "steps": [
+                        {"tool_calls": [{"name": "escalate_to_human"}]},
+                        {"content": "Billing will call you back."},
+                    ],
+                }
+            ]
+        )
+    )
+    stub = StubLLM(script=load_script(str(path)))
+    request = {
+        "messages": [{"role": "user", "content": "My bill is wrong"}],
+        "tools": [{"type": "function", "function": {"name": "escalate_to_human"}}],
+    }
+
+    assert [call.name for call in stub.reply(request).tool_calls] == [
+        "escalate_to_human"
+    ]
+    request["messages"] += [
+        {"role": "assistant", "content": None},
+        {"role": "tool", "content": "escalated"},
+    ]
+    assert stub.reply(request).content == "Billing will call you back."
@@ -0,0 +1,73 @@
+"""
+Measure how much smaller troubleshooting tool returns get with ranked excerpts.
+
+For a set of customer issues, compares the size of what the agent receives from
+the tool: the whole guide, as `get_troubleshooting_guide` used to return it, against
+the excerpts `search_troubleshooting_guide` returns for each character budget. Token
+counts are estimated at 4 characters per token. Every tool return is added to the
+agent's context and stored in its message history, so this is the growth per call.
+
+Usage:
+    python benchmark_context_size.py [--budgets 1500 3000 5000]
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List
+
+from create_agent_app.common.customer_support.knowledge_base_search import (
+    search_troubleshooting_guide,
+)
+from create_agent_app.common.customer_support.mocked_apis import (
+    http_GET_troubleshooting_guide,
+)
+
+ISSUES = [
+    ("internet", "my internet is very slow"),
+    ("internet", "internet keeps dropping"),
+    ("internet", "can't connect to wifi, password not working"),
+    ("internet", "data overage charges on my bill"),
+    ("mobile", "can't make or receive calls"),
+    ("mobile", "text messages are not sending"),
+    ("mobile", "mobile data not working"),
+    ("television", "no picture or sound on my tv"),
+    ("television", "remote control not working"),
+    ("ecommerce", "I want to return a damaged item"),
+    ("ecommerce", "where is my order tracking"),
+]
+
+
+def tool_return_size(document: Dict[str, Any]) -> int:
+    return len(json.dumps(document))
+
+
+def measure(budget: int) -> Dict[str, Any]:
+    full: List[int] = []
+    excerpts: List[int] = []
+    for guide, query in ISSUES:
+        full.append(tool_return_size(http_GET_troubleshooting_guide(guide)))  # type: ignore
+        excerpts.append(
+            tool_return_size(search_troubleshooting_guide(guide, query, budget))  # type: ignore
+        )
+
+    return {
+        "char_budget": budget,
+        "mean_full_guide_chars": sum(full) / len(full),
+        "mean_excerpt_chars": sum(excerpts) / len(excerpts),
+        "max_excerpt_chars": max(excerpts),
+        "mean_tokens_saved_per_call": (sum(full) - sum(excerpts)) / len(full) / 4,
+        "reduction": 1 - sum(excerpts) / sum(full),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1500, 3000, 5000])
+    args = parser.parse_args()
+
+    for budget in args.budgets:
+        print(json.dumps(measure(budget)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Idempotent creation of the Letta tools and agent.
+
+Letta stores tools and agents on the server, so creating them on every start uploads
+the tool source again and leaves one more agent behind each time. Instead, the ids
+of what was created are kept in a local manifest together with a hash of the tool
+source and the agent configuration, and tools and agents are only created again when
+that hash changes or when the server no longer has them.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from textwrap import dedent
+from typing import Any, Callable, Dict
+
+from letta_client import Letta
+from letta_client.core.api_error import ApiError
+
+MANIFEST_PATH = os.getenv(
+    "LETTA_MANIFEST_PATH",
+    os.path.join(os.path.dirname(__file__), ".letta_manifest.json"),
+)
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-serializable value"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def tool_fingerprint(func: Callable, options: Dict[str, Any]) -> str:
+    """Hash of the source Letta receives for the tool and the options it is created with"""
+    return fingerprint({"source_code": dedent(inspect.getsource(func)), **options})
+
+
+def load_manifest(path: str, base_url: str) -> Dict[str, Any]:
+    """
+    Read the manifest, ignoring it if it belongs to another server
+
+    Args:
+        path: Path of the manifest file
+        base_url: URL of the Letta server the ids must belong to
+
+    Returns:
+        The manifest, with empty `tools` and no `agent` if there is none yet
+    """
+    empty = {"base_url": base_url, "tools": {}, "agent": None}
+    if not os.path.exists(path):
+        return empty
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("base_url") != base_url:
+        return empty
+    return manifest
+
+
+def save_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def agent_exists(client: Letta, agent_id: str) -> bool:
+    try:
+        client.agents.retrieve(agent_id)
+    except ApiError as e:
+        if e.status_code == 404:
+            return False
+        raise
+    return True
+
+
+def bootstrap_agent(
+    client: Letta,
+    base_url: str,
+    tools: Dict[str, Dict[str, Any]],
+    agent_config: Dict[str, Any],
+    manifest_path: str = MANIFEST_PATH,
+) -> str:
+    """
+    Return the id of an agent with the given tools and configuration, creating the
+    tools and the agent only if the manifest has no up-to-date ids for them
+
+    A tool is upserted when its source or options changed. The agent is created when
+    its configuration or any of its tool ids changed, and the agent it replaces is
+    deleted. If the agent in the manifest is gone from the server, the server was
+    reset, so all tools are upserted again as well.
+
+    Args:
+        client: The Letta client
+        base_url: URL of the Letta server, the manifest is only used for that server
+        tools: Tool name to the `upsert_from_function` arguments, `func` and options
+        agent_config: Arguments for `client.agents.create`, without `tool_ids`
+        manifest_path: Where the ids and hashes are kept between runs
+
+    Returns:
+        The agent id
+    """
+    manifest = load_manifest(manifest_path, base_url)
+    previous_agent = manifest["agent"]
+    if previous_agent and not agent_exists(client, previous_agent["id"]):
+        manifest = {"base_url": base_url, "tools": {}, "agent": None}
+        previous_agent = None
+
+    for name, arguments in tools.items():
+        options = {key: value for key, value in arguments.items() if key != "func"}
+        tool_hash = tool_fingerprint(arguments["func"], options)
+        cached = manifest["tools"].get(name)
+        if cached and cached["hash"] == tool_hash:
+            continue
+        tool = client.tools.upsert_from_function(**arguments)
+        manifest["tools"][name] = {"id": tool.id, "hash": tool_hash}
+
+    tool_ids = [manifest["tools"][name]["id"] for name in tools]
+    agent_hash = fingerprint({**agent_config, "tool_ids": tool_ids})
+    if not previous_agent or previous_agent["hash"] != agent_hash:
+        agent = client.agents.create(**agent_config, tool_ids=tool_ids)
+        manifest["agent"] = {"id": agent.id, "hash": agent_hash}
+    save_manifest(manifest_path, manifest)
+
+    if previous_agent and previous_agent["id"] != manifest["agent"]["id"]:
+        client.agents.delete(previous_agent["id"])
+    return manifest["agent"]["id"]
@@ -5,12 +5,19 @@ Unlike other frameworks, Letta runs as a service and agents are stored in a data
 Before running this script, make sure you start the Letta server by running `bash run.sh`.
 """
 
+import os
 from letta_client import Letta
 from typing import List, Literal
 
-client = Letta(base_url="http://localhost:8283")
+from bootstrap import bootstrap_agent
+
+base_url = os.getenv("LETTA_BASE_URL", "http://localhost:8283")
+client = Letta(base_url=base_url)
 # client = Letta(api_key="your_api_key") # if you have an API key
 
+# characters of troubleshooting guide excerpts returned by a single tool call
+knowledge_base_char_budget = int(os.getenv("KNOWLEDGE_BASE_CHAR_BUDGET", "3000"))
+
 human = "" # starter information about the human
 
 # NOTE: this can also be appended to the default system prompt if we don't want it to be editable over time
@@ -109,20 +116,23 @@ def get_company_policy() -> "DocumentResponse":
     return http_GET_company_policy()
 
 
-def get_troubleshooting_guide(
+def search_troubleshooting_guide(
     guide: Literal["internet", "mobile", "television", "ecommerce"],
+    query: str,
 ) -> "DocumentResponse":
     """
-    Get the troubleshooting guide
+    Search a troubleshooting guide for the sections relevant to the customer's issue
 
     Args:
-        guide: The guide to get the troubleshooting guide for, one of "internet", "mobile", "television", "ecommerce"
+        guide: The guide to search, one of "internet", "mobile", "television", "ecommerce"
+        query: The customer's issue in a few words, e.g. "wifi password not working"
 
     Returns:
-        The troubleshooting guide document
+        The most relevant sections of the troubleshooting guide
     """
-    from create_agent_app.common.customer_support.mocked_apis import http_GET_troubleshooting_guide
-    return http_GET_troubleshooting_guide(guide)
+    import os
+    from create_agent_app.common.customer_support.knowledge_base_search import search_troubleshooting_guide as search_guide
+    return search_guide(guide, query, char_budget=int(os.getenv("KNOWLEDGE_BASE_CHAR_BUDGET", "3000")))
 
 
 def escalate_to_human() -> dict[str, str]:
@@ -137,28 +147,9 @@ def escalate_to_human() -> dict[str, str]:
         "type": "escalation",
     }
 
-# create the tools
-get_customer_order_history_tool = client.tools.upsert_from_function(
-    func=get_customer_order_history
-)
-get_order_status_tool = client.tools.upsert_from_function(
-    func=get_order_status
-)
-get_company_policy_tool = client.tools.upsert_from_function(
-    func=get_company_policy
-)
-get_troubleshooting_guide_tool = client.tools.upsert_from_function(
-    func=get_troubleshooting_guide,
-    return_char_limit=20000 # seems to require a big return
-)
-escalate_to_human_tool = client.tools.upsert_from_function(
-    func=escalate_to_human
-)
-
-# create the agent
-agent = client.agents.create(
-    name="customer_service_agent",
-    memory_blocks = [
+agent_config = {
+    "name": "customer_service_agent",
+    "memory_blocks": [
         {
             "label": "persona",
             "value": persona,
@@ -169,40 +160,56 @@ agent = client.agents.create(
             "value": human,
         }
     ],
-    model="google_ai/gemini-2.5-pro-exp-03-25",
-    embedding="google_ai/gemini-embedding-exp",
-    tool_ids=[
-        get_customer_order_history_tool.id,
-        get_order_status_tool.id,
-        get_company_policy_tool.id,
-        get_troubleshooting_guide_tool.id,
-        escalate_to_human_tool.id,
-    ]
+    # Any Letta model handle, e.g. openai/gpt-4o-mini with the server's OPENAI_API_BASE set to a local server
+    "model": os.getenv("LETTA_MODEL", "google_ai/gemini-2.5-pro-exp-03-25"),
+    "embedding": os.getenv("LETTA_EMBEDDING_MODEL", "google_ai/gemini-embedding-exp"),
+    "tool_exec_environment_variables": {
+        "KNOWLEDGE_BASE_CHAR_BUDGET": str(knowledge_base_char_budget),
+    },
+}
+
+# create the tools and the agent, or reuse them if they did not change since the last run
+agent_id = bootstrap_agent(
+    client,
+    base_url,
+    tools={
+        "get_customer_order_history": {"func": get_customer_order_history},
+        "get_order_status": {"func": get_order_status},
+        "get_company_policy": {"func": get_company_policy},
+        "search_troubleshooting_guide": {
+            "func": search_troubleshooting_guide,
+            # room for the document id and name around the excerpts
+            "return_char_limit": knowledge_base_char_budget + 500,
+        },
+        "escalate_to_human": {"func": escalate_to_human},
+    },
+    agent_config=agent_config,
 )
 
-for message in client.agents.messages.create_stream(
-    agent_id=agent.id,
-    messages=[
-        {
-            "role": "user",
-            "content": "Hello, I'm having trouble with my internet service."
-        }
-    ]
-):
-    if message.message_type == "reasoning_message":
-        print("🧠 Reasoning: " + message.reasoning)
-    elif message.message_type == "assistant_message":
-        print("🤖 Agent: " + message.content)
-    elif message.message_type == "tool_call_message":
-        print("🔧 Tool Call: " + message.tool_call.name +  \
-              "\n" + message.tool_call.arguments)
-    elif message.message_type == "tool_return_message":
-        print("🔧 Tool Return: " + message.tool_return)
-    elif message.message_type == "user_message":
-        print("👤 User Message: " + message.content)
-    elif message.message_type == "system_message":
-        print(" System Message: " + message.content)
-    elif message.message_type == "usage_statistics":
-        # for streaming specifically, we send the final
-        # chunk that contains the usage statistics
-        print(f"Usage: [{message}]")
\ No newline at end of file
+if __name__ == "__main__":
+    for message in client.agents.messages.create_stream(
+        agent_id=agent_id,
+        messages=[
+            {
+                "role": "user",
+                "content": "Hello, I'm having trouble with my internet service."
+            }
+        ]
+    ):
+        if message.message_type == "reasoning_message":
+            print("🧠 Reasoning: " + message.reasoning)
+        elif message.message_type == "assistant_message":
+            print("🤖 Agent: " + message.content)
+        elif message.message_type == "tool_call_message":
+            print("🔧 Tool Call: " + message.tool_call.name +  \
+                  "\n" + message.tool_call.arguments)
+        elif message.message_type == "tool_return_message":
+            print("🔧 Tool Return: " + message.tool_return)
+        elif message.message_type == "user_message":
+            print("👤 User Message: " + message.content)
+        elif message.message_type == "system_message":
+            print(" System Message: " + message.content)
+        elif message.message_type == "usage_statistics":
+            # for streaming specifically, we send the final
+            # chunk that contains the usage statistics
+            print(f"Usage: [{message}]")
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Stand-in for the Letta server, implementing the tool and agent endpoints used by
+`bootstrap_agent` in memory and counting the requests it receives.
+"""
+
+import json
+import re
+import threading
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+class StubLettaServer:
+    def __init__(self):
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.requests: Counter = Counter()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StubLettaServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self) -> None:
+        """Forget every tool and agent, as a server with a new database would"""
+        self.tools.clear()
+        self.agents.clear()
+
+    def upsert_tool(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        name = re.search(r"def (\w+)", body["source_code"]).group(1)  # type: ignore
+        tool_id = self.tools.get(name, {}).get("id", f"tool-{uuid.uuid4()}")
+        self.tools[name] = {**body, "id": tool_id, "name": name}
+        return self.tools[name]
+
+    def create_agent(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        agent_id = f"agent-{uuid.uuid4()}"
+        self.agents[agent_id] = {**body, "id": agent_id}
+        return self.agents[agent_id]
+
+    def _handler(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self._route("GET")
+
+            def do_PUT(self) -> None:
+                self._route("PUT")
+
+            def do_POST(self) -> None:
+                self._route("POST")
+
+            def do_DELETE(self) -> None:
+                self._route("DELETE")
+
+            def _route(self, method: str) -> None:
+                path = self.path.split("?")[0].rstrip("/")
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                resource = re.sub(r"/(tool|agent)-[^/]+", "/{id}", path)
+                stub.requests[f"{method} {resource}"] += 1
+
+                if method == "PUT" and path == "/v1/tools":
+                    return self._reply(200, stub.upsert_tool(body))
+                if method == "POST" and path == "/v1/agents":
+                    return self._reply(200, stub.create_agent(body))
+                if path.startswith("/v1/agents/"):
+                    agent_id = path.split("/")[-1]
+                    if agent_id not in stub.agents:
+                        return self._reply(404, {"detail": "Agent not found"})
+                    if method == "GET":
+                        return self._reply(200, stub.agents[agent_id])
+                    if method == "DELETE":
+                        del stub.agents[agent_id]
+                        return self._reply(200, {})
+                self._reply(404, {"detail": "Not found"})
+
+            def _reply(self, status: int, body: Dict[str, Any]) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
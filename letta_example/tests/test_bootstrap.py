@@ -0,0 +1,106 @@
+import pytest
+from letta_client import Letta
+
+from bootstrap import bootstrap_agent
+from stub_letta_server import StubLettaServer
+
+
+def get_order_status(order_id: str) -> dict:
+    """
+    Get the status of a specific order
+
+    Args:
+        order_id: The ID of the order to get the status of
+
+    Returns:
+        The status of the order
+    """
+    return {"order_id": order_id, "status": "shipped"}
+
+
+def escalate_to_human() -> dict:
+    """
+    Escalate to human
+
+    Returns:
+        A link for the customer to open a ticket with the support team
+    """
+    return {"url": "https://support.xpto.com/tickets"}
+
+
+tools = {
+    "get_order_status": {"func": get_order_status},
+    "escalate_to_human": {"func": escalate_to_human},
+}
+agent_config = {"name": "customer_service_agent", "model": "openai/gpt-4o-mini"}
+
+
+@pytest.fixture
+def server():
+    with StubLettaServer() as server:
+        yield server
+
+
+@pytest.fixture
+def bootstrap(server, tmp_path):
+    client = Letta(base_url=server.base_url)
+    manifest_path = str(tmp_path / "manifest.json")
+
+    def bootstrap(tools=tools, agent_config=agent_config):
+        server.requests.clear()
+        return bootstrap_agent(
+            client, server.base_url, tools, agent_config, manifest_path
+        )
+
+    return bootstrap
+
+
+def test_second_start_reuses_tools_and_agent(server, bootstrap):
+    agent_id = bootstrap()
+    assert server.requests == {"PUT /v1/tools": 2, "POST /v1/agents": 1}
+
+    assert bootstrap() == agent_id
+    assert server.requests == {"GET /v1/agents/{id}": 1}
+    assert list(server.agents) == [agent_id]
+
+
+def test_changed_tool_is_upserted_without_a_new_agent(server, bootstrap):
+    agent_id = bootstrap()
+
+    changed_tools = {
+        **tools,
+        "get_order_status": {"func": get_order_status, "return_char_limit": 100},
+    }
+    assert bootstrap(tools=changed_tools) == agent_id
+    assert server.requests == {"GET /v1/agents/{id}": 1, "PUT /v1/tools": 1}
+    assert server.tools["get_order_status"]["return_char_limit"] == 100
+
+    bootstrap(tools=changed_tools)
+    assert server.requests == {"GET /v1/agents/{id}": 1}
+
+
+def test_changed_config_replaces_the_agent(server, bootstrap):
+    agent_id = bootstrap()
+
+    new_agent_id = bootstrap(agent_config={**agent_config, "model": "openai/gpt-4o"})
+    assert new_agent_id != agent_id
+    assert server.requests == {
+        "GET /v1/agents/{id}": 1,
+        "POST /v1/agents": 1,
+        "DELETE /v1/agents/{id}": 1,
+    }
+    assert list(server.agents) == [new_agent_id]
+
+
+def test_reset_server_gets_everything_again(server, bootstrap):
+    agent_id = bootstrap()
+    server.reset()
+
+    new_agent_id = bootstrap()
+    assert new_agent_id != agent_id
+    assert server.requests == {
+        "GET /v1/agents/{id}": 1,
+        "PUT /v1/tools": 2,
+        "POST /v1/agents": 1,
+    }
+    assert set(server.tools) == set(tools)
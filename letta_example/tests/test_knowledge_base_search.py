@@ -0,0 +1,36 @@
+import pytest
+
+from create_agent_app.common.customer_support.knowledge_base_search import (
+    search_troubleshooting_guide,
+)
+
+
+@pytest.mark.parametrize(
+    "guide, query, expected_document",
+    [
+        ("internet", "can't connect to wifi", "Document 3: I Can't Connect to Wi-Fi"),
+        ("internet", "connection keeps dropping", "Document 2: My Internet Connection"),
+        ("ecommerce", "return an item", "Document 4: Returns and Exchanges"),
+    ],
+)
+def test_excerpts_start_with_the_most_relevant_document(
+    guide, query, expected_document
+):
+    content = search_troubleshooting_guide(guide, query)["document_content"]
+
+    assert len(content) <= 3000
+    assert content.startswith(f"## {expected_document}")
+
+
+def test_excerpts_stay_within_the_budget():
+    for budget in (300, 1000, 5000):
+        document = search_troubleshooting_guide("mobile", "phone not charging", budget)
+        assert 0 < len(document["document_content"]) <= budget
+        assert document["document_id"] == "troubleshooting_mobile"
+
+
+def test_unmatched_query_returns_the_start_of_the_guide():
+    content = search_troubleshooting_guide("television", "zzz", 200)["document_content"]
+
+    assert content.startswith("**XPTO Telecom")
+    assert len(content) <= 200
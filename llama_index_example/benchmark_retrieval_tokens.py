@@ -0,0 +1,79 @@
+"""
+Compare the tokens the agent reads from the knowledge base index against whole documents.
+
+For every query, prints the tokens returned by the `search_knowledge_base` tool and
+the tokens of the document the agent would have fetched with the previous
+`get_troubleshooting_guide` / `get_company_policy` tools, plus the time to build and
+persist the index on the first start and to load it from disk on later starts.
+
+Tokens are counted with LlamaIndex's default tokenizer (tiktoken's cl100k_base).
+
+Usage:
+    uv run python benchmark_retrieval_tokens.py [--top-k 3]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+from llama_index.core.utils import get_tokenizer
+
+from create_agent_app.common.customer_support.mocked_apis import (
+    http_GET_company_policy,
+    http_GET_troubleshooting_guide,
+)
+from knowledge_base_index import create_knowledge_base_tool, load_index
+
+QUERIES = {
+    "I can't connect to the wifi, I forgot the password": "internet",
+    "My internet connection keeps dropping": "internet",
+    "I have no signal on my phone": "mobile",
+    "My voicemail is not working": "mobile",
+    "There is no picture on my TV": "television",
+    "My remote control doesn't change channels": "television",
+    "The item I received is damaged, how do I return it?": "ecommerce",
+    "How long does a refund take?": "policy",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    tokenizer = get_tokenizer()
+    with tempfile.TemporaryDirectory() as persist_directory:
+        start = time.perf_counter()
+        load_index(persist_directory)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index = load_index(persist_directory)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({"build_ms": build_ms, "load_ms": load_ms}))
+
+    tool = create_knowledge_base_tool(index, top_k=args.top_k)
+    for query, guide in QUERIES.items():
+        document = (
+            http_GET_company_policy()
+            if guide == "policy"
+            else http_GET_troubleshooting_guide(guide)  # type: ignore
+        )
+        document_tokens = len(tokenizer(document["document_content"]))
+        retrieved_tokens = len(tokenizer(str(tool.call(query))))
+        print(
+            json.dumps(
+                {
+                    "query": query,
+                    "document": guide,
+                    "document_tokens": document_tokens,
+                    "retrieved_tokens": retrieved_tokens,
+                    "tokens_saved": document_tokens - retrieved_tokens,
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
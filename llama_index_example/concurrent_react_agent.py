@@ -0,0 +1,127 @@
+"""
+ReActAgent that runs the independent tool calls of a reasoning step concurrently.
+
+The ReAct format has the LLM write one Action per step, so a question that needs the
+order history and the company policy takes two LLM round trips, one per tool. This
+agent tells the LLM it may write several Action / Action Input pairs in one step,
+and sends all of them as `ToolCall` events at once. The workflow's `call_tool` step
+runs up to 4 of them at the same time and the observations are added back in the
+order of the actions.
+"""
+
+import re
+import uuid
+from typing import List, Optional, Sequence
+
+from llama_index.core.agent.react.formatter import ReActChatFormatter
+from llama_index.core.agent.react.output_parser import parse_action_reasoning_step
+from llama_index.core.agent.react.prompts import (
+    CONTEXT_REACT_CHAT_SYSTEM_HEADER,
+    REACT_CHAT_SYSTEM_HEADER,
+)
+from llama_index.core.agent.react.types import ActionReasoningStep
+from llama_index.core.agent.workflow import AgentOutput, ReActAgent, ToolCallResult
+from llama_index.core.bridge.pydantic import Field
+from llama_index.core.llms import ChatMessage
+from llama_index.core.llms.llm import ToolSelection
+from llama_index.core.memory import BaseMemory
+from llama_index.core.tools import AsyncBaseTool
+from llama_index.core.workflow import Context
+
+CONCURRENT_ACTIONS_INSTRUCTIONS = """\
+If you need several tools whose inputs do not depend on each other's results, write \
+one "Action:" and "Action Input:" pair per tool after your Thought. They will run at \
+the same time and you will get one Observation per Action, in the same order.
+
+"""
+
+ACTION_PATTERN = re.compile(
+    r"^Action: *([^\n\(\) ]+)[^\n]*\n+Action Input: *(\{.*?\})[ \t]*$",
+    re.MULTILINE | re.DOTALL,
+)
+
+TOOL_CALL_ORDER_KEY = "tool_call_order"
+
+
+def add_concurrent_actions_instructions(system_header: str) -> str:
+    return system_header.replace(
+        "If this format is used",
+        CONCURRENT_ACTIONS_INSTRUCTIONS + "If this format is used",
+        1,
+    )
+
+
+def default_formatter(fields: Optional[dict] = None) -> ReActChatFormatter:
+    """Same as ReActAgent's default formatter, with the concurrent actions instructions"""
+    context = (fields or {}).get("system_prompt", None)
+    system_header = (
+        CONTEXT_REACT_CHAT_SYSTEM_HEADER if context else REACT_CHAT_SYSTEM_HEADER
+    )
+    return ReActChatFormatter.from_defaults(
+        system_header=add_concurrent_actions_instructions(system_header),
+        context=context,
+    )
+
+
+def parse_actions(output: str, thought: str) -> List[ActionReasoningStep]:
+    """Parses every Action / Action Input pair of a ReAct step, in order"""
+    return [
+        parse_action_reasoning_step(
+            f"Thought: {thought}\nAction: {action}\nAction Input: {action_input}"
+        )
+        for action, action_input in ACTION_PATTERN.findall(output)
+    ]
+
+
+class ConcurrentReActAgent(ReActAgent):
+    """ReActAgent that sends every Action of a reasoning step as a tool call at once"""
+
+    formatter: ReActChatFormatter = Field(
+        default_factory=default_formatter,
+        description="The react chat formatter, with the concurrent actions instructions.",
+    )
+
+    async def take_step(
+        self,
+        ctx: Context,
+        llm_input: List[ChatMessage],
+        tools: Sequence[AsyncBaseTool],
+        memory: BaseMemory,
+    ) -> AgentOutput:
+        output = await super().take_step(ctx, llm_input, tools, memory)
+        if not output.tool_calls:
+            return output
+
+        current_reasoning = await ctx.store.get(self.reasoning_key)
+        first_action: ActionReasoningStep = current_reasoning[-1]
+        actions = parse_actions(output.response.content or "", first_action.thought)
+        if len(actions) > 1:
+            # Replace the single action parsed by ReActAgent with all of them
+            current_reasoning[-1:] = actions
+            await ctx.store.set(self.reasoning_key, current_reasoning)
+            output.tool_calls = [
+                ToolSelection(
+                    tool_id=str(uuid.uuid4()),
+                    tool_name=action.action,
+                    tool_kwargs=action.action_input,
+                )
+                for action in actions
+            ]
+
+        await ctx.store.set(
+            TOOL_CALL_ORDER_KEY, [tool_call.tool_id for tool_call in output.tool_calls]
+        )
+        return output
+
+    async def handle_tool_call_results(
+        self, ctx: Context, results: List[ToolCallResult], memory: BaseMemory
+    ) -> None:
+        # Results arrive in the order the tools finished, observations must follow the actions
+        order: List[str] = await ctx.store.get(TOOL_CALL_ORDER_KEY, default=[])
+        results = sorted(
+            results,
+            key=lambda result: (
+                order.index(result.tool_id) if result.tool_id in order else len(order)
+            ),
+        )
+        await super().handle_tool_call_results(ctx, results, memory)
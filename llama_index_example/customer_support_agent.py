@@ -3,22 +3,19 @@
 # - https://docs.llamaindex.ai/en/stable/examples/agent/agent_custom_tools.html
 
 import os
-from typing import List, Literal
 import dotenv
 
 dotenv.load_dotenv()
 
-from create_agent_app.common.customer_support.mocked_apis import (
-    DocumentResponse,
-    OrderSummaryResponse,
-    OrderStatusResponse,
-    http_GET_company_policy,
-    http_GET_customer_order_history,
-    http_GET_order_status,
-    http_GET_troubleshooting_guide,
+from create_agent_app.common.customer_support.tools import (
+    escalate_to_human,
+    get_company_policy,
+    get_customer_order_history,
+    get_order_status,
 )
+from concurrent_react_agent import ConcurrentReActAgent
+from knowledge_base_index import create_knowledge_base_tool, load_index
 
-from llama_index.core.agent.workflow import ReActAgent
 from llama_index.llms.openai import OpenAI
 from llama_index.core.tools import FunctionTool
 
@@ -61,7 +58,7 @@ Follow these steps to effectively assist customers:
 
 *   **Specific Instructions**
     *   When asked for the company policy, explain using the original text, to avoid misunderstandings
-    *   When a user presents a technical issue related to any service, use the troubleshooting_guide
+    *   When a user presents a technical issue related to any service, use search_knowledge_base to find the relevant troubleshooting steps
     *   When needing to return an product, first check the company policy for refunds, and explain the refund to the user in simple terms based on the policy
     *   DO NOT ASK FOR THE ORDER ID, use the tools to check the customer's orders yourself and better help the user giving a summary of the latest order(s) instead of asking for the order id right away
 
@@ -83,67 +80,6 @@ Today is 2025-04-19
 """
 
 
-def get_customer_order_history() -> List[OrderSummaryResponse]:
-    """
-    Get the current customer order history
-
-    Returns:
-        The customer order history
-    """
-    return http_GET_customer_order_history()
-
-
-def get_order_status(order_id: str) -> OrderStatusResponse:
-    """
-    Get the status of a specific order
-
-    Args:
-        order_id: The ID of the order to get the status of
-
-    Returns:
-        The status of the order
-    """
-    return http_GET_order_status(order_id)
-
-
-def get_company_policy() -> DocumentResponse:
-    """
-    Get the company policy
-
-    Returns:
-        The company policy document
-    """
-    return http_GET_company_policy()
-
-
-def get_troubleshooting_guide(
-    guide: Literal["internet", "mobile", "television", "ecommerce"],
-) -> DocumentResponse:
-    """
-    Get the troubleshooting guide
-
-    Args:
-        guide: The guide to get the troubleshooting guide for, one of "internet", "mobile", "television", "ecommerce"
-
-    Returns:
-        The troubleshooting guide document
-    """
-    return http_GET_troubleshooting_guide(guide)
-
-
-def escalate_to_human() -> dict[str, str]:
-    """
-    Escalate to human, retrieves a link for the customer to open a ticket with the support team
-
-    Returns:
-        A link for the customer to open a ticket with the support team
-    """
-    return {
-        "url": "https://support.xpto.com/tickets",
-        "type": "escalation",
-    }
-
-
 # Create tools
 get_customer_order_history_tool = FunctionTool.from_defaults(
     fn=get_customer_order_history,
@@ -163,12 +99,6 @@ get_company_policy_tool = FunctionTool.from_defaults(
     description="Get the company policy",
 )
 
-get_troubleshooting_guide_tool = FunctionTool.from_defaults(
-    fn=get_troubleshooting_guide,
-    name="get_troubleshooting_guide",
-    description="Get the troubleshooting guide for a specific topic",
-)
-
 escalate_to_human_tool = FunctionTool.from_defaults(
     fn=escalate_to_human,
     name="escalate_to_human",
@@ -179,11 +109,17 @@ escalate_to_human_tool = FunctionTool.from_defaults(
 llm = OpenAI(
     model="gpt-4o-mini",
     api_key=os.getenv("OPENAI_API_KEY"),
+    api_base=os.getenv("OPENAI_BASE_URL"),
     temperature=0,
 )
 
+# Load the knowledge base index from disk, it is only built on the first start and
+# whenever a knowledge base document changes
+knowledge_base_index = load_index(llm=llm)
+search_knowledge_base_tool = create_knowledge_base_tool(knowledge_base_index)
+
 # Create agent
-agent = ReActAgent(
+agent = ConcurrentReActAgent(
     name="customer_support_agent",
     description="Customer support agent for XPTO Telecom",
     system_prompt=SYSTEM_PROMPT,
@@ -191,7 +127,7 @@ agent = ReActAgent(
         get_customer_order_history_tool,
         get_order_status_tool,
         get_company_policy_tool,
-        get_troubleshooting_guide_tool,
+        search_knowledge_base_tool,
         escalate_to_human_tool,
     ],
     llm=llm,
@@ -0,0 +1,165 @@
+"""
+Index of the customer support knowledge base chunks, persisted to disk and exposed to
+the agent as a query engine tool.
+
+Instead of handing the agent whole documents, the tool retrieves the few chunks of the
+company policy and troubleshooting guides that are most relevant to the question,
+ranked with the same BM25 keyword ranking as the other examples, see
+create_agent_app/common/customer_support/knowledge_base_search.py. Every chunk is
+stored with the term frequencies of its words, so building the index needs no LLM or
+embedding model and it is tokenized only once. The index is persisted next to a hash
+of the knowledge base, so later starts load the chunks and their term frequencies from
+disk and only rebuild them when a document changes.
+"""
+
+import hashlib
+import os
+from collections import Counter
+from os import path
+from typing import List, Optional
+
+from llama_index.core import (
+    SimpleDirectoryReader,
+    StorageContext,
+    SummaryIndex,
+    load_index_from_storage,
+)
+from llama_index.core.indices.base import BaseIndex
+from llama_index.core.llms import LLM
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.query_engine import CustomQueryEngine
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import BaseNode, NodeWithScore, QueryBundle
+from llama_index.core.tools import QueryEngineTool, ToolMetadata
+
+from create_agent_app.common.customer_support import mocked_apis
+from create_agent_app.common.customer_support.knowledge_base_search import (
+    BM25Index,
+    tokenize,
+)
+
+KNOWLEDGE_BASE_DIRECTORY = path.join(
+    path.dirname(mocked_apis.__file__), "knowledge_base"
+)
+PERSIST_DIRECTORY = os.getenv(
+    "KNOWLEDGE_BASE_INDEX_DIR",
+    path.join(path.dirname(__file__), "storage", "knowledge_base"),
+)
+VERSION_FILE = "knowledge_base_version"
+# Changes whenever what is stored with the chunks changes, to rebuild older indexes
+INDEX_FORMAT = "bm25-v1"
+# Node metadata with the count of every token of the chunk and its document name
+TERM_FREQUENCIES = "term_frequencies"
+
+
+def knowledge_base_version(directory: str = KNOWLEDGE_BASE_DIRECTORY) -> str:
+    """Hash of the knowledge base documents, changes whenever any of them changes"""
+    digest = hashlib.sha256()
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".md"):
+            digest.update(file_name.encode())
+            with open(path.join(directory, file_name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def build_index(
+    directory: str = KNOWLEDGE_BASE_DIRECTORY, llm: Optional[LLM] = None
+) -> SummaryIndex:
+    documents = SimpleDirectoryReader(directory, required_exts=[".md"]).load_data()
+    nodes = SentenceSplitter(chunk_size=256, chunk_overlap=32).get_nodes_from_documents(
+        documents
+    )
+    for node in nodes:
+        text = f"{node.metadata.get('file_name', '')} {node.get_content()}"
+        node.metadata[TERM_FREQUENCIES] = dict(Counter(tokenize(text)))
+        # Only for ranking, never shown to a model
+        node.excluded_llm_metadata_keys.append(TERM_FREQUENCIES)
+        node.excluded_embed_metadata_keys.append(TERM_FREQUENCIES)
+    return SummaryIndex(nodes, llm=llm)
+
+
+def load_index(
+    persist_directory: str = PERSIST_DIRECTORY,
+    directory: str = KNOWLEDGE_BASE_DIRECTORY,
+    llm: Optional[LLM] = None,
+) -> BaseIndex:
+    """
+    Load the index from `persist_directory`, building and persisting it first if it
+    is missing or was built from a different version of the knowledge base
+
+    The LLM is only needed by the index's own LLM-based retriever modes, the
+    `KnowledgeBaseRetriever` used by the tool never calls it.
+    """
+    version = f"{INDEX_FORMAT}:{knowledge_base_version(directory)}"
+    version_file = path.join(persist_directory, VERSION_FILE)
+    if path.exists(version_file):
+        with open(version_file) as f:
+            if f.read() == version:
+                storage_context = StorageContext.from_defaults(
+                    persist_dir=persist_directory
+                )
+                return load_index_from_storage(storage_context, llm=llm)  # type: ignore
+
+    index = build_index(directory, llm)
+    index.storage_context.persist(persist_dir=persist_directory)
+    with open(version_file, "w") as f:
+        f.write(version)
+    return index
+
+
+class KnowledgeBaseRetriever(BaseRetriever):
+    """
+    The `top_k` chunks of the index most relevant to the query, ranked by BM25 over
+    their text and the name of their document, from the term frequencies stored with
+    them
+    """
+
+    def __init__(self, nodes: List[BaseNode], top_k: int = 3):
+        super().__init__()
+        self.nodes = nodes
+        self.bm25 = BM25Index([node.metadata[TERM_FREQUENCIES] for node in nodes])
+        self.top_k = top_k
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return [
+            NodeWithScore(node=self.nodes[i], score=score)
+            for i, score in self.bm25.rank(query_bundle.query_str)[: self.top_k]
+        ]
+
+
+class KnowledgeBaseQueryEngine(CustomQueryEngine):
+    """
+    Returns the retrieved chunks as they are, labelled with their document, so the
+    agent's own LLM reads them without an extra synthesis call
+    """
+
+    retriever: BaseRetriever
+
+    def custom_query(self, query_str: str) -> str:
+        nodes = self.retriever.retrieve(query_str)
+        if not nodes:
+            return "No matching sections found in the knowledge base."
+
+        excerpts: List[str] = []
+        for node in nodes:
+            document = node.metadata.get("file_name", "knowledge base")
+            excerpts.append(f"[{document}]\n{node.get_content()}")
+        return "\n\n".join(excerpts)
+
+
+def create_knowledge_base_tool(index: BaseIndex, top_k: int = 3) -> QueryEngineTool:
+    nodes = list(index.docstore.docs.values())
+    return QueryEngineTool(
+        query_engine=KnowledgeBaseQueryEngine(
+            retriever=KnowledgeBaseRetriever(nodes, top_k=top_k)
+        ),
+        metadata=ToolMetadata(
+            name="search_knowledge_base",
+            description=(
+                "Search the company policy and the internet, mobile, television and "
+                "ecommerce troubleshooting guides, returns the most relevant sections. "
+                "Input is a short description of the customer's issue or question."
+            ),
+        ),
+    )
@@ -0,0 +1,126 @@
+"""
+Async streaming entry point for the LlamaIndex customer support agent.
+
+Instead of awaiting the final result, `astream_agent` yields the workflow events as
+the agent produces them: `AgentStream` token deltas, `ToolCall` when a tool starts,
+`ToolCallResult` when it finishes and `AgentOutput` at the end of every reasoning
+step. After each LLM call and each tool call it also yields a `StepTiming`, and the
+last event is a `RunCompleted` with the final response and all the timings, so it's
+possible to see where the ReAct loop spends its time.
+
+Closing the generator early cancels the run.
+"""
+
+import time
+from typing import AsyncIterator, Dict, List, Literal, Optional, Union
+
+from llama_index.core.agent.workflow import (
+    AgentInput,
+    AgentOutput,
+    AgentStream,
+    BaseWorkflowAgent,
+    ToolCall,
+    ToolCallResult,
+)
+from llama_index.core.workflow import Context, Event
+
+
+class StepTiming(Event):
+    """How long a step of the ReAct loop took, times are ms since the run started"""
+
+    step: Literal["llm", "tool"]
+    name: str
+    started_ms: float
+    duration_ms: float
+    first_token_ms: Optional[float] = None
+
+
+class RunCompleted(Event):
+    response: str
+    output: AgentOutput
+    timings: List[StepTiming]
+    duration_ms: float
+
+
+AgentEvent = Union[
+    AgentStream, AgentOutput, ToolCall, ToolCallResult, StepTiming, RunCompleted
+]
+
+
+async def astream_agent(
+    agent: BaseWorkflowAgent, message: str, ctx: Optional[Context] = None
+) -> AsyncIterator[AgentEvent]:
+    """
+    Run one turn of the agent, streaming its events
+
+    Args:
+        agent: The workflow agent
+        message: The user message
+        ctx: The workflow context of the conversation, keeps the chat history between turns
+
+    Returns:
+        An async iterator of AgentStream, ToolCall, ToolCallResult, AgentOutput and
+        StepTiming events and, last, a RunCompleted event
+    """
+    start = time.perf_counter()
+
+    def elapsed_ms() -> float:
+        return (time.perf_counter() - start) * 1000
+
+    timings: List[StepTiming] = []
+    llm_step = 0
+    llm_started_ms: Optional[float] = None
+    first_token_ms: Optional[float] = None
+    tools_started_ms: Dict[str, float] = {}
+
+    handler = agent.run(message, ctx=ctx)
+    try:
+        async for event in handler.stream_events():
+            now = elapsed_ms()
+            timing: Optional[StepTiming] = None
+
+            if isinstance(event, AgentInput):
+                llm_step += 1
+                llm_started_ms, first_token_ms = now, None
+                continue
+            elif isinstance(event, AgentStream):
+                if first_token_ms is None and llm_started_ms is not None:
+                    first_token_ms = now - llm_started_ms
+            elif isinstance(event, AgentOutput):
+                if llm_started_ms is not None:
+                    timing = StepTiming(
+                        step="llm",
+                        name=f"reasoning step {llm_step}",
+                        started_ms=llm_started_ms,
+                        duration_ms=now - llm_started_ms,
+                        first_token_ms=first_token_ms,
+                    )
+                    llm_started_ms = None
+            elif isinstance(event, ToolCallResult):
+                started_ms = tools_started_ms.pop(event.tool_id, now)
+                timing = StepTiming(
+                    step="tool",
+                    name=event.tool_name,
+                    started_ms=started_ms,
+                    duration_ms=now - started_ms,
+                )
+            elif isinstance(event, ToolCall):
+                tools_started_ms[event.tool_id] = now
+            else:
+                continue
+
+            yield event
+            if timing:
+                timings.append(timing)
+                yield timing
+
+        output: AgentOutput = await handler
+        yield RunCompleted(
+            response=str(output),
+            output=output,
+            timings=timings,
+            duration_ms=elapsed_ms(),
+        )
+    finally:
+        if not handler.done():
+            await handler.cancel_run()
@@ -0,0 +1,79 @@
+import shutil
+
+import pytest
+
+from create_agent_app.common.customer_support import knowledge_base_search
+
+import knowledge_base_index
+from knowledge_base_index import (
+    KNOWLEDGE_BASE_DIRECTORY,
+    create_knowledge_base_tool,
+    load_index,
+)
+
+
+def test_index_is_loaded_from_disk_instead_of_rebuilt(tmp_path, monkeypatch):
+    load_index(str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the index should have been loaded from disk")
+
+    monkeypatch.setattr(knowledge_base_index, "build_index", fail)
+    index = load_index(str(tmp_path))
+
+    assert len(index.docstore.docs) > 0
+
+
+def test_queries_only_tokenize_the_query(tmp_path, monkeypatch):
+    load_index(str(tmp_path))
+    tokenized = []
+    tokenize = knowledge_base_search.tokenize
+    monkeypatch.setattr(
+        knowledge_base_search,
+        "tokenize",
+        lambda text: tokenized.append(text) or tokenize(text),
+    )
+
+    tool = create_knowledge_base_tool(load_index(str(tmp_path)))
+    tool.call("no picture on my TV")
+
+    assert tokenized == ["no picture on my TV"]
+
+
+def test_index_is_rebuilt_when_the_knowledge_base_changes(tmp_path):
+    knowledge_base = tmp_path / "knowledge_base"
+    shutil.copytree(KNOWLEDGE_BASE_DIRECTORY, knowledge_base)
+    persist_directory = str(tmp_path / "storage")
+    load_index(persist_directory, str(knowledge_base))
+
+    (knowledge_base / "troubleshooting_internet.md").write_text(
+        "**Flux Capacitor:** recalibrate the flux capacitor."
+    )
+    tool = create_knowledge_base_tool(
+        load_index(persist_directory, str(knowledge_base))
+    )
+
+    assert "recalibrate the flux capacitor" in str(tool.call("flux capacitor"))
+
+
+@pytest.mark.parametrize(
+    "query, document",
+    [
+        (
+            "I can't connect to the wifi, I forgot the password",
+            "troubleshooting_internet.md",
+        ),
+        ("There is no picture on my TV", "troubleshooting_television.md"),
+        (
+            "The item I received is damaged, how do I return it?",
+            "troubleshooting_ecommerce.md",
+        ),
+    ],
+)
+def test_tool_returns_a_few_relevant_chunks(tmp_path, query, document):
+    tool = create_knowledge_base_tool(load_index(str(tmp_path)), top_k=3)
+
+    output = str(tool.call(query))
+
+    assert output.startswith(f"[{document}]")
+    assert output.count("\n[") <= 2
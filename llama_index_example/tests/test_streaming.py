@@ -0,0 +1,172 @@
+import asyncio
+import time
+from typing import Any, List
+
+import pytest
+from llama_index.core.agent.workflow import AgentStream, ToolCall, ToolCallResult
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.tools import FunctionTool
+from llama_index.core.workflow import Context
+
+from concurrent_react_agent import ConcurrentReActAgent, parse_actions
+from streaming import RunCompleted, StepTiming, astream_agent
+
+TOOL_DELAY = 0.3
+
+
+class ScriptedLLM(CustomLLM):
+    """Streams the scripted responses word by word and records the prompts"""
+
+    responses: List[str]
+    prompts: List[str] = []
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(is_chat_model=False)
+
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        return CompletionResponse(text=self.next_response(prompt))
+
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        response = self.next_response(prompt)
+        text = ""
+        for i, word in enumerate(response.split(" ")):
+            delta = (" " if i else "") + word
+            text += delta
+            yield CompletionResponse(text=text, delta=delta)
+
+    def next_response(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.responses[len(self.prompts) - 1]
+
+
+async def get_order_status(order_id: str) -> str:
+    """Get the status of a specific order"""
+    # Finishes after get_company_policy, although it is the first action
+    await asyncio.sleep(TOOL_DELAY * 2)
+    return f"Order {order_id} was shipped"
+
+
+def get_company_policy() -> str:
+    """Get the company policy"""
+    # Sync tools run in a thread, so they don't block the other tool calls either
+    time.sleep(TOOL_DELAY)
+    return "Refunds take 5 days"
+
+
+TWO_ACTIONS = """Thought: I need the order status and the refund policy.
+Action: get_order_status
+Action Input: {"order_id": "123"}
+Action: get_company_policy
+Action Input: {}"""
+
+ANSWER = "Thought: I can answer without using any more tools.\nAnswer: Shipped, refunds take 5 days."
+
+
+def create_agent(responses: List[str]) -> ConcurrentReActAgent:
+    return ConcurrentReActAgent(
+        name="customer_support_agent",
+        system_prompt="You are a customer support agent.",
+        tools=[
+            FunctionTool.from_defaults(fn=get_order_status),
+            FunctionTool.from_defaults(fn=get_company_policy),
+        ],
+        llm=ScriptedLLM(responses=responses),
+    )
+
+
+async def collect(agent: ConcurrentReActAgent, message: str, ctx=None) -> list:
+    return [event async for event in astream_agent(agent, message, ctx)]
+
+
+def test_parse_actions_returns_every_action_in_order():
+    actions = parse_actions(TWO_ACTIONS, "thought")
+
+    assert [(action.action, action.action_input) for action in actions] == [
+        ("get_order_status", {"order_id": "123"}),
+        ("get_company_policy", {}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streams_tokens_tool_calls_and_final_response():
+    events = await collect(create_agent([TWO_ACTIONS, ANSWER]), "Where is my order?")
+
+    tokens = [event.delta for event in events if isinstance(event, AgentStream)]
+    assert "".join(tokens).endswith("Answer: Shipped, refunds take 5 days.")
+    assert sorted(event.tool_name for event in events if type(event) is ToolCall) == [
+        "get_company_policy",
+        "get_order_status",
+    ]
+    assert isinstance(events[-1], RunCompleted)
+    assert events[-1].response == "Shipped, refunds take 5 days."
+
+
+@pytest.mark.asyncio
+async def test_independent_tool_calls_run_concurrently():
+    events = await collect(create_agent([TWO_ACTIONS, ANSWER]), "Where is my order?")
+
+    tool_timings = [
+        event
+        for event in events
+        if isinstance(event, StepTiming) and event.step == "tool"
+    ]
+    assert sorted(timing.name for timing in tool_timings) == [
+        "get_company_policy",
+        "get_order_status",
+    ]
+    first, second = sorted(tool_timings, key=lambda timing: timing.started_ms)
+    assert second.started_ms < first.started_ms + first.duration_ms
+    assert len([event for event in events if isinstance(event, ToolCallResult)]) == 2
+
+
+@pytest.mark.asyncio
+async def test_observations_follow_the_order_of_the_actions():
+    agent = create_agent([TWO_ACTIONS, ANSWER])
+
+    await collect(agent, "Where is my order?")
+
+    second_prompt = agent.llm.prompts[1]
+    assert second_prompt.index("Order 123 was shipped") < second_prompt.index(
+        "Refunds take 5 days"
+    )
+    assert "one Observation per Action" in agent.llm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_records_the_timing_of_every_step():
+    events = await collect(create_agent([TWO_ACTIONS, ANSWER]), "Where is my order?")
+
+    completed = events[-1]
+    assert [timing.name for timing in completed.timings if timing.step == "llm"] == [
+        "reasoning step 1",
+        "reasoning step 2",
+    ]
+    assert len(completed.timings) == 4
+    for timing in completed.timings:
+        assert 0 <= timing.started_ms
+        assert timing.started_ms + timing.duration_ms <= completed.duration_ms
+    for timing in completed.timings:
+        if timing.step == "llm":
+            assert timing.first_token_ms is not None
+            assert timing.first_token_ms <= timing.duration_ms
+        else:
+            assert timing.duration_ms >= TOOL_DELAY * 1000
+
+
+@pytest.mark.asyncio
+async def test_context_keeps_the_conversation_between_turns():
+    agent = create_agent([ANSWER, ANSWER])
+    ctx = Context(agent)
+
+    await collect(agent, "Where is my order 123?", ctx)
+    await collect(agent, "And when will it arrive?", ctx)
+
+    assert "Where is my order 123?" in agent.llm.prompts[1]
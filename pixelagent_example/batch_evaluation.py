@@ -0,0 +1,247 @@
+"""
+Evaluate the customer support agent over a corpus of customer messages in one pass.
+
+Every message becomes a row of the `customer_support.batch_evaluation` table, and
+Pixeltable computes the responses with the same tools pipeline as `agent.tool_call`
+(a first completion that may request tools, the tool calls, and a final completion
+with the tool results). Requests are spread over at most `--max-concurrent-requests`
+at a time and limited to `--rate-limit` requests per minute. Each row keeps the
+answer, its latency and its token usage, so the results of a run can be queried and
+compared against an earlier run of the same corpus.
+
+Usage:
+    uv run python batch_evaluation.py messages.txt [--run-id baseline] [--max-concurrent-requests 16] [--rate-limit 600]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+import weakref
+from typing import Any, Dict, List, Optional
+
+import openai
+import pixeltable as pxt
+import pixeltable.functions as pxtf
+from pixeltable.functions.openai import invoke_tools
+
+from customer_support_agent import agent
+
+# Requests per minute for the `request-rate:customer_support` resource pool, read by
+# Pixeltable from the CUSTOMER_SUPPORT_RATE_LIMIT environment variable (or the
+# `rate_limit` key of the `customer_support` section of its config file)
+RATE_LIMIT_VARIABLE = "CUSTOMER_SUPPORT_RATE_LIMIT"
+
+MAX_CONCURRENT_REQUESTS = int(os.getenv("CUSTOMER_SUPPORT_MAX_CONCURRENT_REQUESTS", 16))
+
+client: Optional[openai.AsyncOpenAI] = None
+
+# Pixeltable evaluates each insert on a new event loop, so the semaphore that caps
+# the requests in flight is created once per loop
+request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> openai.AsyncOpenAI:
+    global client
+    if client is None:
+        client = openai.AsyncOpenAI()
+    return client
+
+
+def get_request_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in request_slots:
+        request_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return request_slots[loop]
+
+
+@pxt.udf(resource_pool="request-rate:customer_support")
+async def timed_chat_completions(
+    messages: list, model: str, tools: Optional[list] = None
+) -> dict:
+    """
+    Chat completion that also reports how long the request took
+
+    Args:
+        messages: The messages to send to the model
+        model: The model to use
+        tools: Tool definitions, as serialized by `pxt.tools`
+
+    Returns:
+        The completion as `response`, and its latency in milliseconds as `latency_ms`
+    """
+    kwargs: Dict[str, Any] = {}
+    if tools:
+        kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+
+    async with get_request_slots():
+        start = time.perf_counter()
+        response = await get_client().chat.completions.create(
+            messages=messages, model=model, **kwargs
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+
+    return {"response": response.model_dump(), "latency_ms": latency_ms}
+
+
+def create_evaluation_table(
+    name: str = "customer_support.batch_evaluation",
+) -> pxt.Table:
+    """
+    Table that answers every inserted customer message with the agent's tools pipeline
+
+    Rows of every run are kept in the same table, keyed by `run_id`, so runs with
+    different prompts or models can be compared with a query.
+    """
+    pxt.create_dir("customer_support", if_exists="ignore")
+    evaluation = pxt.create_table(
+        name,
+        {"run_id": pxt.String, "message_id": pxt.Int, "message": pxt.String},
+        if_exists="ignore",
+    )
+
+    evaluation.add_computed_column(
+        initial_response=timed_chat_completions(
+            messages=[{"role": "user", "content": evaluation.message}],
+            model=agent.model,
+            tools=agent.tools,
+        ),
+        if_exists="ignore",
+    )
+    evaluation.add_computed_column(
+        tool_output=invoke_tools(agent.tools, evaluation.initial_response.response),
+        if_exists="ignore",
+    )
+    evaluation.add_computed_column(
+        final_response=timed_chat_completions(
+            messages=[
+                {"role": "system", "content": agent.system_prompt},
+                {
+                    "role": "user",
+                    "content": pxtf.string.format(
+                        "{0}: {1}", evaluation.message, evaluation.tool_output
+                    ),
+                },
+            ],
+            model=agent.model,
+        ),
+        if_exists="ignore",
+    )
+    evaluation.add_computed_column(
+        answer=evaluation.final_response.response.choices[0].message.content.astype(
+            pxt.String
+        ),
+        if_exists="ignore",
+    )
+
+    initial_usage = evaluation.initial_response.response.usage
+    final_usage = evaluation.final_response.response.usage
+    evaluation.add_computed_column(
+        latency_ms=evaluation.initial_response.latency_ms.astype(pxt.Float)
+        + evaluation.final_response.latency_ms.astype(pxt.Float),
+        if_exists="ignore",
+    )
+    evaluation.add_computed_column(
+        prompt_tokens=initial_usage.prompt_tokens.astype(pxt.Int)
+        + final_usage.prompt_tokens.astype(pxt.Int),
+        if_exists="ignore",
+    )
+    evaluation.add_computed_column(
+        completion_tokens=initial_usage.completion_tokens.astype(pxt.Int)
+        + final_usage.completion_tokens.astype(pxt.Int),
+        if_exists="ignore",
+    )
+    return evaluation
+
+
+def run_evaluation(
+    messages: List[str],
+    run_id: Optional[str] = None,
+    evaluation: Optional[pxt.Table] = None,
+) -> Dict[str, Any]:
+    """
+    Insert the messages as one run and wait for Pixeltable to answer all of them
+
+    Rows whose requests fail are kept with the error instead of failing the run.
+
+    Args:
+        messages: The customer messages to answer
+        run_id: Identifier of the run, generated if not given
+        evaluation: The table to insert into, `customer_support.batch_evaluation` by default
+
+    Returns:
+        Summary of the run: latency percentiles, token totals and errors
+    """
+    run_id = run_id or uuid.uuid4().hex[:8]
+    evaluation = evaluation or create_evaluation_table()
+
+    start = time.perf_counter()
+    status = evaluation.insert(
+        [
+            {"run_id": run_id, "message_id": i, "message": message}
+            for i, message in enumerate(messages)
+        ],
+        on_error="ignore",
+    )
+    elapsed = time.perf_counter() - start
+
+    results = (
+        evaluation.where(evaluation.run_id == run_id)
+        .select(
+            evaluation.latency_ms,
+            evaluation.prompt_tokens,
+            evaluation.completion_tokens,
+        )
+        .collect()
+    )
+    latencies = sorted(
+        latency for latency in results["latency_ms"] if latency is not None
+    )
+
+    def percentile(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    return {
+        "run_id": run_id,
+        "messages": len(messages),
+        "errors": status.num_excs,
+        "messages_per_second": len(messages) / elapsed,
+        "p50_latency_ms": percentile(0.5),
+        "p95_latency_ms": percentile(0.95),
+        "prompt_tokens": sum(t for t in results["prompt_tokens"] if t is not None),
+        "completion_tokens": sum(
+            t for t in results["completion_tokens"] if t is not None
+        ),
+    }
+
+
+def main() -> None:
+    global MAX_CONCURRENT_REQUESTS
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("messages", help="File with one customer message per line")
+    parser.add_argument("--run-id")
+    parser.add_argument(
+        "--max-concurrent-requests", type=int, default=MAX_CONCURRENT_REQUESTS
+    )
+    parser.add_argument("--rate-limit", type=int, help="Requests per minute")
+    args = parser.parse_args()
+
+    MAX_CONCURRENT_REQUESTS = args.max_concurrent_requests
+    if args.rate_limit:
+        os.environ[RATE_LIMIT_VARIABLE] = str(args.rate_limit)
+
+    with open(args.messages) as f:
+        messages = [line.strip() for line in f if line.strip()]
+
+    print(json.dumps(run_evaluation(messages, args.run_id)))
+
+
+if __name__ == "__main__":
+    main()
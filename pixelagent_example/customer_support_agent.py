@@ -1,8 +1,12 @@
+import hashlib
+import os
+from os import path
 from typing import List, Literal
 
 import pixeltable as pxt
 from pixelagent.openai import Agent
 
+from create_agent_app.common.customer_support import mocked_apis
 from create_agent_app.common.customer_support.mocked_apis import (
     DocumentResponse,
     OrderSummaryResponse,
@@ -23,15 +27,104 @@ def get_order_status(order_id: str) -> OrderStatusResponse:
     """Get the status of a specific order"""
     return http_GET_order_status(order_id)
 
-@pxt.udf
-def get_company_policy() -> DocumentResponse:
-    """Get the company policy"""
-    return http_GET_company_policy()
+KNOWLEDGE_BASE_DIRECTORY = path.join(
+    path.dirname(mocked_apis.__file__), "knowledge_base"
+)
+DOCUMENT_IDS = [
+    "company_policy",
+    "troubleshooting_internet",
+    "troubleshooting_mobile",
+    "troubleshooting_television",
+    "troubleshooting_ecommerce",
+]
+
+def knowledge_base_version() -> str:
+    """Hash of the knowledge base documents, changes whenever any of them changes"""
+    digest = hashlib.sha256()
+    for document_id in DOCUMENT_IDS:
+        with open(path.join(KNOWLEDGE_BASE_DIRECTORY, f"{document_id}.md"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# Set KNOWLEDGE_BASE_VERSION to pin the version, or to force a refresh when the
+# documents come from somewhere else than the local files
+KNOWLEDGE_BASE_VERSION = os.getenv("KNOWLEDGE_BASE_VERSION") or knowledge_base_version()
 
 @pxt.udf
-def get_troubleshooting_guide(guide: Literal["internet", "mobile", "television", "ecommerce"]) -> DocumentResponse:
-    """Get the troubleshooting guide"""
-    return http_GET_troubleshooting_guide(guide)
+def fetch_document(document_id: str) -> DocumentResponse:
+    """Fetch a knowledge base document from the API"""
+    if document_id == "company_policy":
+        return http_GET_company_policy()
+    return http_GET_troubleshooting_guide(document_id.removeprefix("troubleshooting_"))  # type: ignore
+
+def load_knowledge_base(version: str = KNOWLEDGE_BASE_VERSION) -> pxt.Table:
+    """
+    Table of the deterministic tool results, the company policy and troubleshooting
+    guides, one row per document and version
+
+    The `document` computed column calls the API once when a row is inserted and stores
+    the result, so the tools read it from the table instead of calling the API on every
+    tool call, across runs and processes. A new version is fetched again, next to the
+    rows of the other versions, which processes still running them keep reading until
+    `prune_knowledge_base` deletes them.
+    """
+    pxt.create_dir("customer_support", if_exists="ignore")
+    knowledge_base = pxt.create_table(
+        "customer_support.knowledge_base",
+        {"document_id": pxt.String, "version": pxt.String},
+        if_exists="ignore",
+    )
+    knowledge_base.add_computed_column(
+        document=fetch_document(knowledge_base.document_id), if_exists="ignore"
+    )
+
+    cached_document_ids = set(
+        knowledge_base.where(knowledge_base.version == version)
+        .select(knowledge_base.document_id)
+        .collect()["document_id"]
+    )
+    missing_document_ids = [
+        document_id for document_id in DOCUMENT_IDS if document_id not in cached_document_ids
+    ]
+    if missing_document_ids:
+        knowledge_base.insert(
+            [
+                {"document_id": document_id, "version": version}
+                for document_id in missing_document_ids
+            ]
+        )
+    return knowledge_base
+
+def prune_knowledge_base(version: str = KNOWLEDGE_BASE_VERSION) -> int:
+    """
+    Delete the knowledge base rows of every version but `version`, once no process
+    runs them anymore, e.g. after a deploy
+
+    Returns:
+        The number of rows deleted
+    """
+    knowledge_base = pxt.get_table("customer_support.knowledge_base")
+    return knowledge_base.delete(knowledge_base.version != version).num_rows
+
+knowledge_base = load_knowledge_base()
+
+@pxt.query
+def get_company_policy():
+    """Get the company policy"""
+    return knowledge_base.where(
+        (knowledge_base.document_id == "company_policy")
+        & (knowledge_base.version == KNOWLEDGE_BASE_VERSION)
+    ).select(knowledge_base.document)
+
+@pxt.query
+def get_troubleshooting_guide(guide: Literal["internet", "mobile", "television", "ecommerce"]):
+    """Get the troubleshooting guide for internet, mobile, television or ecommerce"""
+    # Pixeltable passes the guide as a plain string, an unknown guide matches no
+    # document and returns no rows instead of calling the API
+    return knowledge_base.where(
+        (knowledge_base.document_id == "troubleshooting_" + guide)
+        & (knowledge_base.version == KNOWLEDGE_BASE_VERSION)
+    ).select(knowledge_base.document)
 
 # Create agent with proper state management
 agent = Agent(
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+import pixeltable as pxt
+from openai.types.chat import ChatCompletion
+
+import batch_evaluation
+from batch_evaluation import create_evaluation_table, run_evaluation
+
+
+class StubClient:
+    """Requests the company policy for every message, then answers with a fixed text"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages: list, model: str, tools=None) -> ChatCompletion:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+        message = {"role": "assistant", "content": "Here is our policy."}
+        if tools:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "get_company_policy", "arguments": "{}"},
+                    }
+                ],
+            }
+        return ChatCompletion.model_validate(
+            {
+                "id": "stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": message}
+                ],
+                "usage": {
+                    "prompt_tokens": 100,
+                    "completion_tokens": 10,
+                    "total_tokens": 110,
+                },
+            }
+        )
+
+
+def test_batch_evaluation_collects_answers_latency_and_tokens(monkeypatch):
+    stub_client = StubClient(latency=0.05)
+    monkeypatch.setattr(batch_evaluation, "client", stub_client)
+    monkeypatch.setattr(batch_evaluation, "MAX_CONCURRENT_REQUESTS", 4)
+    monkeypatch.setenv(batch_evaluation.RATE_LIMIT_VARIABLE, "60000")
+
+    evaluation = create_evaluation_table("customer_support.test_batch_evaluation")
+    try:
+        summary = run_evaluation(
+            [f"What is your refund policy? ({i})" for i in range(20)],
+            run_id="test",
+            evaluation=evaluation,
+        )
+        rows = evaluation.select(
+            evaluation.answer,
+            evaluation.tool_output,
+            evaluation.latency_ms,
+            evaluation.prompt_tokens,
+        ).collect()
+    finally:
+        pxt.drop_table("customer_support.test_batch_evaluation")
+
+    assert summary["errors"] == 0
+    assert summary["prompt_tokens"] == 20 * 200
+    assert summary["completion_tokens"] == 20 * 20
+    assert 0 < stub_client.max_in_flight <= 4
+
+    assert set(rows["answer"]) == {"Here is our policy."}
+    assert all(latency >= 100 for latency in rows["latency_ms"])
+    policy = rows["tool_output"][0]["get_company_policy"][0][0]["document"]
+    assert policy["document_id"] == "company_policy"
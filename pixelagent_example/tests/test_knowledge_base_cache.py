@@ -0,0 +1,99 @@
+import pixeltable as pxt
+from pixeltable.functions.openai import invoke_tools
+
+import customer_support_agent
+from customer_support_agent import (
+    DOCUMENT_IDS,
+    KNOWLEDGE_BASE_VERSION,
+    agent,
+    get_troubleshooting_guide,
+    load_knowledge_base,
+    prune_knowledge_base,
+)
+
+
+def count_api_calls(monkeypatch) -> list:
+    calls = []
+    monkeypatch.setattr(
+        customer_support_agent,
+        "http_GET_company_policy",
+        lambda: calls.append("company_policy") or {"document_content": "policy"},
+    )
+    monkeypatch.setattr(
+        customer_support_agent,
+        "http_GET_troubleshooting_guide",
+        lambda guide: calls.append(guide) or {"document_content": guide},
+    )
+    return calls
+
+
+def test_tools_read_documents_from_the_table(monkeypatch):
+    calls = count_api_calls(monkeypatch)
+    tool_calls = pxt.create_table(
+        "customer_support.test_tool_calls", {"response": pxt.Json}, if_exists="replace"
+    )
+    tool_calls.add_computed_column(
+        output=invoke_tools(agent.tools, tool_calls.response)
+    )
+
+    response = {
+        "choices": [
+            {
+                "message": {
+                    "tool_calls": [
+                        {
+                            "function": {
+                                "name": "get_troubleshooting_guide",
+                                "arguments": '{"guide": "internet"}',
+                            }
+                        },
+                        {"function": {"name": "get_company_policy", "arguments": "{}"}},
+                    ]
+                }
+            }
+        ]
+    }
+    tool_calls.insert([{"response": response}] * 10)
+    outputs = tool_calls.select(tool_calls.output).collect()["output"]
+    pxt.drop_table("customer_support.test_tool_calls")
+
+    assert calls == []
+    guide = outputs[0]["get_troubleshooting_guide"][0][0]["document"]
+    assert guide["document_id"] == "troubleshooting_internet"
+    policy = outputs[9]["get_company_policy"][0][0]["document"]
+    assert policy["document_id"] == "company_policy"
+
+
+def test_new_version_fetches_documents_again(monkeypatch):
+    calls = count_api_calls(monkeypatch)
+
+    try:
+        knowledge_base = load_knowledge_base("test-version")
+        load_knowledge_base("test-version")
+
+        assert len(calls) == len(DOCUMENT_IDS)
+        # The current version is kept for the processes still running it
+        versions = knowledge_base.select(knowledge_base.version).collect()["version"]
+        assert set(versions) == {"test-version", KNOWLEDGE_BASE_VERSION}
+    finally:
+        deleted = prune_knowledge_base(KNOWLEDGE_BASE_VERSION)
+
+    assert deleted == len(DOCUMENT_IDS)
+    versions = knowledge_base.select(knowledge_base.version).collect()["version"]
+    assert set(versions) == {KNOWLEDGE_BASE_VERSION}
+
+
+def test_unknown_guide_returns_nothing(monkeypatch):
+    calls = count_api_calls(monkeypatch)
+    guides = pxt.create_table(
+        "customer_support.test_guides", {"guide": pxt.String}, if_exists="replace"
+    )
+    guides.add_computed_column(document=get_troubleshooting_guide(guides.guide))
+
+    guides.insert([{"guide": "internet"}, {"guide": "../company_policy"}])
+    documents = guides.select(guides.document).collect()["document"]
+    pxt.drop_table("customer_support.test_guides")
+
+    assert calls == []
+    assert len(documents[0]) == 1
+    assert documents[1] == []
@@ -0,0 +1,174 @@
+"""
+Measure the tracing overhead per interaction with exporting on, sampled and off.
+
+Runs the same interactions through `run_agent_interaction` with every trace
+exported (sample rate 1), with a fraction of them sampled and with tracing off
+(sample rate 0), against a `LocalCollector` that takes `--collector-latency`
+seconds to answer each export like a remote collector would. The model answers
+instantly, so the latency is the agent and tracing overhead only.
+
+Every mode runs in its own process, since the tracer provider is global. For each
+mode prints the latency per interaction, its overhead against tracing off, the
+spans ended, exported and dropped, and the export requests made. The queue and
+batch settings are taken from the environment, see tracing.py, e.g. a small
+STRANDS_TRACE_MAX_QUEUE_SIZE shows spans being dropped instead of slowing requests.
+
+Usage:
+    uv run python benchmark_tracing.py [--requests 2000] [--concurrency 50] [--sample-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Type
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+from pydantic import BaseModel
+from strands.models import Model
+
+from local_collector import LocalCollector
+from session_pool import SessionPool
+
+
+class InstantModel(Model):
+    """Answers every message at once"""
+
+    def update_config(self, **model_config: Any) -> None:
+        pass
+
+    def get_config(self) -> Any:
+        return {}
+
+    async def structured_output(
+        self, output_model: Type[BaseModel], *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        # Without validation, so any output model gets an instance of its defaults
+        yield {"output": output_model.model_construct()}
+
+    async def stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": "How can I help?"}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+class EndedSpans(SpanProcessor):
+    """Counts the spans ended, exported or not"""
+
+    def __init__(self):
+        self.count = 0
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self.count += 1
+
+
+async def run_interactions(requests: int, concurrency: int) -> None:
+    # Imported here, the import sets up the global tracer provider of the mode
+    import customer_support_agent
+
+    model = InstantModel()
+    customer_support_agent.session_pool = SessionPool(
+        lambda session_id: customer_support_agent.create_agent(session_id, model=model)
+    )
+
+    ended_spans = EndedSpans()
+    customer_support_agent.tracer_provider.add_span_processor(ended_spans)
+
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def interaction(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await customer_support_agent.run_agent_interaction(
+                "Hi", user_id=f"user-{i}", session_id=f"session-{i % concurrency}"
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(interaction(i) for i in range(requests)))
+    customer_support_agent.tracer_provider.shutdown()
+    print(json.dumps({"latencies_ms": latencies, "spans_ended": ended_spans.count}))
+
+
+def run_mode(
+    mode: str, sample_rate: float, collector: LocalCollector, args: argparse.Namespace
+) -> Dict[str, Any]:
+    spans_before, requests_before = collector.spans, collector.requests
+    env = {
+        **os.environ,
+        "STRANDS_TRACE_SAMPLE_RATE": str(sample_rate),
+        "STRANDS_TRACE_ENDPOINT": collector.endpoint,
+        "STRANDS_TRACE_SCHEDULE_DELAY_MS": "200",
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "sk-benchmark"),
+        "LANGWATCH_API_KEY": os.getenv("LANGWATCH_API_KEY", "benchmark"),
+    }
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            "--requests",
+            str(args.requests),
+            "--concurrency",
+            str(args.concurrency),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    latencies = sorted(result["latencies_ms"])
+    spans_exported = collector.spans - spans_before
+    return {
+        "mode": mode,
+        "sample_rate": sample_rate,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95)],
+        "spans_ended": result["spans_ended"],
+        "spans_exported": spans_exported,
+        "spans_dropped": result["spans_ended"] - spans_exported,
+        "export_requests": collector.requests - requests_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--collector-latency", type=float, default=0.05)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(run_interactions(args.requests, args.concurrency))
+        return
+
+    with LocalCollector(latency=args.collector_latency) as collector:
+        results = [
+            run_mode(mode, sample_rate, collector, args)
+            for mode, sample_rate in (
+                ("off", 0.0),
+                ("sampled", args.sample_rate),
+                ("on", 1.0),
+            )
+        ]
+
+    off_mean_ms = results[0]["mean_ms"]
+    for result in results:
+        result["overhead_ms"] = result["mean_ms"] - off_mean_ms
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,25 +3,24 @@
 # - https://docs.strand.ai/
 # - https://docs.langwatch.ai/integration/python/integrations/strand-agents
 
+import asyncio
 import os
-from typing import List, Literal, Dict, Any
+from typing import Any, AsyncIterator, Dict, Optional
+from weakref import WeakKeyDictionary
 import dotenv
 
 dotenv.load_dotenv()
 
-from create_agent_app.common.customer_support.mocked_apis import (
-    DocumentResponse,
-    OrderSummaryResponse,
-    OrderStatusResponse,
-    http_GET_company_policy,
-    http_GET_customer_order_history,
-    http_GET_order_status,
-    http_GET_troubleshooting_guide,
-)
-from strands import Agent, tool
-from strands.telemetry import StrandsTelemetry
+from create_agent_app.common.customer_support.tools import SYSTEM_PROMPT, get_tools
+from strands import Agent
+from strands.agent import AgentResult, SlidingWindowConversationManager
+from strands.models import Model
 from strands.models.openai import OpenAIModel
-import langwatch
+from opentelemetry import trace
+import openai
+
+from session_pool import SessionPool
+from tracing import interaction_attributes, setup_tracing
 
 # Load environment variables from .env file in the root directory
 dotenv.load_dotenv()
@@ -32,209 +31,140 @@ if not os.getenv("LANGWATCH_API_KEY"):
 if not os.getenv("OPENAI_API_KEY"):
     os.environ["OPENAI_API_KEY"] = "your-openai-api-key"
 
-# Initialize LangWatch
-langwatch.setup()
-
-# Configure the telemetry with LangWatch endpoint
-strands_telemetry = StrandsTelemetry().setup_otlp_exporter(
-    endpoint="https://api.langwatch.ai/v1/otel",
-    headers={"Authorization": f"Bearer {os.environ['LANGWATCH_API_KEY']}"},
-)
-
-SYSTEM_PROMPT = """
-<Introduction>
-You are an AI customer service agent for XPTO Telecom, a telecommunications company providing internet, mobile, and television services, as well as selling mobile devices and related electronics. Your primary goal is to assist customers with their inquiries efficiently and effectively. You should always strive to provide helpful, accurate, and polite responses.
-
-Your core principles for interacting with users are:
-
-*   **Customer-centricity:** Every interaction should be focused on meeting the customer's needs and resolving their issues.
-*   **Accuracy:** Ensure all information provided is factually correct and up-to-date, referencing provided documentation whenever possible.
-*   **Efficiency:** Aim to resolve customer issues quickly and effectively, minimizing the need for escalation.
-*   **Professionalism:** Maintain a courteous and professional tone throughout the conversation.
-*   **Empathy:** Acknowledge the customer's frustration and show understanding when appropriate.
-</Introduction>
-
-<Workflow>
-Follow these steps to effectively assist customers:
-
-1.  **Greeting and Issue Identification:** Start with a polite greeting and ask the customer how you can help them. Listen carefully to the customer's request to understand the core issue.
-2.  **Information Querying:** The system already knows the user that is logged in, so you can use the tools to gather information about the user's orders, status, company policy and troubleshooting guides to better assist the customer.
-3.  **Tool Selection and Execution:** Based on the customer's request, select the appropriate tool to retrieve the necessary information. Execute the tool.
-4.  **Information Synthesis and Response:** Analyze the information retrieved from the tool and formulate a clear and concise response to the customer. Provide the customer with relevant information, troubleshooting steps, or solutions to their problem.
-5.  **Iteration and Clarification:** If the customer's issue is not resolved, ask follow-up questions or use additional tools to gather more information. Iterate through the steps as needed.
-6.  **Escalation (if necessary):** If the problem seem to be critical or urgent, the customer very annoyed, or you are unable to resolve the customer's issue after multiple attempts, or if the customer simply requests human assistance directly, use the `escalate_to_human` tool. Briefly summarize the issue and steps taken so far for the human agent.
-7.  **Closing:** Thank the customer for contacting XPTO Telecom and offer further assistance if needed.
-
-</Workflow>
-
-<Guidelines>
-*   **Be Direct:** Answer the questions, do not make assumptions of what the user is asking for
-*   **Answering questions about costs:** You can only answer questions about the costs of any service if the user asks you about an order in the order history, since you do not have access to prices to provide new offers to the customer
-*   **Use the Right Tool:** Pick ONLY the correct and appropriate tool, the description of the tool will help you with it
-*   **Use the right parameter to the tool:** if the user provides information that can be used as parameters, use the right information as the correct parameter
-*   **Never fabricate information:** Always get the real information based on the tools available
-*   **Always format the information** Provide to the user in an easy to read format, with markdown
-*   **You can use Markdown,** always use markdown lists, and headers to better organize and present the information to the user
-*   **Do not ask for personal information:** You should not ask for personal information, that is considered PII, avoid asking for address, name, phone numbers, credit cards and so on
-*   **You are not an assistant to write emails or letters:** Avoid creating any type of document. Just help the user with the options available to you
-
-*   **Specific Instructions**
-    *   When asked for the company policy, explain using the original text, to avoid misunderstandings
-    *   When a user presents a technical issue related to any service, use the troubleshooting_guide
-    *   When needing to return an product, first check the company policy for refunds, and explain the refund to the user in simple terms based on the policy
-    *   DO NOT ASK FOR THE ORDER ID, use the tools to check the customer's orders yourself and better help the user giving a summary of the latest order(s) instead of asking for the order id right away
-
-</Guidelines>
+# Configure the telemetry with LangWatch endpoint, spans are exported in batches from
+# a background thread, see tracing.py for the sampling and queue settings
+tracer_provider = setup_tracing()
+tracer = trace.get_tracer(__name__)
 
-<Tone>
-Maintain a friendly, helpful, and professional tone. Use clear and concise language that is easy for customers to understand. Avoid using technical jargon or slang.
 
-Example:
+# Number of messages of a session sent to the model, older ones slide out of the
+# window so long conversations don't grow the prompt without bound
+CONVERSATION_WINDOW_SIZE = int(os.getenv("STRANDS_CONVERSATION_WINDOW_SIZE", "20"))
 
-*   **Good:** "Hello! I'm happy to help you with your XPTO Telecom service today. What can I assist you with?"
-*   **Bad:** "Yo, what's up? You got problems with your XPTO? Lemme see what I can do."
-
-</Tone>
-
-<Info>
-Today is 2025-04-19
-</Info>
-"""
-
-
-@tool
-def get_customer_order_history() -> List[OrderSummaryResponse]:
-    """
-    Get the current customer order history
-
-    Returns:
-        The customer order history
-    """
-    return http_GET_customer_order_history()
+# One OpenAI model per event loop, see `get_model`
+models: "WeakKeyDictionary[asyncio.AbstractEventLoop, OpenAIModel]" = (
+    WeakKeyDictionary()
+)
 
 
-@tool
-def get_order_status(order_id: str) -> OrderStatusResponse:
+def get_model() -> OpenAIModel:
     """
-    Get the status of a specific order
-
-    Args:
-        order_id: The ID of the order to get the status of
+    The OpenAI model of the running event loop, shared by every agent on it
 
-    Returns:
-        The status of the order
+    Given only `client_args`, Strands builds a new OpenAI client for every model call,
+    which blocks the event loop for tens of milliseconds and opens a new connection
+    each time. The model is given one client instead, with its connection pool, and
+    since a client must not be shared across event loops there is one per loop.
     """
-    return http_GET_order_status(order_id)
-
-
-@tool
-def get_company_policy() -> DocumentResponse:
+    loop = asyncio.get_running_loop()
+    if loop not in models:
+        models[loop] = OpenAIModel(
+            client=openai.AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"]),
+            model_id="gpt-4o",
+            params={"max_tokens": 1000, "temperature": 0.7},
+        )
+    return models[loop]
+
+
+def create_agent(
+    session_id: Optional[str] = None,
+    model: Optional[Model] = None,
+    window_size: int = CONVERSATION_WINDOW_SIZE,
+) -> Agent:
     """
-    Get the company policy
+    Create the Strand AI agent of a session, with LangWatch tracing attributes
 
-    Returns:
-        The company policy document
+    The agent keeps the conversation of the session, so it must not be shared
+    between sessions. Without a `model`, it uses the OpenAI model of the running
+    event loop.
     """
-    return http_GET_company_policy()
+    trace_attributes = {
+        "agent_name": "customer_support_agent",
+        "model": "gpt-4o",
+        "service": "xpto_telecom",
+        "environment": "production",
+    }
+    if session_id:
+        trace_attributes["session.id"] = session_id
+
+    return Agent(
+        model=model or get_model(),
+        system_prompt=SYSTEM_PROMPT,
+        tools=get_tools("strands"),
+        conversation_manager=SlidingWindowConversationManager(window_size=window_size),
+        # Events are streamed to the caller, don't also print them to stdout
+        callback_handler=None,
+        trace_attributes=trace_attributes,
+    )
 
 
-@tool
-def get_troubleshooting_guide(
-    guide: Literal["internet", "mobile", "television", "ecommerce"],
-) -> DocumentResponse:
-    """
-    Get the troubleshooting guide
+session_pool = SessionPool(
+    create_agent,
+    max_sessions=int(os.getenv("STRANDS_MAX_SESSIONS", "1000")),
+    idle_timeout=float(os.getenv("STRANDS_SESSION_IDLE_TIMEOUT", str(30 * 60))),
+)
 
-    Args:
-        guide: The guide to get the troubleshooting guide for, one of "internet", "mobile", "television", "ecommerce"
 
-    Returns:
-        The troubleshooting guide document
+async def stream_agent_interaction(
+    user_message: str, session_id: str | None = None
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    return http_GET_troubleshooting_guide(guide)
+    Run the customer support agent of the session, streaming its events
 
+    Messages of the same session run one after the other on the session's agent,
+    different sessions run concurrently. Without a session id the message runs on
+    a new agent, without history.
 
-@tool
-def escalate_to_human() -> Dict[str, str]:
-    """
-    Escalate to human, retrieves a link for the customer to open a ticket with the support team
+    Args:
+        user_message: The user's message
+        session_id: Optional session ID, to continue the conversation
 
     Returns:
-        A link for the customer to open a ticket with the support team
+        An async iterator of the Strands agent events, the last one has the result
     """
-    return {
-        "url": "https://support.xpto.com/tickets",
-        "type": "escalation",
-    }
+    if session_id is None:
+        async for event in create_agent().stream_async(user_message):
+            yield event
+        return
 
+    async with session_pool.session(session_id) as agent:
+        async for event in agent.stream_async(user_message):
+            yield event
 
-# Create OpenAI model
-model = OpenAIModel(
-    client_args={"api_key": os.environ["OPENAI_API_KEY"]},
-    model_id="gpt-4o",
-    params={"max_tokens": 1000, "temperature": 0.7},
-)
 
-# Create the Strand AI agent with LangWatch tracing attributes
-agent = Agent(
-    model=model,
-    system_prompt=SYSTEM_PROMPT,
-    tools=[
-        get_customer_order_history,
-        get_order_status,
-        get_company_policy,
-        get_troubleshooting_guide,
-        escalate_to_human,
-    ],
-    trace_attributes={
-        "agent_name": "customer_support_agent",
-        "model": "gpt-4o",
-        "service": "xpto_telecom",
-        "environment": "production",
-    },
-)
-
-
-@langwatch.trace(name="Customer Support Agent Interaction")
-def run_agent_interaction(
+async def run_agent_interaction(
     user_message: str, user_id: str | None = None, session_id: str | None = None
-):
+) -> AgentResult:
     """
     Run the customer support agent with LangWatch tracing
 
     Args:
         user_message: The user's message
         user_id: Optional user ID for tracing
-        session_id: Optional session ID for tracing
+        session_id: Optional session ID, to continue the conversation
 
     Returns:
         The agent's response
     """
-    # Update the current trace with additional metadata
-    current_trace = langwatch.get_current_trace()
-    if current_trace:
-        metadata = {
-            "agent_name": "customer_support_agent",
-            "model": "gpt-4o",
-            "service": "xpto_telecom",
-        }
-
-        if user_id:
-            metadata["user_id"] = user_id
-        if session_id:
-            metadata["session_id"] = session_id
-
-        current_trace.update(metadata=metadata)
+    with tracer.start_as_current_span("Customer Support Agent Interaction") as span:
+        # Only sampled interactions pay for their trace metadata
+        if span.is_recording():
+            span.set_attributes(interaction_attributes(user_id, session_id))
 
-    response = agent(user_message)
-    return response
+        result = None
+        async for event in stream_agent_interaction(user_message, session_id):
+            if "result" in event:
+                result = event["result"]
+        return result
 
 
 # Example usage
 if __name__ == "__main__":
     user_prompt = "Hi, I need help with my internet connection. It's been slow for the past few days."
-    response = run_agent_interaction(
-        user_prompt, user_id="customer_123", session_id="session_456"
+    response = asyncio.run(
+        run_agent_interaction(
+            user_prompt, user_id="customer_123", session_id="session_456"
+        )
     )
     print(f"User: {user_prompt}")
     print(f"Agent: {response}")
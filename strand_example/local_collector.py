@@ -0,0 +1,113 @@
+"""
+Local stand-in for the LangWatch OTLP collector, to measure tracing without a network.
+
+Accepts OTLP/HTTP protobuf trace exports on any path, counts the requests and the
+spans they carry, and can wait `latency` seconds before answering each export to
+behave like a remote collector.
+
+Usage:
+    uv run python local_collector.py [--port 4318] [--latency 0.05]
+
+Then point the agent at it with STRANDS_TRACE_ENDPOINT=http://localhost:4318/v1/traces
+"""
+
+import argparse
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+    ExportTraceServiceRequest,
+    ExportTraceServiceResponse,
+)
+
+
+class LocalCollector:
+    """
+    OTLP/HTTP trace collector running in a background thread
+
+    Args:
+        port: Port to listen on, 0 picks a free one
+        latency: Seconds to wait before answering each export request
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.spans = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1/traces"
+
+    def start(self) -> "LocalCollector":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "LocalCollector":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _handler(self):
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                export = ExportTraceServiceRequest.FromString(body)
+                spans = sum(
+                    len(scope_spans.spans)
+                    for resource_spans in export.resource_spans
+                    for scope_spans in resource_spans.scope_spans
+                )
+
+                if collector.latency:
+                    time.sleep(collector.latency)
+                with collector.lock:
+                    collector.requests += 1
+                    collector.spans += spans
+
+                response = ExportTraceServiceResponse().SerializeToString()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-protobuf")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with LocalCollector(args.port, args.latency) as collector:
+        print(f"Collecting traces at {collector.endpoint}")
+        try:
+            while True:
+                time.sleep(5)
+                print(f"{collector.requests} export requests, {collector.spans} spans")
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
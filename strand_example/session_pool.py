@@ -0,0 +1,137 @@
+"""
+Pool of Strands agents, one per conversation session.
+
+A Strands `Agent` keeps the conversation in `agent.messages` and refuses to be
+invoked again while a run is in progress, so a single global agent mixes the
+histories of every customer and serializes their requests. The pool gives each
+session its own agent, created on the first message of the session, and runs
+the messages of a session one after the other while different sessions run
+concurrently.
+
+Sessions that are idle for longer than `idle_timeout` are evicted, as well as the
+least recently used ones once there are more than `max_sessions`, so the pool
+does not grow with every conversation ever seen.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+from strands import Agent
+
+
+@dataclass
+class PooledSession:
+    agent: Agent
+    last_used: float
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Runs waiting for or holding the lock, sessions in use are never evicted
+    active_runs: int = 0
+
+
+class SessionPool:
+    """
+    Keeps one agent per session, evicting idle and least recently used sessions
+
+    Args:
+        create_agent: Creates the agent of a new session, given the session id
+        max_sessions: How many sessions to keep, the least recently used ones that
+            are not running are evicted above it
+        idle_timeout: Seconds since the last run after which a session is evicted,
+            None to only evict above `max_sessions`
+        clock: Monotonic clock in seconds, for tests
+    """
+
+    def __init__(
+        self,
+        create_agent: Callable[[str], Agent],
+        max_sessions: int = 1000,
+        idle_timeout: Optional[float] = 30 * 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.create_agent = create_agent
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        # Ordered from least to most recently used
+        self.sessions: "OrderedDict[str, PooledSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    @asynccontextmanager
+    async def session(self, session_id: str) -> AsyncIterator[Agent]:
+        """
+        Use the agent of a session, waiting for the session's previous run to finish
+
+        Args:
+            session_id: The conversation session id
+
+        Returns:
+            An async context manager with the agent of the session
+        """
+        pooled = self._get_or_create(session_id)
+        pooled.active_runs += 1
+        try:
+            async with pooled.lock:
+                yield pooled.agent
+        finally:
+            pooled.active_runs -= 1
+            pooled.last_used = self.clock()
+            if self.sessions.get(session_id) is pooled:
+                self.sessions.move_to_end(session_id)
+
+    def evict_idle(self) -> int:
+        """
+        Evict the sessions that were not used for longer than `idle_timeout`
+
+        Returns:
+            The number of sessions evicted
+        """
+        if self.idle_timeout is None:
+            return 0
+
+        deadline = self.clock() - self.idle_timeout
+        evicted = 0
+        for session_id, pooled in list(self.sessions.items()):
+            if pooled.active_runs:
+                continue
+            if pooled.last_used > deadline:
+                break
+            del self.sessions[session_id]
+            evicted += 1
+        return evicted
+
+    def remove(self, session_id: str) -> None:
+        """Forget a session, its next message starts a new conversation"""
+        self.sessions.pop(session_id, None)
+
+    def _get_or_create(self, session_id: str) -> PooledSession:
+        self.evict_idle()
+
+        pooled = self.sessions.get(session_id)
+        if pooled is None:
+            pooled = PooledSession(
+                agent=self.create_agent(session_id), last_used=self.clock()
+            )
+            self.sessions[session_id] = pooled
+            self._evict_least_recently_used(keep=session_id)
+        else:
+            pooled.last_used = self.clock()
+        self.sessions.move_to_end(session_id)
+        return pooled
+
+    def _evict_least_recently_used(self, keep: str) -> None:
+        overflow = len(self.sessions) - self.max_sessions
+        for session_id, pooled in list(self.sessions.items()):
+            if overflow <= 0:
+                break
+            if session_id != keep and not pooled.active_runs:
+                del self.sessions[session_id]
+                overflow -= 1
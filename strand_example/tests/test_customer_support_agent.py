@@ -3,7 +3,7 @@ import pytest
 import langwatch
 
 import scenario
-from customer_support_agent import agent
+from customer_support_agent import run_agent_interaction
 
 langwatch.setup()
 
@@ -14,15 +14,14 @@ scenario.configure(
 
 
 class AgentAdapter(scenario.AgentAdapter):
-    def __init__(self):
-        self.agent = agent
-
     async def call(self, input: scenario.AgentInput) -> scenario.AgentReturnTypes:
-        # Run the agent with the user message
-        response = self.agent.run(input.last_new_user_message_str())
+        # Run the agent of the scenario's thread with the user message
+        response = await run_agent_interaction(
+            input.last_new_user_message_str(), session_id=input.thread_id
+        )
 
         # Return the response directly as a string
-        return response
+        return str(response)
 
 
 # Test scenarios
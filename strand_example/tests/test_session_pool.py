@@ -0,0 +1,181 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, List, Type
+
+import pytest
+from pydantic import BaseModel
+from strands.models import Model
+
+from create_agent_app.common.benchmarks.stub_llm import StubLLM
+
+import customer_support_agent
+from customer_support_agent import create_agent, stream_agent_interaction
+from session_pool import SessionPool
+
+MODEL_DELAY = 0.2
+
+
+class ScriptedModel(Model):
+    """Replies with the number of messages it received, after a delay"""
+
+    def __init__(self):
+        self.prompt_sizes: List[int] = []
+
+    def update_config(self, **model_config: Any) -> None:
+        pass
+
+    def get_config(self) -> Any:
+        return {}
+
+    async def structured_output(
+        self, output_model: Type[BaseModel], *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        # Without validation, so any output model gets an instance of its defaults
+        yield {"output": output_model.model_construct()}
+
+    async def stream(self, messages, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        self.prompt_sizes.append(len(messages))
+        await asyncio.sleep(MODEL_DELAY)
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        for word in ["I", "saw", f"{len(messages)}", "messages"]:
+            yield {"contentBlockDelta": {"delta": {"text": word + " "}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def model() -> ScriptedModel:
+    return ScriptedModel()
+
+
+@pytest.fixture
+def pool(monkeypatch, model) -> SessionPool:
+    def create_scripted_agent(session_id=None):
+        return create_agent(session_id, model=model, window_size=4)
+
+    pool = SessionPool(create_scripted_agent)
+    monkeypatch.setattr(customer_support_agent, "create_agent", create_scripted_agent)
+    monkeypatch.setattr(customer_support_agent, "session_pool", pool)
+    return pool
+
+
+async def run(message: str, session_id: str | None) -> str:
+    text = ""
+    result = None
+    async for event in stream_agent_interaction(message, session_id):
+        text += event.get("data", "")
+        result = event.get("result", result)
+    assert text.strip() == str(result).strip()
+    return text.strip()
+
+
+@pytest.mark.asyncio
+async def test_sessions_keep_separate_conversations(pool, model):
+    assert await run("Hi", "first") == "I saw 1 messages"
+    assert await run("Hi", "second") == "I saw 1 messages"
+    assert await run("Where is my order?", "first") == "I saw 3 messages"
+
+    assert len(pool) == 2
+
+
+@pytest.mark.asyncio
+async def test_conversation_is_kept_within_the_sliding_window(pool, model):
+    for turn in range(5):
+        await run(f"Message {turn}", "session")
+
+    assert model.prompt_sizes == [1, 3, 5, 5, 5]
+
+
+@pytest.mark.asyncio
+async def test_messages_without_a_session_are_not_pooled(pool):
+    assert await run("Hi", None) == "I saw 1 messages"
+    assert await run("Hi", None) == "I saw 1 messages"
+
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_sessions_run_concurrently(pool):
+    start = time.perf_counter()
+    await asyncio.gather(*(run("Hi", f"session-{i}") for i in range(10)))
+
+    assert time.perf_counter() - start < MODEL_DELAY * 5
+
+
+@pytest.mark.asyncio
+async def test_sessions_of_the_openai_model_do_not_block_each_other(monkeypatch):
+    with StubLLM(latency=MODEL_DELAY) as stub:
+        monkeypatch.setenv("OPENAI_BASE_URL", stub.base_url)
+        monkeypatch.setattr(
+            customer_support_agent, "session_pool", SessionPool(create_agent)
+        )
+        await run("Hi", "warmup")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run("Hi", f"session-{i}") for i in range(10)))
+        elapsed = time.perf_counter() - start
+
+    # Building an OpenAI client for every call blocked the event loop for about 40ms
+    assert elapsed < MODEL_DELAY * 2
+
+
+@pytest.mark.asyncio
+async def test_messages_of_a_session_run_one_after_the_other(pool, model):
+    replies = await asyncio.gather(*(run(f"Message {i}", "session") for i in range(3)))
+
+    assert sorted(replies) == [
+        "I saw 1 messages",
+        "I saw 3 messages",
+        "I saw 5 messages",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted(model):
+    clock = FakeClock()
+    pool = SessionPool(
+        lambda session_id: create_agent(session_id, model=model),
+        idle_timeout=60,
+        clock=clock,
+    )
+
+    for session_id in ("first", "second"):
+        async with pool.session(session_id):
+            pass
+    clock.now = 30
+    async with pool.session("second"):
+        pass
+    clock.now = 70
+
+    assert pool.evict_idle() == 1
+    assert "first" not in pool and "second" in pool
+
+
+@pytest.mark.asyncio
+async def test_sessions_in_use_are_not_evicted(model):
+    clock = FakeClock()
+    pool = SessionPool(
+        lambda session_id: create_agent(session_id, model=model),
+        max_sessions=1,
+        idle_timeout=60,
+        clock=clock,
+    )
+
+    async with pool.session("first"):
+        clock.now = 100
+        assert pool.evict_idle() == 0
+        async with pool.session("second"):
+            assert "first" in pool
+
+    async with pool.session("third"):
+        pass
+    assert list(pool.sessions) == ["third"]
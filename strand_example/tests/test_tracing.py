@@ -0,0 +1,92 @@
+import json
+import time
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from local_collector import LocalCollector
+from tracing import TracingConfig, create_tracer_provider, interaction_attributes
+
+
+def create_spans(provider, count: int) -> None:
+    tracer = provider.get_tracer(__name__)
+    for i in range(count):
+        with tracer.start_as_current_span(f"interaction {i}"):
+            with tracer.start_as_current_span("model call"):
+                pass
+
+
+def test_spans_are_exported_in_batches():
+    with LocalCollector() as collector:
+        provider = create_tracer_provider(
+            TracingConfig(endpoint=collector.endpoint, max_export_batch_size=50)
+        )
+        create_spans(provider, 50)
+        provider.shutdown()
+
+    assert collector.spans == 100
+    assert collector.requests <= 3
+
+
+def test_ending_spans_does_not_wait_for_the_collector():
+    with LocalCollector(latency=0.5) as collector:
+        provider = create_tracer_provider(
+            TracingConfig(endpoint=collector.endpoint, max_export_batch_size=100)
+        )
+        start = time.perf_counter()
+        create_spans(provider, 100)
+        elapsed = time.perf_counter() - start
+        provider.shutdown()
+
+    assert elapsed < 0.25
+
+
+def test_spans_are_dropped_when_the_queue_is_full():
+    with LocalCollector(latency=0.2) as collector:
+        provider = create_tracer_provider(
+            TracingConfig(
+                endpoint=collector.endpoint, max_queue_size=20, max_export_batch_size=10
+            )
+        )
+        create_spans(provider, 100)
+        provider.shutdown()
+
+    assert 0 < collector.spans < 200
+
+
+def test_child_spans_follow_the_sampling_of_the_interaction():
+    exporter = InMemorySpanExporter()
+    provider = create_tracer_provider(
+        TracingConfig(sample_rate=0.5, schedule_delay_millis=10), exporter
+    )
+
+    create_spans(provider, 200)
+    provider.force_flush()
+
+    spans = exporter.get_finished_spans()
+    interactions = [span for span in spans if span.name.startswith("interaction")]
+    assert 50 < len(interactions) < 150
+    assert len(spans) == 2 * len(interactions)
+
+
+def test_sample_rate_zero_turns_tracing_off():
+    exporter = InMemorySpanExporter()
+    provider = create_tracer_provider(TracingConfig(sample_rate=0), exporter)
+
+    with provider.get_tracer(__name__).start_as_current_span("interaction") as span:
+        assert not span.is_recording()
+    provider.force_flush()
+
+    assert exporter.get_finished_spans() == ()
+
+
+def test_interaction_metadata_matches_langwatch_trace_metadata():
+    assert json.loads(interaction_attributes("user-1", "session-1")["metadata"]) == {
+        "agent_name": "customer_support_agent",
+        "model": "gpt-4o",
+        "service": "xpto_telecom",
+        "user_id": "user-1",
+        "session_id": "session-1",
+    }
+    assert "user_id" not in json.loads(interaction_attributes(None, None)["metadata"])
@@ -0,0 +1,134 @@
+"""
+OpenTelemetry tracing for the Strands customer support agent, exported to LangWatch.
+
+Every span of the agent (the interaction, the agent, each model and tool call) ends
+up in a single `BatchSpanProcessor`. Ending a span only appends it to a bounded
+in-memory queue, a background thread exports the queue in batches, so no request
+waits on the collector. When the collector falls behind and the queue is full,
+new spans are dropped instead of growing the memory or blocking the agent.
+
+A `sample_rate` below 1 keeps only that fraction of the interactions, and every
+span of an interaction follows its decision. Interactions that are not sampled
+create non-recording spans, which cost next to nothing. A `sample_rate` of 0
+turns tracing off.
+
+The settings are read from the environment by `TracingConfig.from_env`:
+
+- STRANDS_TRACE_SAMPLE_RATE: fraction of the interactions traced, 1 by default
+- STRANDS_TRACE_ENDPOINT: OTLP/HTTP traces endpoint, LangWatch by default
+- STRANDS_TRACE_MAX_QUEUE_SIZE: spans waiting for export before new ones are dropped
+- STRANDS_TRACE_MAX_EXPORT_BATCH_SIZE: spans sent per export request
+- STRANDS_TRACE_SCHEDULE_DELAY_MS: longest wait before a partial batch is exported
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ParentBased, TraceIdRatioBased
+from opentelemetry.util.types import AttributeValue
+from strands.telemetry.config import get_otel_resource
+
+LANGWATCH_OTEL_ENDPOINT = "https://api.langwatch.ai/v1/otel"
+
+TRACE_METADATA = {
+    "agent_name": "customer_support_agent",
+    "model": "gpt-4o",
+    "service": "xpto_telecom",
+}
+
+
+@dataclass
+class TracingConfig:
+    endpoint: str = LANGWATCH_OTEL_ENDPOINT
+    headers: Dict[str, str] = field(default_factory=dict)
+    sample_rate: float = 1.0
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_millis: int = 5000
+
+    @classmethod
+    def from_env(cls) -> "TracingConfig":
+        return cls(
+            endpoint=os.getenv("STRANDS_TRACE_ENDPOINT", LANGWATCH_OTEL_ENDPOINT),
+            headers={"Authorization": f"Bearer {os.getenv('LANGWATCH_API_KEY', '')}"},
+            sample_rate=float(os.getenv("STRANDS_TRACE_SAMPLE_RATE", "1")),
+            max_queue_size=int(os.getenv("STRANDS_TRACE_MAX_QUEUE_SIZE", "2048")),
+            max_export_batch_size=int(
+                os.getenv("STRANDS_TRACE_MAX_EXPORT_BATCH_SIZE", "512")
+            ),
+            schedule_delay_millis=int(
+                os.getenv("STRANDS_TRACE_SCHEDULE_DELAY_MS", "5000")
+            ),
+        )
+
+
+def create_tracer_provider(
+    config: TracingConfig, exporter: Optional[SpanExporter] = None
+) -> TracerProvider:
+    """
+    Tracer provider that samples interactions and exports their spans in batches
+    from a background thread
+
+    Args:
+        config: The sampling, queue and batch settings
+        exporter: Where the spans are exported, OTLP over HTTP to `config.endpoint`
+            by default
+    """
+    if config.sample_rate <= 0:
+        return TracerProvider(resource=get_otel_resource(), sampler=ALWAYS_OFF)
+
+    provider = TracerProvider(
+        resource=get_otel_resource(),
+        sampler=ParentBased(TraceIdRatioBased(config.sample_rate)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            exporter
+            or OTLPSpanExporter(endpoint=config.endpoint, headers=config.headers),
+            max_queue_size=config.max_queue_size,
+            max_export_batch_size=min(
+                config.max_export_batch_size, config.max_queue_size
+            ),
+            schedule_delay_millis=config.schedule_delay_millis,
+        )
+    )
+    return provider
+
+
+def setup_tracing(config: Optional[TracingConfig] = None) -> TracerProvider:
+    """
+    Create the tracer provider and make it the global one, used by Strands
+
+    Pending spans are exported when the provider shuts down at exit.
+    """
+    provider = create_tracer_provider(config or TracingConfig.from_env())
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+# The static part of the metadata is serialized once, not on every interaction
+_TRACE_METADATA_JSON = json.dumps(TRACE_METADATA)
+
+
+def interaction_attributes(
+    user_id: Optional[str], session_id: Optional[str]
+) -> Dict[str, AttributeValue]:
+    """
+    Attributes of the interaction span, with the metadata LangWatch shows for the
+    trace, in the same format as `langwatch.get_current_trace().update(metadata=...)`
+    """
+    if not user_id and not session_id:
+        return {"metadata": _TRACE_METADATA_JSON}
+
+    metadata = dict(TRACE_METADATA)
+    if user_id:
+        metadata["user_id"] = user_id
+    if session_id:
+        metadata["session_id"] = session_id
+    return {"metadata": json.dumps(metadata)}